@@ -1,372 +1,41 @@
 import streamlit as st
 import pandas as pd
 import math
-import re
+import hashlib
+import json
 import streamlit.components.v1 as components
-from pathlib import Path
-import yaml
-
-# ——— Load all the “other” CORSAIR tables from Experimental_Dose_Constraints.yaml ———
-base = Path(__file__).parent
-
-# general adult
-with open(base / "CORSAIR_TG101.yaml", "r") as f:
-    general_constraints = yaml.safe_load(f)
-
-# the one YAML that actually contains the 4 other tables:
-with open(base / "Experimental_Dose_Constraints.yaml", "r") as f:
-    all_other = yaml.safe_load(f)
-
-# now extract them by their top‑level keys
-experimental_constraints = all_other["Experimental_Dose_Constraints"]
-hodgkin_constraints      = all_other["Hodgkin_Lymphoma_Dose_Constraints"]
-hypo_constraints         = all_other["Hypofractionated_Breast_Constraints"]
-pediatric_constraints    = all_other["Pediatric_Dose_Constraints"]
-
-# ——— Wrap list‑only tables under a ‘conventional’ scheme key ———
-for tbl in (experimental_constraints,
-            hodgkin_constraints,
-            pediatric_constraints):
-    for organ, val in list(tbl.items()):
-        # if the YAML gave us organ → [ … ], not → { scheme_key: [ … ] }
-        if isinstance(val, list):
-            tbl[organ] = {"conventional": val}
-
-    
+import altair as alt
+
+from reirrad import export, profiling
+from reirrad.catalog import load_catalog
+from reirrad.dicom import (
+    match_structures, open_dose, read_structure_set, structure_doses, structure_masks,
+)
+from reirrad.isoeffect import IsoSurface
+from reirrad.radiobiology import bed_time, iso_effective_dose
+from reirrad.recovery import recovery_fraction
+from reirrad.regimen import fraction_counts, solve_regimens
+from reirrad.reirradiation import (
+    permissible_regimens, reirradiation_report, transition_dose,
+)
+from reirrad.search import organ_search
+from reirrad.tables import (
+    DOSE_MODELS, FRACTION_OPTIONS, FRACTION_RANGE, OAR_ALPHA_BETA, OAR_CONSTRAINTS,
+    OARS, SCHEME_LABELS,
+)
+from reirrad.uncertainty import (
+    iso_effective_mc, percentiles, prob_above, remaining_room_mc,
+)
+
+# ——— Opt-in stage timings (REIRRAD_PROFILE) ———
+profiling.begin_run("app")
+
 # ——— Page config ———
 st.set_page_config(page_title="Radiotherapy Planning Tools", layout="wide")
 
-# ——— Common Data Definitions ———
-OARS = [
-    "Brain Stem", "Optic Nerve", "Optic Chiasm", "Cochlea",
-    "Small Bowel", "Spinal Cord", "Cauda Equina", "Sacral Plexus"
-]
-
-OAR_CONSTRAINTS = {
-    o: [{"type": "max", "value": v}]
-    for o, v in {
-        "Brain Stem": 54, "Optic Nerve": 54, "Optic Chiasm": 54,
-        "Cochlea": 45, "Small Bowel": 52, "Spinal Cord": 45,
-        "Cauda Equina": 45, "Sacral Plexus": 45
-    }.items()
-}
-
-OAR_ALPHA_BETA = {
-    o: (2 if o in [
-        "Spinal Cord", "Optic Chiasm", "Brain Stem",
-        "Optic Nerve", "Sacral Plexus", "Cauda Equina"
-    ] else 3)
-    for o in OARS
-}
-
-RECOVERY_FACTORS = {"<6 months": 0.00, "6–12 months": 0.25, "12+ months": 0.50}
-FRACTION_OPTIONS = [1, 3, 5, 10]
-EXCLUDE_3FX = {"Skin", "Cortical Bone", "Articular Cartilage"}
-
-# ——— Radiobiology Utils ———
-def bed(n: int, d: float, ab: float) -> float:
-    return n * d * (1 + d / ab)
-
-def eqd2(n: int, d: float, ab: float) -> float:
-    return bed(n, d, ab) / (1 + 2 / ab)
-
-def max_d_per_fraction(n: int, target_eqd2: float, ab: float) -> float:
-    tb = target_eqd2 * (1 + 2 / ab)
-    a, b, c = n / ab, n, -tb
-    disc = b * b - 4 * a * c
-    if disc < 0:
-        return 0.0
-    d1 = (-b + math.sqrt(disc)) / (2 * a)
-    d2 = (-b - math.sqrt(disc)) / (2 * a)
-    return max(d1, d2)
-
-# ——— 3D‑CRT Palliative Constraints ———
-THREED_CONSTRAINTS = {
-    "Head and Neck": [
-        {"OAR": "Brainstem",      "Preferred": "Max < 55 Gy",
-                                  "Acceptable": "Max 0.03 cc 60 Gy"},
-        {"OAR": "Optic Chiasm",   "Preferred": "Max < 54 Gy",
-                                  "Acceptable": "Max 0.03 cc 56 Gy"},
-        {"OAR": "Optic Nerve",    "Preferred": "Max < 50 Gy",
-                                  "Acceptable": "Max 0.03 cc 55 Gy"},
-        {"OAR": "Cochlea",        "Preferred": "V55 Gy < 5 %",
-                                  "Acceptable": "Mean < 45 Gy"},
-        {"OAR": "Retina",         "Preferred": "Max < 45 Gy",
-                                  "Acceptable": "Max < 50 Gy"},
-        {"OAR": "Lacrimal Gland", "Preferred": None,
-                                  "Acceptable": "Mean < 26 Gy"},
-        {"OAR": "Whole Brain",    "Preferred": None,
-                                  "Acceptable": "Minimize volume ≥ 30 Gy"},
-        {"OAR": "Esophagus",      "Preferred": None,
-                                  "Acceptable": "Mean < 30 Gy; no hot spots"},
-        {"OAR": "Parotid Glands", "Preferred": None,
-                                  "Acceptable": "Mean < 26 Gy; no hot spots"},
-        {"OAR": "Thyroid Gland",  "Preferred": None,
-                                  "Acceptable": "Mean < 37 Gy; no hot spots"},
-        {"OAR": "Oral Cavity",    "Preferred": None,
-                                  "Acceptable": "Minimize volume ≥ 30 Gy"},
-        {"OAR": "Spinal Cord",    "Preferred": None,
-                                  "Acceptable": "As low as possible; ≤ 105 % Rx"},
-        {"OAR": "Skin",           "Preferred": None,
-                                  "Acceptable": "Hot‑spot < 107 %"},
-        {"OAR": "Max Point Dose", "Preferred": "< 105 %",
-                                  "Acceptable": "< 108 %"},
-    ],
-
-    "Thorax": [
-        {"OAR": "Lungs",          "Preferred": "V5 Gy < 42 %",
-                                  "Acceptable": "V20 Gy < 37 %; Mean < 20 Gy"},
-        {"OAR": "Esophagus",      "Preferred": None,
-                                  "Acceptable": "Mean < 30 Gy; no hot spots"},
-        {"OAR": "Brachial Plexus","Preferred": None,
-                                  "Acceptable": "No hot spots"},
-        {"OAR": "Heart",          "Preferred": None,
-                                  "Acceptable": "V60 Gy < 33 %"},
-        {"OAR": "Great Vessels",  "Preferred": None,
-                                  "Acceptable": "No hot spots"},
-        {"OAR": "Trachea",        "Preferred": None,
-                                  "Acceptable": "Mean < 30 Gy"},
-        {"OAR": "Chest Wall",     "Preferred": None,
-                                  "Acceptable": "No hot spots"},
-        {"OAR": "Spinal Cord",    "Preferred": None,
-                                  "Acceptable": "As low as possible; ≤ 45 Gy"},
-        {"OAR": "Skin",           "Preferred": None,
-                                  "Acceptable": "Hot‑spot < 107 %"},
-        {"OAR": "Max Point Dose", "Preferred": "< 105 %",
-                                  "Acceptable": "< 108 %"},
-    ],
-
-    "Abdomen": [
-        {"OAR": "Small Bowel",   "Preferred": None,
-                                 "Acceptable": "As low as possible; Max 45 Gy or 105 % Rx"},
-        {"OAR": "Kidneys",       "Preferred": None,
-                                 "Acceptable": "Mean < 15 Gy (or < 9 Gy if solitary)"},
-        {"OAR": "Liver",         "Preferred": None,
-                                 "Acceptable": "As low as possible; 50 % < 30 Gy"},
-        {"OAR": "Stomach",       "Preferred": None,
-                                 "Acceptable": "As low as possible; 25 % < 45 Gy or 105 % Rx"},
-        {"OAR": "Esophagus",     "Preferred": None,
-                                 "Acceptable": "Mean < 34 Gy; V60 Gy < 10 cc"},
-        {"OAR": "Lungs",         "Preferred": None,
-                                 "Acceptable": "V5 Gy < 42 %; V20 Gy < 37 %; Mean < 20 Gy"},
-        {"OAR": "Spinal Cord",   "Preferred": None,
-                                 "Acceptable": "As low as possible; ≤ 45 Gy"},
-        {"OAR": "Skin",          "Preferred": None,
-                                 "Acceptable": "Hot‑spot < 107 %"},
-        {"OAR": "Max Point Dose","Preferred": "< 105 %",
-                                 "Acceptable": "< 108 %"},
-    ],
-
-    "Female Pelvis": [
-        {"OAR": "Reproductive Organs", "Preferred": None,
-                                       "Acceptable": "V20 Gy < 50 %"},
-        {"OAR": "Bladder",             "Preferred": None,
-                                       "Acceptable": "V50 Gy < 35 %; V45 Gy < 35 %"},
-        {"OAR": "Small Bowel",         "Preferred": None,
-                                       "Acceptable": "As low as possible"},
-        {"OAR": "Large Bowel",         "Preferred": None,
-                                       "Acceptable": "As low as possible"},
-        {"OAR": "Kidneys",             "Preferred": None,
-                                       "Acceptable": "Mean < 15 Gy (or < 9 Gy if solitary)"},
-        {"OAR": "Ureter",              "Preferred": None,
-                                       "Acceptable": "Dmax < 45 Gy (Stricture)"},
-        {"OAR": "Skin",                "Preferred": None,
-                                       "Acceptable": "Hot‑spot < 107 %"},
-        {"OAR": "Max Point Dose",      "Preferred": "< 105 %",
-                                       "Acceptable": "< 108 %"},
-    ],
-
-    "Male Pelvis": [
-        {"OAR": "Reproductive Organs", "Preferred": None,
-                                       "Acceptable": "D0.5 cc < 42 Gy"},
-        {"OAR": "Bladder",             "Preferred": None,
-                                       "Acceptable": "D0.5 cc < 28.2 Gy"},
-        {"OAR": "Small Bowel",         "Preferred": None,
-                                       "Acceptable": "As low as possible"},
-        {"OAR": "Large Bowel",         "Preferred": None,
-                                       "Acceptable": "As low as possible"},
-        {"OAR": "Kidneys",             "Preferred": None,
-                                       "Acceptable": "Mean < 15 Gy (or < 9 Gy if solitary)"},
-        {"OAR": "Ureter",              "Preferred": None,
-                                       "Acceptable": "Dmax < 45 Gy (Stricture)"},
-        {"OAR": "Skin",                "Preferred": None,
-                                       "Acceptable": "Hot‑spot < 107 %"},
-        {"OAR": "Max Point Dose",      "Preferred": "< 105 %",
-                                       "Acceptable": "< 108 %"},
-    ],
-
-    "Proximal Upper Extremity": [
-        {"OAR": "Brachial Plexus", "Preferred": None,
-                                   "Acceptable": "No hot spots"},
-        {"OAR": "Skin",            "Preferred": None,
-                                   "Acceptable": "No slices 100 % circumf.; Hot‑spot < 107 %"},
-        {"OAR": "Max Point Dose",  "Preferred": "< 105 %",
-                                   "Acceptable": "< 108 %"},
-    ],
-
-    "Distal Upper Extremity": [
-        {"OAR": "Skin",           "Preferred": None,
-                                  "Acceptable": "No slices 100 % circumf.; Hot‑spot < 107 %"},
-        {"OAR": "Max Point Dose", "Preferred": "< 105 %",
-                                  "Acceptable": "< 108 %"},
-    ],
-
-    "Proximal Lower Extremity": [
-        {"OAR": "Skin",           "Preferred": None,
-                                  "Acceptable": "No slices 100 % circumf.; Hot‑spot < 107 %"},
-        {"OAR": "Max Point Dose", "Preferred": "< 105 %",
-                                  "Acceptable": "< 108 %"},
-    ],
-
-    "Distal Lower Extremity": [
-        {"OAR": "Skin",           "Preferred": None,
-                                  "Acceptable": "No slices 100 % circumf.; Hot‑spot < 107 %"},
-        {"OAR": "Max Point Dose", "Preferred": "< 105 %",
-                                  "Acceptable": "< 108 %"},
-    ]
-}
-
-# ——— Normalize unicode subscripts, tidy spaces ———
-sub_map = str.maketrans("₀₁₂₃₄₅₆₇₈₉", "0123456789")
-for rows in THREED_CONSTRAINTS.values():
-    for row in rows:
-        for col in ("Preferred", "Acceptable"):
-            txt = row[col]
-            if not txt:
-                continue
-            s = txt.translate(sub_map)
-            s = re.sub(r"\s*\(\s*0\.03\s*cc\s*\)\s*", " 0.03 cc ", s)
-            s = re.sub(r"\bV\s*([\d\.]+)\s*(?=[<≥])", r"V\1 Gy ", s)
-            s = re.sub(r"\s+", " ", s).strip()
-            row[col] = s
-
-# ——— SBRT Constraints (intracranial + body) ———
-SBRT_INTRACRANIAL = [
-    {"OAR": "Optic Pathway", "Metric": "D0.1cc",
-     "3fx_opt": None, "3fx_man": 15, "5fx_opt": None, "5fx_man": 22.5,
-     "Endpoint": "Optic Neuritis"},
-    {"OAR": "Cochlea", "Metric": "Dmean",
-     "3fx_opt": None, "3fx_man": 17.1, "5fx_opt": None, "5fx_man": 25,
-     "Endpoint": "Hearing Loss"},
-    {"OAR": "Brainstem", "Metric": "D0.1cc",
-     "3fx_opt": 18, "3fx_man": 23.1, "5fx_opt": 23, "5fx_man": 31,
-     "Endpoint": "Cranial Neuropathy"},
-    {"OAR": "Spinal Canal", "Metric": "D0.1cc",
-     "3fx_opt": 18, "3fx_man": 21.9, "5fx_opt": 23, "5fx_man": 30,
-     "Endpoint": "Myelitis"},
-]
-skin_entry = {
-    "OAR": "Skin",
-    "Metric": "D0.03 cc / V20 Gy",
-    "3fx_opt": None, "3fx_man": None,
-    "5fx_opt": None, "5fx_man": "Dmax ≤ 35 Gy; V20 Gy < 10 cc",
-    "Endpoint": "Ulceration"
-}
-SBRT_INTRACRANIAL.append(skin_entry)
-
-SBRT_BODY = [
-    {"OAR": "Brachial Plexus", "Metric": "D0.5cc",
-     "3fx_opt": 24, "3fx_man": 26, "5fx_opt": 27, "5fx_man": 29,
-     "Endpoint": "Neuropathy"},
-    {"OAR": "Heart", "Metric": "D0.5cc",
-     "3fx_opt": 24, "3fx_man": 26, "5fx_opt": 27, "5fx_man": 29,
-     "Endpoint": "Pericarditis"},
-    {"OAR": "Great Vessels", "Metric": "D0.5cc",
-     "3fx_opt": None, "3fx_man": 45, "5fx_opt": None, "5fx_man": 53,
-     "Endpoint": "Aneurysm"},
-    {"OAR": "Trachea", "Metric": "D0.5cc",
-     "3fx_opt": 30, "3fx_man": 32, "5fx_opt": 32, "5fx_man": 35,
-     "Endpoint": "Stenosis / Fistula"},
-    {"OAR": "Chest Wall", "Metric": "D0.5cc",
-     "3fx_opt": 37, "3fx_man": 30, "5fx_opt": 39, "5fx_man": 32,
-     "Endpoint": "Pain / Fracture"},
-    {"OAR": "Lungs", "Metric": "V20 Gy",
-     "3fx_opt": None, "3fx_man": "10%", "5fx_opt": None, "5fx_man": "10%",
-     "Endpoint": "Pneumonitis"},
-    {"OAR": "Esophagus", "Metric": "D0.5cc",
-     "3fx_opt": None, "3fx_man": 25.2, "5fx_opt": 32, "5fx_man": 34,
-     "Endpoint": "Stenosis / Fistula"},
-    {"OAR": "Stomach", "Metric": "D5cc",
-     "3fx_opt": None, "3fx_man": 16.5, "5fx_opt": 25, "5fx_man": 12,
-     "Endpoint": "Ulceration / Fistula"},
-    {"OAR": "Duodenum", "Metric": "D5cc",
-     "3fx_opt": None, "3fx_man": 16.5, "5fx_opt": 25, "5fx_man": None,
-     "Endpoint": "Ulceration"},
-    {"OAR": "Small Bowel", "Metric": "D0.5cc",
-     "3fx_opt": None, "3fx_man": 25.2, "5fx_opt": 30, "5fx_man": 35,
-     "Endpoint": "Enteritis / Obstruction"},
-    {"OAR": "Large Bowel", "Metric": "D0.5cc",
-     "3fx_opt": None, "3fx_man": 28.2, "5fx_opt": None, "5fx_man": 32,
-     "Endpoint": "Colitis / Fistula"},
-    {"OAR": "Rectum", "Metric": "D0.5cc",
-     "3fx_opt": None, "3fx_man": 28.2, "5fx_opt": None, "5fx_man": 32,
-     "Endpoint": "Proctitis / Fistula"},
-    {"OAR": "Cauda Equina", "Metric": "D0.1cc",
-     "3fx_opt": 16, "3fx_man": 14, "5fx_opt": 32, "5fx_man": 30,
-     "Endpoint": "Neuritis"},
-    {"OAR": "Lumbosacral Plexus", "Metric": "D0.03 cc",
-     "3fx_opt": None, "3fx_man": None, "5fx_opt": None,
-     "5fx_man": "Dmax ≤ 30 Gy", "Endpoint": "Plexopathy"},
-    {"OAR": "Cortical Bone", "Metric": "V25 Gy/V30 Gy",
-     "3fx_opt": None, "3fx_man": None, "5fx_opt": None,
-     "5fx_man": "V25 < 50 %; V30 < 35 %", "Endpoint": "Fracture"},
-    {"OAR": "Articular Cartilage", "Metric": "Dmax",
-     "3fx_opt": None, "3fx_man": None, "5fx_opt": None,
-     "5fx_man": "Dmax ≤ 35 Gy", "Endpoint": "Joint Integrity"},
-    {"OAR": "Ureter", "Metric": "Dmax",
-     "3fx_opt": None, "3fx_man": 40, "5fx_opt": None, "5fx_man": 45,
-     "Endpoint": "Stricture"},
-]
-SBRT_BODY.append(skin_entry)
-
-SBRT_CONSTRAINTS = {
-    "Head and Neck": (
-        SBRT_INTRACRANIAL +
-        [r for r in SBRT_BODY if r["OAR"] in ("Esophagus", "Brachial Plexus")]
-    ),
-    "Thorax": (
-        [r for r in SBRT_INTRACRANIAL if r["OAR"] == "Spinal Canal"] +
-        [r for r in SBRT_BODY if r["OAR"] in (
-            "Lungs", "Esophagus", "Brachial Plexus",
-            "Heart", "Great Vessels", "Trachea", "Chest Wall")]
-    ),
-    "Abdomen": (
-        [r for r in SBRT_INTRACRANIAL if r["OAR"] == "Spinal Canal"] +
-        [r for r in SBRT_BODY if r["OAR"] in (
-            "Stomach", "Duodenum", "Small Bowel", "Large Bowel",
-            "Kidneys", "Ureter", "Cauda Equina", "Lumbosacral Plexus")]
-    ),
-    "Pelvis": [
-        r for r in SBRT_BODY if r["OAR"] in (
-            "Skin",
-            "Ureter",
-            "Lumbosacral Plexus",
-            "Cauda Equina",
-            "Rectum",
-            "Large Bowel",
-            "Small Bowel"
-        )
-    ],
-
-    "Proximal Upper Extremity": (
-        [r for r in SBRT_BODY if r["OAR"] == "Brachial Plexus"] +
-        [skin_entry] +
-        [r for r in SBRT_BODY if r["OAR"] in ("Cortical Bone", "Articular Cartilage")]
-    ),
-    "Distal Upper Extremity": (
-        [skin_entry] +
-        [r for r in SBRT_BODY if r["OAR"] in ("Cortical Bone", "Articular Cartilage")]
-    ),
-    "Proximal Lower Extremity": (
-        [skin_entry] +
-        [r for r in SBRT_BODY if r["OAR"] in (
-            "Cortical Bone", "Articular Cartilage", "Lumbosacral Plexus")]
-    ),
-    "Distal Lower Extremity": (
-        [skin_entry] +
-        [r for r in SBRT_BODY if r["OAR"] in ("Cortical Bone", "Articular Cartilage")]
-    ),
-}
+# ——— Constraint catalogs (parsed once per process) ———
+with profiling.stage("catalog.load"):
+    catalog = load_catalog()
 
 # ——— Streamlit Session State ———
 if "stage" not in st.session_state:
@@ -374,92 +43,86 @@ if "stage" not in st.session_state:
 if "custom_ab" not in st.session_state:
     st.session_state.custom_ab = {}
 
-# ——— REFERENCES DICTIONARY ———
-# cleaned to “LastName et al.” style, ready to paste into Python
-references = {
-    1:  'Rubin & Casarett. "Clinical radiation pathology as applied to curative radiotherapy." Front Radiat. Ther. Oncol. 1968, 22, 767–778.',
-    2:  'Emami et al. "Tolerance of Normal Tissue to Therapeutic Irradiation." Int. J. Radiat. Oncol. Biol. Phys. 1991, 21, 109–122.',
-    3:  'Marks et al. "Guest Editor’s Introduction to QUANTEC: A Users Guide." Int. J. Radiat. Oncol. Biol. Phys. 2010, 76, S1–S2.',
-    4:  'Bentzen et al. "Quantitative Analyses of Normal Tissue Effects in the Clinic (QUANTEC): An Introduction to the Scientific Issues." Int. J. Radiat. Oncol. Biol. Phys. 2010, 76, S3–S9.',
-    5:  'Marks et al. "Use of Normal Tissue Complication Probability Models in the Clinic." Int. J. Radiat. Oncol. Biol. Phys. 2010, 76, S10–S19.',
-    6:  'Diez et al. "UK 2022 Consensus on Normal Tissue Dose–Volume Constraints for Oligometastatic, Primary Lung and Hepatocellular Carcinoma SABR." Clin. Oncol. 2022, 34, 288–300.',
-    7:  'Hanna et al. "UK Consensus on Normal Tissue Dose Constraints for Stereotactic Radiotherapy." Clin. Oncol. 2018, 30, 5–14.',
-    8:  'Benedict et al. "Stereotactic Body Radiation Therapy: The Report of AAPM Task Group 101." Med. Phys. 2010, 37, 4078–4101.',
-    9:  'Milano et al. "Single‑ and Multifraction Stereotactic Radiosurgery Dose/Volume Tolerances of the Brain." Int. J. Radiat. Oncol. Biol. Phys. 2021, 110, 68–86.',
-    10: 'Grimm et al. "Dose Tolerance Limits and Dose–Volume Histogram Evaluation for Stereotactic Body Radiotherapy." J. Appl. Clin. Med. Phys. 2011, 12, 267–292.',
-    11: 'NCCN Guidelines et al. "NCCN Clinical Practice Guidelines in Oncology—Hodgkin Lymphoma. Version 1.2023."',
-    13: 'Coles et al. "Partial‑Breast Radiotherapy after Breast Conservation Surgery (UK IMPORT LOW): 5‑Year Results." Lancet 2017, 390, 1048–1060.',
-    14: 'Meattini et al. "APBI‑IMRT‑Florence Trial: Accelerated Partial‑Breast vs Whole‑Breast Irradiation: Long‑Term Results." J. Clin. Oncol. 2020, 38, 4175–4183.',
-    15: 'Murray Brunt et al. "FAST‑Forward Trial: 1 Week vs 3 Weeks Hypofractionation." Lancet 2020, 395, 1613–1626.',
-    16: 'Palmer et al. "Late Effects of Radiation Therapy in Pediatric Patients and Survivorship." Pediatr. Blood Cancer 2021, 68, e28349.',
-    17: 'Milano et al. "Primary Hypothyroidism in Childhood Cancer Survivors Treated With Radiation Therapy: A PENTEC Review." Int. J. Radiat. Oncol. Biol. Phys. 2021.',
-    18: 'Mahajan et al. "Neurocognitive Effects and Necrosis in Childhood Cancer Survivors: A PENTEC Review." Int. J. Radiat. Oncol. Biol. Phys. 2021.',
-    20: 'Milgrom et al. "Salivary and Dental Complications in Childhood Cancer Survivors: A PENTEC Review." Int. J. Radiat. Oncol. Biol. Phys. 2021.',
-    21: 'Hodgson et al. "ILROG Guidelines for Pediatric Hodgkin Lymphoma RT Planning." Pract. Radiat. Oncol. 2015, 5, 85–92.',
-    22: 'Reis et al. "SBRT of Ventricular Tachycardia Using 4π Optimized Trajectories." J. Appl. Clin. Med. Phys. 2021, 22, 72–86.',
-    23: 'Blanck et al. "RAVENTA Trial: Feasibility of Radiosurgery for Ventricular Tachycardia." Clin. Res. Cardiol. 2020, 109, 1319–1332.',
-    24: 'Chiu et al. "Review of Stereotactic Arrhythmia Radioablation Therapy for Cardiac Tachydysrhythmias." CJC Open 2021, 3, 236–247.',
-    25: 'NCCN Guidelines et al. "Non‑Small Cell Lung Cancer v5.2022."',
-    26: 'NCCN Guidelines et al. "Esophageal and Esophagogastric Junction Cancers v4.2022."',
-    28: 'NCCN Guidelines et al. "Anal Cancer v2.2022."',
-    30: 'Dapper et al. "Impact of VMAT‑IMRT vs 3D‑CRT on Anal Sphincter Dose in Rectal Cancer." Radiat. Oncol. 2018, 13, 237.',
-    31: 'Jadon et al. "Systematic Review of Dose–Volume Predictors for Late Bowel Toxicity." Radiat. Oncol. 2019, 14, 1–14.',
-    32: 'Peng et al. "Dose–Volume Analysis of Predictors for Acute Anal Toxicity in Prostate Cancer." Radiat. Oncol. 2019, 14, 1–9.',
-    33: 'Atkins et al. "Association of LAD Coronary Dose with Cardiac Events in NSCLC." JAMA Oncol. 2021, 7, 206–219.',
-    34: 'Brodin & Tomé. "Revisiting Dose Constraints for Head & Neck OARs in IMRT Era." Oral Oncol. 2018, 86, 8–18.',
-    35: 'Merlotti et al. "Technical Guidelines for H&N IMRT (AIRO‑HN WG)." Radiat. Oncol. 2014, 9, 264.',
-    36: 'Brunner et al. "ESTRO ACROP Guidelines for CTV Delineation in Pancreatic Cancer." Radiother. Oncol. 2021, 154, 60–69.',
-    37: 'Eekers et al. "EPTN Consensus Atlas for CT/MR Contouring in Neuro‑Oncology." Radiother. Oncol. 2018, 128, 37–43.',
-    38: 'Inoue et al. "Three‑Fraction CyberKnife RT for Brain Mets (V14)." J. Radiat. Res. 2013, 54, 727–735.',
-    39: 'Niyazi et al. "ESTRO‑ACROP Guideline: Target Delineation of Glioblastomas." Radiother. Oncol. 2016, 118, 35–42.',
-    40: 'Scoccianti et al. "OARs in the Brain & Their Dose Constraints in Adults & Children." Radiother. Oncol. 2015, 114, 230–238.',
-    41: 'Li et al. "Dosimetric Analysis of Dysphagia & G‑Tube Dependence in H&N IMRT+Chemo." Radiat. Oncol. 2009, 4, 52.',
-    42: 'Basu & Bhaskar. "Overview of Important OARs in H&N Cancer RT." In Cancer Survivorship, IntechOpen 2019.',
-    43: 'Lambrecht et al. "Dose Constraints for OARs in Neuro‑Oncology: EPTN Consensus." Radiother. Oncol. 2018, 128, 26–36.',
-    44: 'Gondi et al. "Hippocampal Dosimetry Predicts Neurocognitive Decline after SRS." Int. J. Radiat. Oncol. Biol. Phys. 2013, 85, 348–354.',
-    45: 'Brown et al. "Hippocampal Avoidance WBRT+Memantine for Brain Mets: NRG CC001." J. Clin. Oncol. 2020, 38, 1019–1029.',
-    46: 'Pinkham et al. "Hippocampal‑Sparing RT: New Standard for Grade II/III Gliomas?" J. Clin. Neurosci. 2014, 21, 86–90.',
-    47: 'Goodman et al. "RTOG Consensus Guidelines: CTV Delineation Postop Pancreatic Head Cancer." Int. J. Radiat. Oncol. Biol. Phys. 2012, 83, 901–908.',
-    48: 'Yeoh et al. "Pudendal Nerve Injury Impairs Anorectal Function ≥2 Years Post‑3D‑CRT for Prostate Ca." Acta Oncol. 2018, 57, 456–464.',
-    49: 'Kovtun et al. "Ovary‑Sparing RT Techniques for Buttock/Thigh Sarcoma." Sarcoma 2017, 2017, 2796925.',
-    50: 'Vyfhuis et al. "Preserving Endocrine Function in Premenopausal Women Receiving Whole‑Pelvis RT." Int. J. Part. Ther. 2019, 6, 10–17.',
-    51: 'Du & Qu. "Relationship between Ovarian Function and Dose Post‑Transposition in Young Cervical Ca." Cancer Med. 2017, 6, 508–515.',
-    52: 'Polanowski et al. "Analysis of Pancreatic Dose during Gastric Ca RT." Radiother. Oncol. 2020, 151, 20–23.',
-    53: 'Gemici et al. "Volumetric Decrease of Pancreas after Abdominal Irradiation." Radiat. Oncol. 2018, 13, 238.',
-    54: 'Palmisciano et al. "SBRT in Non‑Operable Lung Ca Patients." Clin. Transl. Oncol. 2016, 18, 1158–1159.',
-    55: 'Uehara et al. "Feasibility of VMAT with Halcyon™ for Total Body Irradiation." Radiat. Oncol. 2021, 16, 236.',
-    56: 'De Felice et al. "Radiation Effects on Male Fertility." Andrology 2019, 7, 2–7.',
-    57: 'Hoskin et al. "GEC/ESTRO Recommendations on HDR Afterloading Brachytherapy for Prostate Ca: Update." Radiother. Oncol. 2013, 107, 325–332.',
-    58: 'Henry et al. "GEC‑ESTRO ACROP Prostate Brachytherapy Guidelines." Radiother. Oncol. 2022, 167, 244–251.',
-    59: 'Susan. "Anatomy: The Anatomical Basis of Clinical Practice, 2nd ed." Elsevier 2020.',
-    60: 'Feng et al. "Development and Validation of a Heart Atlas for Breast Ca RT." Int. J. Radiat. Oncol. Biol. Phys. 2011, 79, 10–18.',
-    61: 'Duane et al. "A Cardiac Contouring Atlas for Radiotherapy." Radiother. Oncol. 2017, 122, 416–422.',
-    68: 'Mell et al. "Dosimetric Predictors of Acute Hematologic Toxicity in Cervical Cancer Patients Treated with Concurrent Cisplatin and Intensity-Modulated Pelvic Radiotherapy." Int. J. Radiat. Oncol. Biol. Phys. 2006;66:1356–1365.',
-    99: 'Bisello et al. “Supplementary Table S1: Emerging OARs.” Curr. Oncol. 2022.',
-    100: 'Cacciola A et al. "IMRT Does Not Induce Volumetric Changes of the Bichat Fat Pad in NPC." Strahlenther Onkol. 2022;198:1‑6.',
-    101: 'Li N et al. "Dose‑Volume Parameters & Acute Bone‑Marrow Suppression in Rectal CRT." Oncotarget 2017;8:92904‑92913.',
-    102: 'Bazan JG et al. "NTCP Modeling of Acute Hematologic Toxicity in Anal‑Canal IMRT." Int J Radiat Oncol Biol Phys 2012;84:700‑706.',
-    103: 'Gortzak Y et al. "Fracture Risk of Femur After Combined Modality Tx of Thigh STS." Cancer 2010;116:1553‑1559.',
-    104: 'Holt GE et al. "Fractures after RT & Limb‑Salvage Surgery for LE STS: High vs Low Dose." J Bone Joint Surg 2005;87:315‑319.',
-    105: 'Pai HH et al. "Hypothalamic/Pituitary Function After High‑Dose Conformal RT to Skull Base." Int J Radiat Oncol Biol Phys 2001;49:1079‑1092.',
-    106: 'Murakami N et al. "Vaginal Tolerance of CT‑Based Image‑Guided HDR Interstitial BT." Radiat Oncol 2014;9:31.',
-    107: 'Kirchheiner K et al. "Risk of Vaginal Stenosis After IG‑BT for LACC (EMBRACE)." Radiother Oncol 2016;118:160‑166.',
-    108: 'Wirth A et al. "ISRT in Adult Lymphomas—ILROG Overview." Int J Radiat Oncol Biol Phys 2020;107:909‑933.',
-    109: 'Ferini G et al. "Predictors for DIBH 3D‑CRT Dosimetric Benefit in Left Breast Ca." Anticancer Res 2021;41:1529‑1538.',
-    110: 'Thomsen MS et al. "Dose Constraints for Whole‑Breast RT: Danish DBCG HYPO Trial." Clin Transl Radiat Oncol 2021;28:118‑123.',
-    111: 'Tolia M. "Contralateral Breast Dose in Accelerated Hypofractionated RT." World J Radiol 2011;3:233‑240.',
-    112: 'Rudra S et al. "Effect of RTOG Breast/Chest‑Wall Guidelines on DVH Parameters." J Appl Clin Med Phys 2014;15:127‑137.',
-    113: 'Noël G, Antoni D. "Organs at Risk Radiation Dose Constraints." Cancer Radiother 2022;26:59‑75.',
-    114: 'De Rose F et al. "Hypofractionated VMAT for Early Breast Ca: 2‑Year Results." Radiat Oncol 2016;11:120.',
-    115: 'Rice L et al. "DIBH Technique for Left‑Breast Ca: Impact on OARs." Breast Cancer (Targets Ther) 2017;9:437‑446.',
-    116: 'Gentile MS et al. "Brainstem Injury in Peds P‑Fossa Tumors Treated with PBT." Int J Radiat Oncol Biol Phys 2018;100:719‑729.',
-    117: 'Shrestha S et al. "Cardiac Disease Risk in Childhood Cancer Survivors: Updated Dosimetry." Radiother Oncol 2021;163:199‑208.',
-    118: 'Hol ML et al. "Early Orbital Bone Changes After RT for RMS." Pract Radiat Oncol 2020;10:53‑58.',
-    119: 'Arunagiri N et al. "Spleen as OAR in Paediatric RT: SIOP‑Europe Report." Eur J Cancer 2021;143:1‑10.',
-    120: 'Weil BR et al. "Late Infection Mortality in Asplenic Childhood Cancer Survivors." J Clin Oncol 2018;36:1571‑1578.',
-    121: 'Romano E et al. "Dose/Volume Effects for Anorectal Morbidity in Paediatric Pelvic RT." Int J Radiat Oncol Biol Phys 2021;109:231‑241.',
-    122: 'Solan AN et al. "RT for Patients with Pacemakers / ICDs." Int J Radiat Oncol Biol Phys 2004;59:897‑904.',
-}
+# ——— Tab 1 results, memoized on a hash of the inputs ———
+def inputs_key(prior_data, limit_overrides, ab_overrides, model="lq", d_t_overrides=None):
+    blob = json.dumps([prior_data, limit_overrides, ab_overrides, model, d_t_overrides],
+                      sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def cached_report(key, selected, prior_data, ab_overrides, limit_overrides,
+                  model="lq", d_t_overrides=None):
+    cache = st.session_state.setdefault("report_cache", {})
+    d_t_overrides = d_t_overrides or {}
+    if key not in cache:
+        cache[key] = {
+            oar: reirradiation_report(
+                prior_data[oar], ab_overrides[oar], limit_overrides[oar],
+                model, d_t_overrides.get(oar),
+            )
+            for oar in selected
+        }
+        while len(cache) > 32:
+            cache.pop(next(iter(cache)))
+    return cache[key]
+
+
+# ——— Monte Carlo summaries, memoized like the reports ———
+def cached_mc(name, inputs, compute):
+    """``compute()``, kept in session state under a hash of ``inputs``.
+
+    The sampling reruns only when its own inputs change, not on every
+    unrelated interaction that reruns the script.
+    """
+    blob = json.dumps([name, inputs], sort_keys=True, default=str)
+    key = hashlib.sha256(blob.encode()).hexdigest()
+    cache = st.session_state.setdefault("mc_cache", {})
+    if key not in cache:
+        cache[key] = compute()
+        while len(cache) > 16:
+            cache.pop(next(iter(cache)))
+    return cache[key]
+
+
+# ——— Downloads (CSV / JSON / PDF via reirrad.export) ———
+_MIME = {"csv": "text/csv", "json": "application/json", "pdf": "application/pdf"}
+
+
+def download_buttons(rows, columns, name, key, title=""):
+    rows = list(rows)
+    for col, fmt in zip(st.columns(len(_MIME)), _MIME):
+        col.download_button(
+            f"Download {fmt.upper()}",
+            export.to_bytes(rows, columns, fmt, title=title),
+            file_name=f"{name}.{fmt}",
+            mime=_MIME[fmt],
+            key=f"{key}_{fmt}",
+        )
+
+
+
+# ——— Prior course from DICOM: fills the Tab 1 course inputs ———
+def read_dicom_course(dose_paths, structure_path, fractions, organs):
+    dose = open_dose(dose_paths)
+    structures = read_structure_set(structure_path)
+    masks = structure_masks(structures, dose)
+    matched = match_structures(masks, organs)
+    alpha_beta = {roi: OAR_ALPHA_BETA[o] for o, roi in matched.items() if o in OAR_ALPHA_BETA}
+    return structure_doses(dose, masks, fractions, alpha_beta)
+
+
+def add_dicom_course(stats, mapping, fractions, recovery_pct):
+    """Append the mapped structures' max dose as a new course of each OAR."""
+    for oar, roi in mapping.items():
+        n = int(st.session_state.get(f"{oar}_nc", 0))
+        if roi not in stats or n >= 10:
+            continue
+        n += 1
+        st.session_state[f"{oar}_nc"] = n
+        st.session_state[f"{oar}_dose{n}"] = round(stats[roi]["max"], 2)
+        st.session_state[f"{oar}_fx{n}"] = int(fractions)
+        st.session_state[f"{oar}_recov{n}"] = int(recovery_pct)
+
 
 # ——— Main UI ———
 st.title("Radiotherapy Planning Tools")
@@ -479,7 +142,7 @@ tab1, tab3, tab4 = st.tabs([
 
 
 # ───────────────────────────── Tab 1: EQD₂ calculator ────────────────────
-with tab1:
+with tab1, profiling.stage("tab1"):
     st.header("Re‑irradiation Dose Limit Calculator")
 
     # ——— Basic user instructions ———
@@ -492,7 +155,7 @@ with tab1:
         "  3. Number of prior courses, and for each course:\n"
         "     - Total dose (Gy)\n"
         "     - Number of fractions\n"
-        "     - Expected percent recovery from prior dose (0–100 %)\n"
+        "     - Expected percent recovery from prior dose (0–100 %), or the months since the course to estimate it from the recovery curve\n"
         "- Click **Calculate** to see remaining EQD₂ room and feasible regimens."
     )
 
@@ -503,12 +166,62 @@ with tab1:
         "Select OAR(s) or create a custom OAR",
         all_oars
     )
-
-    prior_data      = {}
-    limit_overrides = {}
-    ab_overrides    = {}
-
-    for oar in selected:
+    model = st.selectbox(
+        "Dose-response model",
+        list(DOSE_MODELS),
+        format_func=DOSE_MODELS.get,
+        key="dose_model",
+        help="LQ-L follows the LQ curve up to a per-OAR transition dose "
+             "per fraction and is linear above it, which is less conservative "
+             "than LQ for SBRT-sized fractions.",
+    )
+    if model != "lq":
+        st.caption("The default transition doses d_T are placeholders, not published "
+                   "normal-tissue values; check each OAR's d_T below.")
+
+    # ——— Prior course from DICOM (RT Dose + RT Structure Set) ———
+    with st.expander("Import a prior course from DICOM"):
+        dose_text = st.text_area("RT Dose file(s), one path per line (summed)",
+                                 key="dicom_dose")
+        structure_path = st.text_input("RT Structure Set file", key="dicom_structures")
+        d1, d2 = st.columns(2)
+        dicom_fx = d1.number_input("Fractions of that course", 1, 100, 1, 1, key="dicom_fx")
+        dicom_recov = d2.number_input("% recovery", 0, 100, 0, 1, key="dicom_recov")
+        if st.button("Read DICOM", key="dicom_read"):
+            try:
+                with profiling.stage("tab1.dicom"):
+                    st.session_state.dicom_stats = read_dicom_course(
+                        [p.strip() for p in dose_text.splitlines() if p.strip()],
+                        structure_path.strip(), int(dicom_fx), OARS,
+                    )
+            except (ImportError, OSError, ValueError, AttributeError, KeyError) as exc:
+                st.session_state.dicom_stats = None
+                st.error(f"Could not read the DICOM files: {exc}")
+        dicom_stats = st.session_state.get("dicom_stats")
+        if dicom_stats:
+            st.dataframe(pd.DataFrame.from_dict(dicom_stats, orient="index").drop(
+                columns="voxels").round(2))
+            st.caption("Doses in Gy; EQD₂ uses the matched OAR's α/β (3 Gy otherwise).")
+            matched = match_structures(dicom_stats, selected)
+            rois = ["—"] + list(dicom_stats)
+            mapping = {}
+            for oar in selected:
+                roi = st.selectbox(f"Structure for {oar}", rois,
+                                   index=rois.index(matched.get(oar, "—")),
+                                   key=f"dicom_map_{oar}")
+                if roi != "—":
+                    mapping[oar] = roi
+            st.button("Add as a prior course (structure max dose)", key="dicom_add",
+                      disabled=not mapping, on_click=add_dicom_course,
+                      args=(dicom_stats, mapping, dicom_fx, dicom_recov))
+
+    if "oar_inputs" not in st.session_state:
+        st.session_state.oar_inputs = {}
+
+    # Each OAR panel is a fragment: editing one of its inputs reruns only
+    # that panel, not the whole script.
+    @st.fragment
+    def oar_panel(oar):
         st.subheader(oar)
 
         # 1) Max EQD₂ limit override  (0–150 Gy)
@@ -525,7 +238,6 @@ with tab1:
             step=0.1,
             key=f"{oar}_limit"
         )
-        limit_overrides[oar] = limit
 
         # 2) α/β override (0.1–100 Gy)
         default_ab = (
@@ -541,17 +253,19 @@ with tab1:
             step=0.1,
             key=f"{oar}_ab"
         )
-        ab_overrides[oar] = ab
 
         # 3) Prior courses
         n_courses = st.number_input(
             f"Number of prior courses for {oar}",
             min_value=0,
             max_value=10,
-            value=0,
             step=1,
             key=f"{oar}_nc"
         )
+        from_interval = st.checkbox(
+            "Estimate recovery from time since each course",
+            key=f"{oar}_rec_from_interval",
+        )
 
         courses = []
         for i in range(1, int(n_courses) + 1):
@@ -567,54 +281,89 @@ with tab1:
                 step=1,
                 key=f"{oar}_fx{i}"
             )
-            recov_pct = st.number_input(
-                f"  Course {i} % recovery",
-                min_value=0,
-                max_value=100,
-                value=0,
-                step=1,
-                key=f"{oar}_recov{i}"
-            )
+            if from_interval:
+                months = st.number_input(
+                    f"  Course {i} months since course",
+                    min_value=0.0,
+                    max_value=240.0,
+                    value=12.0,
+                    step=1.0,
+                    key=f"{oar}_months{i}"
+                )
+                recov_pct = 100.0 * recovery_fraction(months)
+                st.caption(f"Estimated recovery: {recov_pct:.0f} %")
+            else:
+                recov_pct = st.number_input(
+                    f"  Course {i} % recovery",
+                    min_value=0,
+                    max_value=100,
+                    step=1,
+                    key=f"{oar}_recov{i}"
+                )
             courses.append({
                 "dose":      float(dose),
                 "fractions": int(fx),
                 "recovery":  recov_pct / 100.0
             })
 
-        prior_data[oar] = courses
+        # 4) Transition dose per fraction (LQ-L only)
+        d_t = None
+        if st.session_state.dose_model != "lq":
+            d_t = st.number_input(
+                f"{oar} transition dose d_T (Gy/fx)",
+                min_value=1.0,
+                max_value=30.0,
+                value=float(transition_dose(oar)),
+                step=0.5,
+                key=f"{oar}_d_t",
+                help="The default is a placeholder, not a published value for "
+                     "this organ; enter the d_T from your own source.",
+            )
+
+        st.session_state.oar_inputs[oar] = {
+            "limit": limit, "ab": ab, "courses": courses, "d_t": d_t
+        }
+
+    for oar in selected:
+        oar_panel(oar)
+
+    inputs          = st.session_state.oar_inputs
+    prior_data      = {o: inputs[o]["courses"] for o in selected}
+    limit_overrides = {o: inputs[o]["limit"] for o in selected}
+    ab_overrides    = {o: inputs[o]["ab"] for o in selected}
+    d_t_overrides   = {o: inputs[o].get("d_t") for o in selected}
 
     # Calculate button
     if st.button("Calculate"):
-        st.session_state.prior_data      = prior_data
-        st.session_state.limit_overrides = limit_overrides
-        st.session_state.ab_overrides    = ab_overrides
-        st.session_state.selected        = selected
-        st.session_state.stage           = "results"
-        st.rerun()
+        key = inputs_key(prior_data, limit_overrides, ab_overrides, model, d_t_overrides)
+        # unchanged inputs: the results already on screen stand
+        if (st.session_state.get("stage") != "results"
+                or st.session_state.get("report_key") != key):
+            st.session_state.prior_data      = prior_data
+            st.session_state.limit_overrides = limit_overrides
+            st.session_state.ab_overrides    = ab_overrides
+            st.session_state.d_t_overrides   = d_t_overrides
+            st.session_state.report_model    = model
+            st.session_state.selected        = selected
+            st.session_state.report_key      = key
+            st.session_state.stage           = "results"
+            st.rerun()
 
     # ——— RESULTS stage ———
-    if st.session_state.get("stage") == "results":
-        report = {}
-        for oar in st.session_state.selected:
-            courses = st.session_state.prior_data[oar]
-            ab      = st.session_state.ab_overrides[oar]
-            limit   = st.session_state.limit_overrides[oar]
-
-            raw = eff = 0.0
-            for c in courses:
-                eq = eqd2(c["fractions"], c["dose"]/c["fractions"], ab)
-                raw += eq
-                eff += eq * (1 - c["recovery"])
-
-            remaining = max(limit - eff, 0.0)
-            report[oar] = {
-                "limit":     limit,
-                "raw":       raw,
-                "recovered": raw - eff,
-                "eff":       eff,
-                "left":      remaining,
-                "ab":        ab
-            }
+    # The results panel is a fragment too, so its own controls (fraction
+    # range, Monte Carlo settings) rerun only this panel.
+    @st.fragment
+    def results_panel():
+        with profiling.stage("tab1.report"):
+            report = cached_report(
+                st.session_state.report_key,
+                st.session_state.selected,
+                st.session_state.prior_data,
+                st.session_state.ab_overrides,
+                st.session_state.limit_overrides,
+                st.session_state.report_model,
+                st.session_state.d_t_overrides,
+            )
 
         st.header("Results")
         for oar, r in report.items():
@@ -624,18 +373,115 @@ with tab1:
                 st.write(f"- **Total recovered:** {r['recovered']:.1f} Gy")
                 st.write(f"- **Effective prior EQD₂:** {r['eff']:.1f} Gy")
                 st.write(f"- **Remaining room:** {r['left']:.1f} Gy")
-                st.info(f"α/β used: {r['ab']:.1f} Gy")
+                model_note = ("" if r["model"] == "lq" else
+                              f" · {DOSE_MODELS[r['model']]} model, d_T {r['d_t']:.1f} Gy/fx")
+                st.info(f"α/β used: {r['ab']:.1f} Gy{model_note}")
 
                 st.write("**Permissible regimens:**")
-                for nfx in FRACTION_OPTIONS:
-                    d_per_fx = max_d_per_fraction(nfx, r["left"], r["ab"])
-                    total_d  = d_per_fx * nfx
-                    st.write(f"- {nfx} fx → {total_d:.1f} Gy ({d_per_fx:.2f} Gy/fx)")
+                for nfx, d, total_d in permissible_regimens(r["left"], r["ab"],
+                                                            model=r["model"], d_t=r["d_t"]):
+                    st.write(f"- {nfx} fx → {total_d:.1f} Gy ({d:.2f} Gy/fx)")
+
+        download_buttons(export.report_rows(report), export.REPORT_COLUMNS,
+                         "reirradiation_report", "report_download",
+                         title="Re-irradiation report")
+
+        # ——— All OARs at once: binding organ per fraction count ———
+        if report:
+            st.subheader("Combined regimen (all selected OARs)")
+            lo, hi = st.slider(
+                "Fraction range",
+                min_value=1,
+                max_value=40,
+                value=FRACTION_RANGE,
+                key="regimen_range",
+            )
+            joint = solve_regimens(
+                [r["left"] for r in report.values()],
+                [r["ab"] for r in report.values()],
+                names=list(report),
+                fractions=fraction_counts(lo, hi),
+                model=st.session_state.report_model,
+                d_t=None if st.session_state.report_model == "lq"
+                else [r["d_t"] for r in report.values()],
+            )
+            joint_df = pd.DataFrame({
+                "Fractions":           joint["fractions"],
+                "Max total dose (Gy)": joint["total"].round(2),
+                "Max dose/fx (Gy)":    joint["d_per_fx"].round(2),
+                "Binding OAR":         joint["binding"],
+            }).set_index("Fractions")
+            st.line_chart(joint_df["Max total dose (Gy)"])
+            st.dataframe(joint_df)
+
+        # ——— Monte Carlo: uncertain α/β and recovery ———
+        with st.expander("Uncertainty (Monte Carlo)"):
+            u1, u2, u3, u4 = st.columns(4)
+            with u1:
+                ab_sigma = st.number_input(
+                    "α/β spread (log‑normal σ, %)", 0.0, 100.0, 20.0, 5.0, key="mc_ab_sigma"
+                )
+            with u2:
+                rec_width = st.number_input(
+                    "Recovery ± (percentage points)", 0, 50, 10, 1, key="mc_rec_width"
+                )
+            with u3:
+                n_samples = st.selectbox(
+                    "Samples", [100_000, 1_000_000], key="mc_samples",
+                    format_func=lambda n: f"{n:,}",
+                )
+                seed = st.number_input("Seed", 0, 2**31 - 1, 0, 1, key="mc_seed")
+            with u4:
+                room_x = st.number_input(
+                    "Report P(remaining room > x), x (Gy)", 0.0, 150.0, 0.0, 0.5,
+                    key="mc_room_x",
+                )
+
+            def mc_table():
+                w = rec_width / 100.0
+                mc_rows = []
+                for oar, r in report.items():
+                    courses = [
+                        dict(c, recovery=("uniform", max(c["recovery"] - w, 0.0),
+                                          min(c["recovery"] + w, 1.0)) if w else c["recovery"])
+                        for c in st.session_state.prior_data[oar]
+                    ]
+                    ab_spec = ("lognormal", r["ab"], ab_sigma / 100.0) if ab_sigma else r["ab"]
+                    mc = remaining_room_mc(courses, ab_spec, r["limit"], n_samples, int(seed),
+                                           model=r["model"], d_t=r["d_t"])
+                    room = percentiles(mc["left"])
+                    d_p5 = percentiles(mc["d_per_fx"], (5,))[5]
+                    row = {
+                        "OAR":              oar,
+                        "Room P5 (Gy)":     room[5],
+                        "Room median (Gy)": room[50],
+                        "Room P95 (Gy)":    room[95],
+                        f"P(room > {room_x:g} Gy)": float(prob_above(mc["left"], room_x)),
+                    }
+                    for nfx, d in zip(FRACTION_OPTIONS, d_p5):
+                        row[f"{nfx} fx, P5 (Gy/fx)"] = d
+                    mc_rows.append(row)
+                return mc_rows
+
+            mc_rows = cached_mc(
+                "remaining_room",
+                [st.session_state.report_key, list(report), ab_sigma, rec_width,
+                 n_samples, int(seed), room_x],
+                mc_table,
+            )
+            st.dataframe(pd.DataFrame(mc_rows).set_index("OAR").round(3))
+            st.caption(
+                "P5 columns are the conservative (5th percentile) values; "
+                "the same seed reproduces the same samples."
+            )
 
         if st.button("← Back"):
             st.session_state.stage = "input"
             st.rerun()
-with tab3:
+
+    if st.session_state.get("stage") == "results":
+        results_panel()
+with tab3, profiling.stage("tab3"):
     st.header("OAR Dose Constraints Lookup")
 
     # — Friendly user instructions —
@@ -646,14 +492,63 @@ with tab3:
         "The available dose constraints for your selected OAR(s) per CORSAIR Practical Summary or TG101 are listed below."
     )
 
-    # — Rename the five dropdown labels —
-    setting_map = {
-        "General (Adult)":                       general_constraints,
-        "Experimental CORSAIR OARs":             experimental_constraints,
-        "Hodgkin’s Lymphoma":                    hodgkin_constraints,
-        "Hypofractionated Breast Radiotherapy":  hypo_constraints,
-        "Pediatric Radiotherapy":                pediatric_constraints,
-    }
+    # — Search every catalog (settings, 3D‑CRT, SBRT, protocols) by organ —
+    with st.expander("Search all catalogs by organ"):
+        query = st.text_input("Organ name (synonyms, prefixes and typos are fine):",
+                              key="organ_search", placeholder="e.g. brain stem, cochleae")
+        if query:
+            with profiling.stage("tab3.search"):
+                finder = organ_search()
+                matches = finder.search(query)
+            if not matches:
+                st.write("_No organ matches that name._")
+            else:
+                match = st.selectbox("Matching organs:", matches, key="organ_search_pick",
+                                     format_func=lambda m: f"{m.name} ({m.count})")
+                st.dataframe(pd.DataFrame([
+                    {"Source": r.setting,
+                     "Scheme": SCHEME_LABELS.get(r.scheme, r.scheme.replace("_", " ")),
+                     "OAR": r.organ, "Constraint": r.text,
+                     "Category": r.category or "", "Reference": r.source}
+                    for r in finder.constraints(match.name)
+                ]), hide_index=True)
+                download_buttons(
+                    export.constraint_rows(finder.constraints(match.name)),
+                    export.CONSTRAINT_COLUMNS, f"constraints_{match.key.replace(' ', '_')}",
+                    "organ_search_download", title=f"Constraints: {match.name}",
+                )
+
+    # — SBRT limits as EQD₂ and at other fraction counts (compiled with the catalog) —
+    with st.expander("SBRT limits as EQD₂ and at 1–10 fractions"):
+        sbrt_table = catalog["sbrt_eqd2"]
+        c1, c2 = st.columns([3, 1])
+        with c1:
+            sbrt_organs = st.multiselect("SBRT organ(s):", sbrt_table.organs(),
+                                         key="sbrt_eqd2_organs")
+        with c2:
+            sbrt_ab = st.selectbox("α/β (Gy):", list(sbrt_table.alpha_beta), index=1,
+                                   key="sbrt_eqd2_ab", format_func=lambda a: f"{a:g}")
+        if sbrt_organs:
+            with profiling.stage("tab3.sbrt_eqd2"):
+                sbrt_rows = [row for organ in sbrt_organs
+                             for row in sbrt_table.table(sbrt_ab, organ)]
+            fx_columns = [f"{n} fx (Gy)" for n in sbrt_table.fractions]
+            sbrt_columns = ("source", "scheme", "organ", "constraint", "category",
+                            "eqd2", *fx_columns)
+            sbrt_rows = [
+                [r["setting"], SCHEME_LABELS.get(r["scheme"], r["scheme"]), r["organ"],
+                 r["constraint"], r["category"] or "", round(r["eqd2"], 2),
+                 *(round(t, 2) for t in r["totals"].values())]
+                for r in sbrt_rows
+            ]
+            st.dataframe(pd.DataFrame(sbrt_rows, columns=sbrt_columns), hide_index=True)
+            st.caption("Each limit is converted with the LQ model to EQD₂ and to the "
+                       "total dose with the same EQD₂ over 1–10 fractions.")
+            download_buttons(sbrt_rows, sbrt_columns, "sbrt_eqd2", "sbrt_eqd2_download",
+                             title=f"SBRT limits as EQD2 (alpha/beta {sbrt_ab:g} Gy)")
+
+    # — The five catalog settings, keyed by their dropdown labels —
+    setting_map = catalog["settings"]
     setting = st.selectbox("Select treatment setting:", list(setting_map.keys()))
     constraints = setting_map[setting]
 
@@ -665,15 +560,7 @@ with tab3:
         st.info("Please select one or more organs to see constraints.")
     else:
         # — Determine which fractionation schemes are actually present —
-        scheme_label_map = {
-            "conventional":               "Conventional",
-            "1_fraction":                 "1 Fraction",
-            "3_fraction":                 "3 Fractions",
-            "5_fraction":                 "5 Fractions",
-            "8_fraction":                 "8 Fractions",
-            "moderate_hypofractionation": "Moderate hypofractionation",
-            "ultra_hypofractionation":    "Ultra‑hypofractionation",
-        }
+        scheme_label_map = SCHEME_LABELS
         available_keys = {
             k
             for organ in selected_organs
@@ -690,37 +577,50 @@ with tab3:
             scheme_key   = inv_map[scheme_label]
 
             # — Display the constraints and collect used references —
-            used_refs = set()
-            st.subheader(f"{setting} — {scheme_label}")
-            for organ in selected_organs:
-                st.markdown(f"#### {organ.replace('_',' ')}")
-                entries = constraints[organ].get(scheme_key, [])
-                if entries:
-                    for e in entries:
-                        line = e["constraint"]
-                        src  = e.get("source", "")
-                        # extract all numbers from the source string
-                        for group in re.findall(r"\[(\d+(?:\s*,\s*\d+)*)\]", src):
-                            for num in group.split(","):
-                                used_refs.add(int(num))
-                        if e.get("category"):
-                            line += f"  ({e['category']})"
-                        if src:
-                            line += f" — {src}"
-                        st.write(f"- {line}")
-                else:
-                    st.write("_No constraints defined for this scheme._")
-
-            # — Finally, list only the references you actually used —
-            if used_refs:
-                st.markdown("---")
-                st.subheader("References")
-                for idx in sorted(used_refs):
-                    # guard in case a number isn’t in your references dict
-                    if idx in references:
-                        st.write(f"{idx}. {references[idx]}")
+            with profiling.stage("tab3.lookup"):
+                used_refs = set()
+                ref_index = catalog["reference_ids"]
+                st.subheader(f"{setting} — {scheme_label}")
+                for organ in selected_organs:
+                    st.markdown(f"#### {organ.replace('_',' ')}")
+                    entries = constraints[organ].get(scheme_key, [])
+                    used_refs.update(ref_index.get((setting, organ, scheme_key), ()))
+                    if entries:
+                        for e in entries:
+                            line = e["constraint"]
+                            src  = e.get("source", "")
+                            if e.get("category"):
+                                line += f"  ({e['category']})"
+                            if src:
+                                line += f" — {src}"
+                            st.write(f"- {line}")
+                    else:
+                        st.write("_No constraints defined for this scheme._")
+
+                download_buttons(
+                    export.constraint_rows(
+                        r for organ in selected_organs
+                        for r in catalog["index"].query(organ, scheme_key)
+                        if r.setting == setting
+                    ),
+                    export.CONSTRAINT_COLUMNS, "constraints", "lookup_download",
+                    title=f"{setting} — {scheme_label}",
+                )
+
+                # — Finally, list only the references you actually used —
+                if used_refs:
+                    references = catalog["references"]
+                    st.markdown("---")
+                    st.subheader("References")
+                    for idx in sorted(used_refs):
+                        if idx in references:
+                            st.write(f"{idx}. {references[idx]}")
+                    missing = sorted(used_refs & catalog["dangling_references"].keys())
+                    if missing:
+                        st.caption("Cited but missing from References.yaml: "
+                                   + ", ".join(f"[{i}]" for i in missing))
 # ───────────────────────── Tab 4: Iso‑effective BED calculator ───────────
-with tab4:
+with tab4, profiling.stage("tab4"):
     st.header("Iso‑effective Radiotherapy Regimen")
 
     # keep baseline results across reruns
@@ -735,21 +635,6 @@ with tab4:
         "Tumour doubling‑time examples: Hall & Giaccia, Table 22.5."
     )
 
-    # ── Helper functions ───────────────────────────────────────────────
-    def bed_time(n, d, ab, alpha, T, Td, Tk=0):
-        repop = 0.0
-        if T > Tk:
-            repop = (math.log(2) / alpha) * (T - Tk) / Td
-        return n * d * (1 + d / ab) - repop
-
-    def iso_effective_dose(n2, T2, ab, alpha, Td, BED_goal, Tk=0):
-        """Return (dose per fraction, total dose)."""
-        R2 = (math.log(2) / alpha) * max(T2 - Tk, 0) / Td
-        C = (BED_goal + R2) / n2
-        disc = ab**2 + 4 * ab * C
-        d2 = (-ab + math.sqrt(disc)) / 2
-        return d2, d2 * n2, R2
-
     # ── 1 • Baseline regimen inputs ────────────────────────────────────
     st.subheader("1 . Baseline regimen")
 
@@ -796,7 +681,7 @@ with tab4:
         BED_base = bed_time(n1, d1, ab, alpha, T1, Td, Tk)
         st.session_state.iso_base = {
             "BED": BED_base, "ab": ab, "alpha": alpha,
-            "Td": Td, "Tk": Tk
+            "Td": Td, "Tk": Tk, "n1": n1, "d1": d1, "T1": T1
         }
 
 # ---- display baseline math flow (pretty) ----
@@ -862,6 +747,104 @@ Check: BED(new) = {BED2:.1f} Gy  ≈ goal.
 """
             )
 
+        with st.expander("Uncertainty (Monte Carlo)"):
+            m1, m2, m3, m4 = st.columns(4)
+            with m1:
+                ab_sig = st.number_input("α/β σ (%)", 0.0, 100.0, 20.0, 5.0, key="iso_mc_ab")
+            with m2:
+                alpha_sig = st.number_input("α σ (%)", 0.0, 100.0, 20.0, 5.0, key="iso_mc_alpha")
+            with m3:
+                td_sig = st.number_input("T_d σ (%)", 0.0, 100.0, 20.0, 5.0, key="iso_mc_td")
+            with m4:
+                iso_samples = st.selectbox(
+                    "Samples", [100_000, 1_000_000], key="iso_mc_samples",
+                    format_func=lambda n: f"{n:,}",
+                )
+                iso_seed = st.number_input("Seed", 0, 2**31 - 1, 0, 1, key="iso_mc_seed")
+
+            base = st.session_state.iso_base
+
+            def spec(value, sigma_pct):
+                return ("lognormal", value, sigma_pct / 100.0) if sigma_pct else value
+
+            def iso_table():
+                mc = iso_effective_mc(
+                    base["n1"], base["d1"], base["T1"], n2, T2,
+                    spec(base["ab"], ab_sig), spec(base["alpha"], alpha_sig),
+                    spec(base["Td"], td_sig), base["Tk"], iso_samples, int(iso_seed),
+                )
+                return pd.DataFrame({
+                    "Baseline BED (Gy)": percentiles(mc["BED"]),
+                    "d₂ (Gy/fx)":        percentiles(mc["d_per_fx"]),
+                    "Total dose (Gy)":   percentiles(mc["total"]),
+                    "R₂ (Gy)":           percentiles(mc["R"]),
+                }).rename(index=lambda q: f"P{q}").round(2)
+
+            st.dataframe(cached_mc(
+                "iso_effective",
+                [base, n2, T2, ab_sig, alpha_sig, td_sig, iso_samples, int(iso_seed)],
+                iso_table,
+            ))
+
+        # ── 3 • Iso‑effective surface over (n₂, T₂) ───────────────────
+        st.markdown("---")
+        st.subheader("3 . Iso‑effective surface")
+
+        base = st.session_state.iso_base
+        surface = st.session_state.get("iso_surface")
+        if surface is None or not surface.matches(
+            base["BED"], base["ab"], base["alpha"], base["Td"], base["Tk"]
+        ):
+            surface = IsoSurface(
+                base["BED"], base["ab"], base["alpha"], base["Td"], base["Tk"]
+            )
+            st.session_state.iso_surface = surface
+
+        c6, c7, c8 = st.columns(3)
+        with c6:
+            n_range = st.slider("n₂ range", 1, 100, (1, 40), key="iso_n_range")
+        with c7:
+            T_range = st.slider("T₂ range (days)", 1, 365, (1, 80), key="iso_T_range")
+        with c8:
+            quantity = st.selectbox(
+                "Show", ["Dose per fraction (Gy)", "Total dose (Gy)"],
+                key="iso_quantity",
+            )
+
+        sweep = surface.sweep(n_range, T_range)
+        values = sweep["d_per_fx" if quantity.startswith("Dose per") else "total"]
+        grid = pd.DataFrame(values, index=sweep["n"], columns=sweep["T"])
+        grid.index.name, grid.columns.name = "n₂", "T₂ (days)"
+        long = grid.stack().rename(quantity).reset_index()
+        st.altair_chart(
+            alt.Chart(long).mark_rect().encode(
+                x=alt.X("T₂ (days):O"),
+                y=alt.Y("n₂:O", sort="descending"),
+                color=alt.Color(f"{quantity}:Q", scale=alt.Scale(scheme="viridis")),
+                tooltip=["n₂", "T₂ (days)", alt.Tooltip(f"{quantity}:Q", format=".2f")],
+            ),
+        )
+        with st.expander("Table"):
+            st.dataframe(grid.round(2))
+            st.dataframe(
+                pd.DataFrame({"T₂ (days)": sweep["T"], "R₂ (Gy)": sweep["R"].round(2)})
+                .set_index("T₂ (days)").T
+            )
+
     # ---- footer: formula reminder ----
     st.caption("BED formula with proliferation: "
                "BED = n d (1+d/αβ) − (ln 2/α)·(T−T_k)/T_d")
+
+# ——— Debug: per-stage timings (REIRRAD_PROFILE=1) ———
+timings = profiling.end_run()
+if timings:
+    with st.sidebar.expander("Debug: stage timings"):
+        st.write(f"Script run: {timings['total_ms']:.1f} ms")
+        st.dataframe(
+            pd.DataFrame(
+                sorted(timings["stages"].items(), key=lambda kv: -kv[1]),
+                columns=["Stage", "ms"],
+            ).set_index("Stage").round(2)
+        )
+        if timings["profile"]:
+            st.caption(f"Profile saved to {timings['profile']}")
@@ -0,0 +1,67 @@
+"""Import-time budget for the headless ``reirrad`` core.
+
+Each import is timed in a fresh interpreter (best of several runs) so worker
+processes can rely on a fast start.  Exits non-zero when a budget is exceeded
+or when Streamlit, pandas or PyYAML get pulled in at import time.
+
+    python benchmarks/import_budget.py [--repeat 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# module → budget in milliseconds (wall time of the import statement only)
+BUDGETS_MS = {
+    "reirrad": 15.0,
+    "reirrad.tables": 25.0,
+    "reirrad.catalog": 30.0,
+    "reirrad.radiobiology": 250.0,  # dominated by NumPy itself
+}
+
+FORBIDDEN = ("streamlit", "pandas", "yaml")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - t0) * 1000.0
+print(json.dumps({{"ms": elapsed,
+                  "forbidden": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeat):
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, forbidden=FORBIDDEN)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(out)
+        if best is None or result["ms"] < best["ms"]:
+            best = result
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        result = measure(module, args.repeat)
+        ok = result["ms"] <= budget and not result["forbidden"]
+        failed |= not ok
+        extra = f"  imports {', '.join(result['forbidden'])}!" if result["forbidden"] else ""
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<24} {result['ms']:7.1f} ms "
+              f"(budget {budget:.0f} ms){extra}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
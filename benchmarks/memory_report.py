@@ -0,0 +1,100 @@
+"""Memory of concurrent app sessions: per-session overhead from 1 to 100 users.
+
+Opens headless app sessions (Streamlit AppTest) one after another and keeps
+them all alive, as a server does with concurrent users; each session runs the
+script and a Tab 3 lookup.  Traced Python memory is sampled at each
+checkpoint, and the per-session column is the growth since the previous
+checkpoint divided by the sessions added.  With one shared catalog it stays
+flat: no session pays for its own copy of the constraint tables.
+
+    python benchmarks/memory_report.py
+    python benchmarks/memory_report.py --sessions 1,10,50,100 -o memory.json
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def catalog_footprint():
+    """Traced bytes of one loaded catalog (from its snapshot) and protocol book."""
+    from reirrad import catalog, protocols
+
+    catalog.compile_snapshot()
+    protocols.load_protocols()
+    catalog._loaded.clear()
+    protocols._loaded.clear()
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    catalog.load_catalog()
+    protocols.load_protocols()
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] - before
+
+
+def open_session(script):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(script, default_timeout=60).run()
+    lookup = next(m for m in at.multiselect if m.label.startswith("Select OAR(s) for"))
+    lookup.select(lookup.options[0]).run()
+    if at.exception:
+        raise RuntimeError(at.exception)
+    return at
+
+
+def measure(checkpoints):
+    from reirrad.catalog import load_catalog
+
+    script = str(ROOT / "app.py")
+    open_session(script)  # imports, caches and the shared catalog
+    gc.collect()
+    base = tracemalloc.get_traced_memory()[0]
+    shared = load_catalog()
+
+    sessions, rows, last_n, last_mem = [], [], 0, base
+    for n in checkpoints:
+        while len(sessions) < n:
+            sessions.append(open_session(script))
+        gc.collect()
+        mem = tracemalloc.get_traced_memory()[0]
+        rows.append({
+            "sessions": n,
+            "total_mb": (mem - base) / 2**20,
+            "per_session_kb": (mem - last_mem) / (n - last_n) / 1024,
+            "catalog_shared": load_catalog() is shared,
+        })
+        last_n, last_mem = n, mem
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="1,10,25,50,100",
+                        help="comma-separated session-count checkpoints")
+    parser.add_argument("-o", "--output", help="write the report as JSON here")
+    args = parser.parse_args(argv)
+    checkpoints = sorted({int(n) for n in args.sessions.split(",") if n.strip()})
+
+    tracemalloc.start()
+    footprint = catalog_footprint()
+    rows = measure(checkpoints)
+
+    print(f"catalog + protocols, loaded once per process: {footprint / 1024:.0f} KB")
+    print(f"{'sessions':>8} {'total MB':>10} {'KB/session':>11} {'shared catalog':>15}")
+    for r in rows:
+        print(f"{r['sessions']:>8} {r['total_mb']:>10.1f} {r['per_session_kb']:>11.0f} "
+              f"{str(r['catalog_shared']):>15}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(
+            {"catalog_kb": footprint / 1024, "checkpoints": rows}, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+"""Benchmark suite: kernels, catalog load, service throughput and headless app interactions.
+
+Every benchmark reports the best of ``--repeat`` runs in milliseconds per
+operation; each run loops the operation for at least :data:`MIN_TIME`
+seconds, so microsecond-scale entries are not timer noise.  Results are
+written as JSON; with ``--baseline`` each result is compared to the stored
+one and the run fails when any benchmark got slower than ``--threshold`` ×
+baseline by more than ``--floor`` ms.
+
+    python benchmarks/suite.py -o results.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json
+    python benchmarks/suite.py --only kernels. --save-baseline   # refresh subset
+
+Baselines are machine-specific; refresh them on the machine that gates
+deploys.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+ARRAY_SIZE = 1_000_000
+MIN_TIME = 0.1  # seconds of looping per timed run
+
+
+def _per_call(stmt, number):
+    """One timing of at least ``number`` calls and :data:`MIN_TIME` s, in ms per call."""
+    timer = timeit.Timer(stmt)
+    elapsed = timer.timeit(number)
+    if elapsed < MIN_TIME:
+        number = int(number * MIN_TIME / max(elapsed, 1e-9) * 1.2) + 1
+        elapsed = timer.timeit(number)
+    return elapsed * 1000.0 / number
+
+
+# ——— kernels ———
+def _kernels():
+    import numpy as np
+
+    from reirrad import ntcp
+    from reirrad import radiobiology as rb
+
+    rng = np.random.default_rng(0)
+    n = rng.integers(1, 40, ARRAY_SIZE).astype(float)
+    d = rng.uniform(1, 10, ARRAY_SIZE)
+    ab = rng.uniform(1, 10, ARRAY_SIZE)
+    target = rng.uniform(0, 60, ARRAY_SIZE)
+    T = rng.uniform(1, 80, ARRAY_SIZE)
+    d_t = rng.uniform(3, 10, ARRAY_SIZE)
+    relative_dose = np.tile(np.linspace(0, 1.1, 250), (1000, 1))
+    volume = rng.random(relative_dose.shape)
+    return {
+        "kernels.scalar.bed": lambda: _per_call(lambda: rb.bed(5, 6.0, 3.0), 20000),
+        "kernels.scalar.eqd2": lambda: _per_call(lambda: rb.eqd2(5, 6.0, 3.0), 20000),
+        "kernels.scalar.max_d_per_fraction":
+            lambda: _per_call(lambda: rb.max_d_per_fraction(5, 30.0, 3.0), 20000),
+        "kernels.scalar.max_d_per_fraction_lql":
+            lambda: _per_call(lambda: rb.max_d_per_fraction(5, 30.0, 3.0, "lql", 6.0), 20000),
+        "kernels.scalar.bed_time":
+            lambda: _per_call(lambda: rb.bed_time(15, 2.0, 10.0, 0.3, 19, 40, 0), 20000),
+        "kernels.scalar.iso_effective_dose":
+            lambda: _per_call(lambda: rb.iso_effective_dose(5, 5, 10.0, 0.3, 40, 35.0), 20000),
+        "kernels.array_1e6.bed": lambda: _per_call(lambda: rb.bed_array(n, d, ab), 5),
+        "kernels.array_1e6.eqd2": lambda: _per_call(lambda: rb.eqd2_array(n, d, ab), 5),
+        "kernels.array_1e6.max_d_per_fraction":
+            lambda: _per_call(lambda: rb.max_d_per_fraction_array(n, target, ab), 5),
+        "kernels.array_1e6.eqd2_lql":
+            lambda: _per_call(lambda: rb.eqd2_array(n, d, ab, "lql", d_t), 5),
+        "kernels.array_1e6.max_d_per_fraction_lql":
+            lambda: _per_call(
+                lambda: rb.max_d_per_fraction_array(n, target, ab, "lql", d_t), 5),
+        "kernels.array_1e6.iso_effective_dose":
+            lambda: _per_call(
+                lambda: rb.iso_effective_dose_array(n, T, ab, 0.3, 40, 35.0), 5),
+        "kernels.ntcp_cohort_1000x4": lambda: _per_call(
+            lambda: ntcp.regimen_ntcp(relative_dose, volume, [8.0, 6.0, 4.0, 2.5],
+                                      organ="Spinal Cord"), 5),
+        "kernels.batch_reports_1e5": _batch_reports,
+    }
+
+
+def _batch_reports():
+    import numpy as np
+
+    from reirrad.reirradiation import batch_reports
+
+    rows = 100_000
+    rng = np.random.default_rng(1)
+    course_row = np.repeat(np.arange(rows), 2)
+    args = (rng.uniform(1, 10, rows), rng.uniform(30, 60, rows), course_row,
+            rng.uniform(10, 50, 2 * rows), rng.integers(1, 30, 2 * rows),
+            rng.uniform(0, 0.5, 2 * rows))
+    return _per_call(lambda: batch_reports(*args), 3)
+
+
+# ——— catalog ———
+def _catalog():
+    from reirrad import catalog
+    from reirrad.tables import THREED_CONSTRAINTS
+
+    return {
+        "catalog.read_settings": lambda: _per_call(
+            lambda: catalog.read_settings(catalog.DATA_DIR), 3),
+        "catalog.normalize_threed": lambda: _per_call(
+            lambda: catalog.normalize_threed(THREED_CONSTRAINTS), 50),
+        "catalog.build": lambda: _per_call(lambda: catalog.build_catalog(catalog.DATA_DIR), 2),
+        "catalog.cold_load": _cold_load,
+        "catalog.warm_load": lambda: _per_call(catalog.load_catalog, 2000),
+        "catalog.sbrt_eqd2_lookup": lambda: _per_call(
+            lambda: catalog.load_catalog()["sbrt_eqd2"].table(3.0, "Heart"), 2000),
+        "catalog.sbrt_eqd2_off_grid": lambda: _per_call(
+            lambda: catalog.load_catalog()["sbrt_eqd2"].table(2.5), 200),
+    }
+
+
+_COLD_PROBE = """
+import time
+t0 = time.perf_counter()
+from reirrad.catalog import load_catalog
+load_catalog()
+print((time.perf_counter() - t0) * 1000.0)
+"""
+
+
+def _cold_load():
+    """Import + load from the snapshot in a fresh interpreter."""
+    from reirrad.catalog import compile_snapshot
+
+    compile_snapshot()
+    out = subprocess.run([sys.executable, "-c", _COLD_PROBE], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return float(out)
+
+
+# ——— protocol plan checks ———
+def _protocols():
+    import numpy as np
+
+    from reirrad.dvh import DVH
+    from reirrad.protocols import load_protocols
+
+    book = load_protocols()
+    dose = np.linspace(0.0, 70.0, 2001)
+    plan = {organ: DVH.from_cumulative(organ, dose, np.clip(100 * (1 - dose / 40), 0, 100))
+            for organ in {r.organ for r in book.records}}
+    return {
+        "protocols.check_all": lambda: _per_call(lambda: book.check(plan), 200),
+        "protocols.check_site": lambda: _per_call(
+            lambda: book.check(plan, site="lung", fractions=5), 200),
+    }
+
+
+# ——— organ search ———
+def _search():
+    from reirrad.search import organ_search
+
+    finder = organ_search()
+    return {
+        "search.prefix": lambda: _per_call(lambda: finder.search("optic ch"), 2000),
+        "search.alias": lambda: _per_call(lambda: finder.search("brain stem"), 2000),
+        "search.typo": lambda: _per_call(lambda: finder.search("spinl cord"), 200),
+    }
+
+
+# ——— DICOM masks and per-structure doses (synthetic grid, no pydicom) ———
+def _dicom():
+    from types import SimpleNamespace
+
+    import numpy as np
+
+    from reirrad import dicom
+
+    frames, rows, cols = 120, 256, 256
+    grid = SimpleNamespace(shape=(frames, rows, cols), origin=(-128.0, -128.0, 0.0),
+                           dx=1.0, dy=1.0, z=np.arange(frames) * 2.5, voxel_cc=0.0025)
+    data = np.random.default_rng(0).uniform(0, 60, grid.shape).astype(np.float32)
+    grid.frame = lambda k: data[k]
+    t = np.linspace(0, 2 * np.pi, 360, endpoint=False)
+    planes = [(z, np.column_stack([60 * np.cos(t), 40 * np.sin(t)]))
+              for z in np.arange(0, frames * 2.5, 2.5)]
+    mask = dicom.rasterize(planes, grid)
+    masks = {f"roi_{i}": mask[i::20] for i in range(20)}
+    from reirrad import dvh
+
+    return {
+        "dicom.rasterize_120_planes": lambda: _per_call(lambda: dicom.rasterize(planes, grid), 3),
+        "dicom.structure_doses_20": lambda: _per_call(
+            lambda: dicom.structure_doses(grid, masks, fractions=30), 3),
+        "dicom.dvhs_from_masks_20": lambda: _per_call(
+            lambda: dvh.dvhs_from_masks(grid, masks, fractions=30), 3),
+    }
+
+
+# ——— calculation service ———
+SERVICE_CLIENTS = 16
+SERVICE_REQUESTS = 4000
+SERVICE_DISTINCT = 200  # distinct bodies, so the cache sees hits and misses
+
+
+def _service_bodies():
+    return [json.dumps({"courses": [{"dose": 20 + i % 40, "fractions": 5 + i % 10,
+                                     "recovery": 0.25}],
+                        "ab": 2, "limit": 50 + i // 40}).encode()
+            for i in range(SERVICE_DISTINCT)]
+
+
+def _service_http():
+    """ms per request: keep-alive clients against the asyncio server (1/throughput)."""
+    import asyncio
+
+    from reirrad.service import Service, make_handler
+
+    bodies = _service_bodies()
+    requests = [
+        b"POST /v1/remaining-room HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s"
+        % (len(body), body) for body in bodies]
+
+    async def client(port, k):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for i in range(k, SERVICE_REQUESTS, SERVICE_CLIENTS):
+            writer.write(requests[i % len(requests)])
+            length = 0
+            while (line := await reader.readline()) != b"\r\n":
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(make_handler(Service()), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            t0 = time.perf_counter()
+            await asyncio.gather(*(client(port, k) for k in range(SERVICE_CLIENTS)))
+            return (time.perf_counter() - t0) * 1000.0 / SERVICE_REQUESTS
+
+    return asyncio.run(main())
+
+
+def _service():
+    from reirrad.service import Service
+
+    bodies = _service_bodies()
+    warm = Service()
+    for body in bodies:
+        warm.handle("POST", "/v1/remaining-room", body)
+    cold = Service(cache_size=0)
+    return {
+        "service.handle_hit": lambda: _per_call(
+            lambda: warm.handle("POST", "/v1/remaining-room", bodies[7]), 2000),
+        "service.handle_miss": lambda: _per_call(
+            lambda: cold.handle("POST", "/v1/remaining-room", bodies[7]), 200),
+        "service.http_16_clients": _service_http,
+    }
+
+
+# ——— headless app (Streamlit AppTest) ———
+def _app():
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        return {}
+    script = str(ROOT / "app.py")
+
+    def fresh():
+        return AppTest.from_file(script, default_timeout=60).run()
+
+    def timed(at, action):
+        t0 = time.perf_counter()
+        action(at).run()
+        if at.exception:
+            raise RuntimeError(at.exception)
+        return (time.perf_counter() - t0) * 1000.0
+
+    def full_run():
+        t0 = time.perf_counter()
+        fresh()
+        return (time.perf_counter() - t0) * 1000.0
+
+    def tab1_calculate():
+        at = fresh()
+        at.multiselect[0].select("Spinal Cord").select("Brain Stem").run()
+        at.number_input(key="Spinal Cord_nc").set_value(2).run()
+        at.number_input(key="Spinal Cord_dose1").set_value(30.0).run()
+        return timed(at, lambda a: next(
+            b for b in a.button if b.label == "Calculate").click())
+
+    def tab1_edit_course():
+        at = fresh()
+        at.multiselect[0].select("Spinal Cord").run()
+        at.number_input(key="Spinal Cord_nc").set_value(3).run()
+        return timed(at, lambda a: a.number_input(key="Spinal Cord_dose2").set_value(20.0))
+
+    def tab3_lookup():
+        at = fresh()
+        lookup = next(m for m in at.multiselect if m.label.startswith("Select OAR(s) for"))
+        return timed(at, lambda a: lookup.select(lookup.options[0]))
+
+    def tab4_baseline():
+        at = fresh()
+        return timed(at, lambda a: next(
+            b for b in a.button if b.label == "Compute baseline BED").click())
+
+    return {
+        "app.full_run": full_run,
+        "app.tab1_calculate": tab1_calculate,
+        "app.tab1_edit_course": tab1_edit_course,
+        "app.tab3_lookup": tab3_lookup,
+        "app.tab4_baseline": tab4_baseline,
+    }
+
+
+def collect(only=()):
+    cases = {}
+    for group in (_kernels, _catalog, _protocols, _search, _dicom, _service, _app):
+        cases.update(group())
+    if only:
+        cases = {k: v for k, v in cases.items() if k.startswith(tuple(only))}
+    return cases
+
+
+def run(cases, repeat):
+    results = {}
+    for name, fn in cases.items():
+        fn()  # warm-up
+        runs = [fn() for _ in range(repeat)]
+        results[name] = {"ms": min(runs), "runs": runs}
+        print(f"{name:<40} {min(runs):12.4f} ms", file=sys.stderr)
+    return results
+
+
+def _meta():
+    import numpy as np
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "platform": platform.platform(),
+            "commit": commit, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(results, baseline, threshold, floor=0.0):
+    """Return [(name, ms, baseline ms, ratio)] for regressions beyond ``threshold``.
+
+    A result within ``floor`` ms of its baseline never counts as a regression.
+    """
+    slow = []
+    for name, res in results.items():
+        ref = baseline.get("results", {}).get(name)
+        if ref and ref["ms"] > 0:
+            ratio = res["ms"] / ref["ms"]
+            if ratio > threshold and res["ms"] - ref["ms"] > floor:
+                slow.append((name, res["ms"], ref["ms"], ratio))
+    return slow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", action="append", default=[],
+                        help="run benchmarks whose name starts with this prefix")
+    parser.add_argument("--baseline", nargs="?", const=str(BASELINE),
+                        help=f"compare against a results file (default {BASELINE.name})")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="fail when slower than this × baseline (default %(default)s)")
+    parser.add_argument("--floor", type=float, default=0.002,
+                        help="ignore slowdowns under this many ms (default %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"merge these results into {BASELINE.name}")
+    args = parser.parse_args(argv)
+
+    results = run(collect(args.only), args.repeat)
+    report = {"meta": _meta(), "results": results}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        merged = json.loads(BASELINE.read_text())["results"] if BASELINE.exists() else {}
+        merged.update(results)
+        stored = {"meta": report["meta"], "results": dict(sorted(merged.items()))}
+        BASELINE.write_text(json.dumps(stored, indent=2) + "\n")
+
+    if args.baseline:
+        slow = compare(results, json.loads(Path(args.baseline).read_text()), args.threshold,
+                       args.floor)
+        for name, ms, ref, ratio in slow:
+            print(f"FAIL {name}: {ms:.4f} ms vs {ref:.4f} ms baseline ({ratio:.2f}×)")
+        if slow:
+            return 1
+        print(f"ok   {len(results)} benchmarks within {args.threshold}× of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""Headless core of the radiotherapy planning tools.
+
+Importing the package is cheap: submodules (and NumPy) are only imported when
+one of the names below is first accessed, and the YAML catalogs are only read
+when :func:`reirrad.catalog.load_catalog` is called.
+"""
+import importlib
+
+_EXPORTS = {
+    "bed": "radiobiology",
+    "eqd2": "radiobiology",
+    "max_d_per_fraction": "radiobiology",
+    "bed_array": "radiobiology",
+    "eqd2_array": "radiobiology",
+    "max_d_per_fraction_array": "radiobiology",
+    "bed_time": "radiobiology",
+    "iso_effective_dose": "radiobiology",
+    "iso_effective_dose_array": "radiobiology",
+    "IsoSurface": "isoeffect",
+    "load_catalog": "catalog",
+    "constraint_index": "catalog",
+    "ConstraintIndex": "constraints",
+    "ConstraintRecord": "constraints",
+    "parse_constraint": "constraints",
+    "cumulative_eqd2": "dosegrid",
+    "recovery_fraction": "recovery",
+    "remaining_room_mc": "uncertainty",
+    "iso_effective_mc": "uncertainty",
+    "DVH": "dvh",
+    "iter_dvh_file": "dvh",
+    "load_dvh_file": "dvh",
+    "dvhs_from_masks": "dvh",
+    "dvh_ntcp": "ntcp",
+    "regimen_ntcp": "ntcp",
+    "open_dose": "dicom",
+    "prior_course": "dicom",
+    "load_protocols": "protocols",
+    "organ_search": "search",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
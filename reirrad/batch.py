@@ -0,0 +1,347 @@
+"""Streaming batch runner for the re-irradiation calculator.
+
+Runs the Tab 1 calculation (summed EQD₂ of prior courses, recovery, remaining
+room and the permissible regimen for each fraction count) over every row of
+a CSV or JSON-lines export:
+
+    python -m reirrad.batch patients.csv -o results.csv --workers 8
+
+Input rows carry ``patient``, ``oar``, ``alpha_beta`` (or ``ab``), ``limit``
+(max EQD₂, Gy) and ``courses``.  In JSON lines ``courses`` is a list of
+``{"dose", "fractions", "recovery"}`` objects; in CSV it is a ``;``-separated
+list of ``dose/fractions/recovery`` triples, e.g. ``30/10/0.25;20/5/0``.
+Recovery is a fraction of the course's EQD₂ (``25%`` is also accepted), or
+``@months`` — the interval since the course — to take it from the
+recovery curve (``interval_months`` in JSON lines).  ``--model lql`` switches
+to the LQ-L model, with each row's transition dose taken from an optional
+``d_t`` column or the OAR's default.
+
+Rows are read lazily, processed in chunks on a process pool (each chunk as a
+single array computation) and written in input order as soon as they are
+done, so memory stays bounded by ``workers × chunk size`` rows.  A row that
+cannot be parsed is written with an ``error`` message instead of aborting
+the run.
+
+The output format follows the ``-o`` extension: CSV, JSON lines
+(``.jsonl``), one JSON array (``.json``) or a paginated PDF table (``.pdf``,
+see :mod:`reirrad.export`).
+"""
+import csv
+import io
+import itertools
+import json
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .tables import FRACTION_OPTIONS
+
+REPORT_FIELDS = ("limit", "raw", "recovered", "eff", "left")
+
+
+def _float(value, name):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{name} must be a finite number, got {value!r}")
+    return number
+
+
+def _recovery(value):
+    if isinstance(value, str) and value.strip().endswith("%"):
+        rec = _float(value.strip()[:-1], "recovery") / 100.0
+    else:
+        rec = _float(value, "recovery")
+    if not 0.0 <= rec <= 1.0:
+        raise ValueError(f"recovery must be within 0–1, got {rec}")
+    return rec
+
+
+def parse_courses(value):
+    """Return [(dose, fractions, recovery, months), …] from a CSV string or JSON list.
+
+    Exactly one of ``recovery`` and ``months`` (interval since the course) is
+    a number; the other is NaN.
+    """
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        items = []
+        for part in value.split(";"):
+            if not part.strip():
+                continue
+            fields = part.split("/")
+            if len(fields) not in (2, 3):
+                raise ValueError(f"course must be dose/fractions[/recovery], got {part!r}")
+            item = dict(zip(("dose", "fractions", "recovery"), fields))
+            if item.get("recovery", "").strip().startswith("@"):
+                item["interval_months"] = item.pop("recovery").strip()[1:]
+            items.append(item)
+    else:
+        items = value
+    courses = []
+    for c in items:
+        fx = _float(c["fractions"], "fractions")
+        if fx < 1 or fx != int(fx):
+            raise ValueError(f"fractions must be a positive integer, got {c['fractions']!r}")
+        if c.get("interval_months") is not None:
+            months = _float(c["interval_months"], "interval_months")
+            if months < 0:
+                raise ValueError(f"interval_months must be non-negative, got {months}")
+            rec = math.nan
+        else:
+            rec, months = _recovery(c.get("recovery", 0)), math.nan
+        dose = _float(c["dose"], "dose")
+        if dose < 0:
+            raise ValueError(f"dose must be non-negative, got {dose}")
+        courses.append((dose, int(fx), rec, months))
+    return courses
+
+
+def parse_row(row):
+    """Return (patient, oar, ab, limit, courses, d_t) from one input record.
+
+    ``d_t`` (LQ-L transition dose) defaults to the OAR's.
+    """
+    from .reirradiation import transition_dose
+
+    ab = row.get("alpha_beta", row.get("ab"))
+    ab = _float(ab, "alpha_beta")
+    if ab <= 0:
+        raise ValueError(f"alpha_beta must be positive, got {ab}")
+    oar = row.get("oar", "")
+    d_t = row.get("d_t")
+    d_t = transition_dose(oar) if d_t is None or d_t == "" else _float(d_t, "d_t")
+    if d_t <= 0:
+        raise ValueError(f"d_t must be positive, got {d_t}")
+    limit = _float(row.get("limit"), "limit")
+    if limit < 0:
+        raise ValueError(f"limit must be non-negative, got {limit}")
+    return (row.get("patient", ""), oar, ab, limit, parse_courses(row.get("courses")), d_t)
+
+
+def process_chunk(records, fraction_options=FRACTION_OPTIONS, model="lq", start=0):
+    """Compute output rows for a chunk of input dicts.
+
+    Returns one list per record, ordered like :func:`output_fields`.  Error
+    messages name the row, counting from 1 at ``start`` (the number of input
+    rows before this chunk).
+    """
+    import numpy as np
+
+    from .recovery import recovery_array
+    from .reirradiation import batch_reports
+
+    parsed, errors = [], {}
+    for i, rec in enumerate(records):
+        try:
+            parsed.append((i, parse_row(rec)))
+        except (ValueError, KeyError, TypeError) as exc:
+            errors[i] = f"row {start + i + 1}: {exc}"
+
+    out = [None] * len(records)
+    if parsed:
+        ab = np.array([p[2] for _, p in parsed])
+        limit = np.array([p[3] for _, p in parsed])
+        d_t = None if model == "lq" else np.array([p[5] for _, p in parsed])
+        flat = [(row, *c) for row, (_, p) in enumerate(parsed) for c in p[4]]
+        course_row, dose, fx, rec, months = ((np.array(col) for col in zip(*flat)) if flat
+                                             else (np.array([]),) * 5)
+        from_curve = np.isnan(rec)
+        if from_curve.any():
+            rec[from_curve] = recovery_array(months[from_curve])
+        res = batch_reports(ab, limit, course_row, dose, fx, rec, fraction_options,
+                            model, d_t)
+        d = res["d_per_fx"]
+        totals = d * np.asarray(fraction_options, dtype=float)
+        regimens = np.stack([d, totals], axis=2).reshape(len(parsed), -1)
+        numbers = np.column_stack([ab, limit, res["raw"], res["recovered"], res["eff"],
+                                   res["left"], regimens]).tolist()
+        for (i, p), values in zip(parsed, numbers):
+            out[i] = [p[0], p[1], *values, ""]
+    width = len(output_fields(fraction_options))
+    for i, msg in errors.items():
+        rec = records[i]
+        out[i] = [rec.get("patient", ""), rec.get("oar", "")] + [""] * (width - 3) + [msg]
+    return out
+
+
+def _encode(rows, out_format, fields):
+    """Serialize output rows to text (done in the worker, off the writer's path).
+
+    JSON arrays and PDF are written by a single :mod:`reirrad.export` writer
+    in the parent, so their rows are passed through as they are.
+    """
+    if out_format in ("json", "pdf"):
+        text = rows
+    elif out_format == "csv":
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerows(rows)
+        text = buf.getvalue()
+    else:
+        text = "".join(json.dumps(dict(zip(fields, r)), ensure_ascii=False) + "\n"
+                       for r in rows)
+    return text, len(rows), sum(1 for r in rows if r[-1])
+
+
+def _process_csv_chunk(start, header, rows, fraction_options, out_format, model):
+    out = process_chunk([dict(zip(header, r)) for r in rows], fraction_options, model, start)
+    return _encode(out, out_format, output_fields(fraction_options))
+
+
+def _process_jsonl_chunk(start, lines, fraction_options, out_format, model):
+    records, bad = [], {}
+    for i, line in enumerate(lines):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            record, bad[i] = {}, f"row {start + i + 1}: invalid JSON: {exc}"
+        if not isinstance(record, dict):
+            bad[i] = f"row {start + i + 1}: expected a JSON object, got {type(record).__name__}"
+            record = {}
+        records.append(record)
+    out = process_chunk(records, fraction_options, model, start)
+    for i, msg in bad.items():
+        out[i][-1] = msg
+    return _encode(out, out_format, output_fields(fraction_options))
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def output_fields(fraction_options=FRACTION_OPTIONS):
+    fields = ["patient", "oar", "ab", *REPORT_FIELDS]
+    for n in fraction_options:
+        fields += [f"d_{n}fx", f"total_{n}fx"]
+    return fields + ["error"]
+
+
+def _detect_format(path, explicit):
+    if explicit:
+        return explicit
+    return "jsonl" if str(path).endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def _output_format(path, explicit):
+    from .export import format_for
+
+    return explicit or format_for(path)
+
+
+def run(src, dst, in_format="csv", out_format="csv", workers=1, chunk_size=20000,
+        fraction_options=FRACTION_OPTIONS, model="lq"):
+    """Stream rows from text stream ``src`` to ``dst``; return (rows, errors).
+
+    ``out_format`` is ``csv``, ``jsonl``, ``json`` (one array) or ``pdf``
+    (``dst`` must then be a binary stream); ``model`` is the dose-response
+    model (``lq`` or ``lql``).
+    """
+    fraction_options = tuple(fraction_options)
+    if in_format == "csv":
+        reader = csv.reader(src)
+        header = [h.strip() for h in next(reader, [])]
+        jobs = ((_process_csv_chunk, k * chunk_size, header, rows)
+                for k, rows in enumerate(_chunks(reader, chunk_size)))
+    else:
+        lines = (ln for ln in src if ln.strip())
+        jobs = ((_process_jsonl_chunk, k * chunk_size, rows)
+                for k, rows in enumerate(_chunks(lines, chunk_size)))
+
+    fields = output_fields(fraction_options)
+    document = None
+    if out_format in ("json", "pdf"):
+        from .export import writer
+
+        document = writer(dst, fields, out_format, title="Re-irradiation batch report",
+                          widths=[10, 16] + [10] * (len(fields) - 3) + [28], font_size=6)
+    elif out_format == "csv":
+        csv.writer(dst, lineterminator="\n").writerow(fields)
+    n_rows = n_errors = 0
+
+    def emit(result):
+        nonlocal n_rows, n_errors
+        payload, rows, errors = result
+        if document is None:
+            dst.write(payload)
+        else:
+            document.writerows(payload)
+        n_rows += rows
+        n_errors += errors
+
+    if workers <= 1:
+        for fn, *args in jobs:
+            emit(fn(*args, fraction_options, out_format, model))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for fn, *args in jobs:
+                pending.append(pool.submit(fn, *args, fraction_options, out_format, model))
+                # keep at most two chunks per worker in flight
+                if len(pending) >= 2 * workers:
+                    emit(pending.popleft().result())
+            while pending:
+                emit(pending.popleft().result())
+    if document is not None:
+        document.close()
+    return n_rows, n_errors
+
+
+def main(argv=None):
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(
+        description="Run the re-irradiation calculator over a CSV/JSONL export.")
+    parser.add_argument("input", help="input file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file (default stdout)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"))
+    parser.add_argument("--output-format", choices=("csv", "jsonl", "json", "pdf"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=20000)
+    parser.add_argument("--fractions", default=",".join(map(str, FRACTION_OPTIONS)),
+                        help="comma-separated fraction counts (default %(default)s)")
+    parser.add_argument("--model", choices=("lq", "lql"), default="lq",
+                        help="dose-response model (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    in_format = _detect_format(args.input, args.input_format)
+    out_format = _output_format(args.output, args.output_format)
+    fractions = [int(n) for n in args.fractions.split(",") if n.strip()]
+
+    from_stdin = args.input == "-"
+    src = (io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="") if from_stdin
+           else open(args.input, "r", encoding="utf-8", newline=""))
+    binary = out_format == "pdf"
+    if args.output == "-":
+        dst = sys.stdout.buffer if binary else sys.stdout
+    else:
+        dst = (open(args.output, "wb") if binary
+               else open(args.output, "w", encoding="utf-8", newline=""))
+    t0 = time.perf_counter()
+    try:
+        n_rows, n_errors = run(src, dst, in_format, out_format, args.workers,
+                               args.chunk_size, fractions, args.model)
+    finally:
+        if from_stdin:
+            src.detach()  # leave sys.stdin open
+        else:
+            src.close()
+        if dst not in (sys.stdout, sys.stdout.buffer):
+            dst.close()
+    print(f"{n_rows} rows ({n_errors} errors) in {time.perf_counter() - t0:.1f} s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""Lazily loaded constraint catalogs.
+
+Nothing is read from disk until :func:`load_catalog` is first called.  The
+YAML sources are compiled once into a pre-normalized binary snapshot (see
+:mod:`reirrad.snapshot`); later processes load that snapshot instead of
+parsing YAML, and PyYAML is only imported when a recompile is needed.
+
+The loaded catalog is one read-only object per process, shared by every
+caller (and every Streamlit session): mappings are
+:class:`types.MappingProxyType`, lists are tuples, YAML entries are
+``__slots__`` :class:`Entry` records and repeated strings are interned.
+
+    python -m reirrad.catalog            # (re)compile the snapshot
+"""
+import copy
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from types import MappingProxyType
+
+from . import snapshot
+from .profiling import stage
+from .tables import (
+    REFERENCES, REFERENCES_SOURCE, SBRT_BODY, SBRT_INTRACRANIAL, SETTING_SOURCES,
+    THREED_CONSTRAINTS,
+)
+
+DATA_DIR = Path(os.environ.get("REIRRAD_DATA_DIR", Path(__file__).resolve().parent.parent))
+
+_SUB_MAP = str.maketrans("₀₁₂₃₄₅₆₇₈₉", "0123456789")
+
+
+def normalize_constraint_text(txt):
+    """Normalize unicode subscripts and tidy spacing in a constraint string."""
+    s = txt.translate(_SUB_MAP)
+    s = re.sub(r"\s*\(\s*0\.03\s*cc\s*\)\s*", " 0.03 cc ", s)
+    s = re.sub(r"\bV\s*([\d\.]+)\s*(?=[<≥])", r"V\1 Gy ", s)
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def normalize_threed(tables):
+    """Return a copy of the 3D‑CRT tables with normalized constraint text."""
+    out = copy.deepcopy(tables)
+    for rows in out.values():
+        for row in rows:
+            for col in ("Preferred", "Acceptable"):
+                if row[col]:
+                    row[col] = normalize_constraint_text(row[col])
+    return out
+
+
+def wrap_schemes(table):
+    """Wrap list-only organs (organ → [ … ]) under a 'conventional' scheme key."""
+    return {
+        organ: {"conventional": val} if isinstance(val, list) else val
+        for organ, val in table.items()
+    }
+
+
+class Entry:
+    """One read-only YAML constraint entry; read like the mapping it was parsed from."""
+
+    __slots__ = ("constraint", "source", "category")
+
+    def __init__(self, constraint, source="", category=None):
+        self.__setstate__((sys.intern(constraint), sys.intern(source or ""),
+                           category and sys.intern(category)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Entry is read-only (cannot set {name!r})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Entry is read-only (cannot delete {name!r})")
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if isinstance(key, str) else None
+        return default if value is None else value
+
+    def __getstate__(self):
+        return self.constraint, self.source, self.category
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f"Entry({self.constraint!r}, {self.source!r}, {self.category!r})"
+
+
+def compact_settings(settings):
+    """Replace each YAML entry dict with an :class:`Entry` (entry lists become tuples)."""
+    return {
+        label: {
+            organ: {
+                scheme: tuple(Entry(e["constraint"], e.get("source", ""), e.get("category"))
+                              for e in entries or ())
+                for scheme, entries in schemes.items()
+            }
+            for organ, schemes in organs.items()
+        }
+        for label, organs in settings.items()
+    }
+
+
+def freeze(value):
+    """Read-only view of nested dicts/lists: mapping proxies, tuples, interned strings."""
+    if isinstance(value, dict):
+        return MappingProxyType({freeze(k): freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def read_settings(data_dir):
+    """Parse the YAML sources into {setting label: {organ: {scheme: [entries]}}}."""
+    import yaml
+
+    documents = {}
+    settings = {}
+    for label, (filename, key) in SETTING_SOURCES.items():
+        if filename not in documents:
+            with open(Path(data_dir) / filename, "r", encoding="utf-8") as f:
+                documents[filename] = yaml.safe_load(f)
+        doc = documents[filename]
+        settings[label] = wrap_schemes(doc if key is None else doc[key])
+    return settings
+
+
+# Bump when the compiled layout or normalization rules change.
+CATALOG_VERSION = 6
+
+
+# Modules whose contents shape the compiled catalog.
+_COMPILER_MODULES = ("tables.py", "catalog.py", "constraints.py", "references.py",
+                     "conversion.py", "radiobiology.py")
+
+
+def source_files(data_dir):
+    """Files a compiled catalog depends on (YAML sources plus compiler modules)."""
+    data_dir = Path(data_dir)
+    yaml_files = dict.fromkeys(filename for filename, _ in SETTING_SOURCES.values())
+    yaml_files[REFERENCES_SOURCE] = None
+    here = Path(__file__).resolve().parent
+    return [data_dir / name for name in yaml_files] + [here / m for m in _COMPILER_MODULES]
+
+
+def snapshot_path(data_dir):
+    return Path(data_dir) / ".reirrad_cache" / "catalog.snapshot"
+
+
+SBRT_SETTINGS = {
+    "SBRT Intracranial": SBRT_INTRACRANIAL,
+    "SBRT Body": SBRT_BODY,
+}
+
+
+def build_catalog(data_dir):
+    """Compile the catalog from source.
+
+    Parses the YAML, wraps list-only organs, normalizes the 3D‑CRT text,
+    parses every constraint string into the structured ``index``, converts
+    the numeric SBRT limits to EQD₂ and other fraction counts (``sbrt_eqd2``,
+    a :class:`~reirrad.conversion.ConversionTable`) and builds the reference
+    store with its (setting, organ, scheme) → ID index.
+    """
+    from .constraints import build_index
+    from .conversion import ConversionTable
+    from .references import build_reference_index, build_store
+
+    with stage("catalog.read_settings"):
+        settings = compact_settings(read_settings(data_dir))
+    with stage("catalog.normalize_threed"):
+        threed = normalize_threed(THREED_CONSTRAINTS)
+    with stage("catalog.references"):
+        bibliography = (Path(data_dir) / REFERENCES_SOURCE).read_text(encoding="utf-8")
+        references = build_store(bibliography, REFERENCES)
+        reference_ids, dangling = build_reference_index(settings, references)
+    with stage("catalog.index"):
+        index = build_index(settings, threed, SBRT_SETTINGS)
+    with stage("catalog.sbrt_eqd2"):
+        sbrt_eqd2 = ConversionTable(r for setting in SBRT_SETTINGS
+                                    for r in index.for_setting(setting))
+    return {
+        "settings": settings,
+        "threed": threed,
+        "index": index,
+        "sbrt_eqd2": sbrt_eqd2,
+        "references": references,
+        "reference_ids": reference_ids,
+        "dangling_references": dangling,
+    }
+
+
+_lock = threading.Lock()
+_loaded = {}  # data_dir → (source stats, catalog)
+
+
+def load_catalog(data_dir=None):
+    """Return the compiled catalog (see :func:`build_catalog` for its keys).
+
+    The result is a frozen mapping (see :func:`freeze`) shared by all
+    callers.  The in-process copy is reused while the sources' ``os.stat`` is
+    unchanged; otherwise the snapshot is consulted and recompiled only if a
+    hash differs.
+    """
+    data_dir = Path(data_dir or DATA_DIR)
+    sources = source_files(data_dir)
+    stats = snapshot.source_stats(sources)
+    hit = _loaded.get(data_dir)
+    if hit is not None and hit[0] == stats:
+        return hit[1]
+    with _lock:
+        hit = _loaded.get(data_dir)
+        if hit is not None and hit[0] == stats:
+            return hit[1]
+        with stage("catalog.snapshot"):
+            catalog = freeze(snapshot.load_or_build(
+                snapshot_path(data_dir), sources, CATALOG_VERSION,
+                lambda: build_catalog(data_dir),
+            ))
+        _loaded[data_dir] = (stats, catalog)
+        return catalog
+
+
+def constraint_index(data_dir=None):
+    """The structured :class:`~reirrad.constraints.ConstraintIndex` of all catalogs."""
+    return load_catalog(data_dir)["index"]
+
+
+def compile_snapshot(data_dir=None, force=False):
+    """Write the catalog snapshot for ``data_dir``; return its path."""
+    data_dir = Path(data_dir or DATA_DIR)
+    sources = source_files(data_dir)
+    path = snapshot_path(data_dir)
+    if force or snapshot.read_snapshot(path, sources, CATALOG_VERSION) is None:
+        snapshot.write_snapshot(path, sources, CATALOG_VERSION, build_catalog(data_dir))
+    return path
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile the constraint catalog snapshot.")
+    parser.add_argument("--data-dir", default=None, help="directory holding the YAML sources")
+    parser.add_argument("--force", action="store_true", help="recompile even if up to date")
+    args = parser.parse_args(argv)
+    path = compile_snapshot(args.data_dir, force=args.force)
+    print(f"catalog snapshot: {path} ({path.stat().st_size} bytes)")
+    for ref, keys in load_catalog(args.data_dir)["dangling_references"].items():
+        cited = "; ".join(" / ".join(k) for k in keys)
+        print(f"warning: reference [{ref}] is cited but not defined ({cited})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
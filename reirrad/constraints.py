@@ -0,0 +1,302 @@
+"""Typed constraint records parsed from the free-text catalogs.
+
+Every entry in the YAML settings, the 3D‑CRT table and the SBRT tables is
+parsed once at catalog-compile time into :class:`ConstraintRecord` objects,
+so callers can ask for e.g. every Dmax limit on the spinal cord without
+scanning strings:
+
+    index = load_catalog()["index"]
+    index.query("Spinal Cord", metric="Dmax")
+"""
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+METRICS = ("Dmax", "Dmean", "Dmin", "Dx", "Vx", "other")
+CATEGORY_WORDS = ("mandatory", "optimal", "acceptable", "recommended", "preferred")
+
+_COMPARATORS = {"<=": "≤", ">=": "≥", "≤": "≤", "≥": "≥", "<": "<", ">": ">", "=": "="}
+
+_NUM = r"\d*\.?\d+"
+_RANGE = rf"(?P<{{0}}>{_NUM})(?:\s*[–-]\s*(?P<{{0}}_hi>{_NUM}))?"
+
+_VOLUME_RECEIVES_RE = re.compile(
+    rf"Volume\s*<\s*(?P<vol>{_NUM})\s*cc\s*receives\s*"
+)
+_CC_RECEIVES_RE = re.compile(
+    rf"(?P<vol>{_NUM})\s*cc\s+of\s+.*?receives\s*"
+)
+_METRIC_RES = (
+    ("Dmax", re.compile(rf"(?:D\s*max|\bMax\b)(?:\s*\(?\s*(?P<vol>{_NUM})\s*cc\s*\)?)?")),
+    ("Dmean", re.compile(r"(?:D\s*mean|\bMean\b)")),
+    ("Dmin", re.compile(r"(?:D\s*min|\bMin\b)")),
+    ("Dx", re.compile(rf"\bD\s*{_RANGE.format('vol')}\s*(?P<vol_unit>cc|%)")),
+    ("Vx", re.compile(rf"\bV\s*{_RANGE.format('dose')}(?:\s*Gy)?")),
+    ("Dx", re.compile(rf"^(?P<vol>{_NUM})\s*(?P<vol_unit>%)\s*(?=[<>≤≥])")),
+)
+_LIMIT_RE = re.compile(
+    rf"^[\s:]*(?P<cmp><=|>=|≤|≥|<|>|=)?\s*"
+    rf"(?:(?P<num>{_NUM})\s*/\s*(?P<den>\d+)|{_RANGE.format('lo')})"
+    r"\s*(?P<unit>Gy|%|cc)?"
+)
+# A part that is only a limit ("≤ 45 Gy", "Hot‑spot < 107 %").
+_BARE_LIMIT_RE = re.compile(r"^(?:hot\W*spot\W*)?(?=<=|>=|≤|≥|<|>)", re.IGNORECASE)
+_ANY_LIMIT_RE = re.compile(
+    rf"(?P<cmp><=|>=|≤|≥|<|>)\s*{_RANGE.format('lo')}\s*(?P<unit>Gy|%|cc)?"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ConstraintRecord:
+    setting: str
+    organ: str
+    scheme: str
+    metric: str                   # one of METRICS
+    dose: Optional[float]         # dose level of a Vx metric (Gy)
+    volume: Optional[float]       # volume of a Dx / Dmax-at-volume metric
+    volume_unit: Optional[str]    # "cc" or "%"
+    comparator: Optional[str]     # "<", "≤", ">", "≥" or "="
+    limit: Optional[float]
+    unit: Optional[str]           # unit of the limit: "Gy", "%" or "cc"
+    category: Optional[str]
+    text: str
+    source: str = ""
+    note: str = ""
+
+
+def organ_key(name):
+    """Case- and punctuation-insensitive key for an organ name."""
+    s = re.sub(r"[_‑‐\-]+", " ", str(name))
+    return re.sub(r"\s+", " ", s).strip().lower()
+
+
+def _clean(text):
+    s = text.replace("\xa0", " ").replace(" ", " ")
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def _float(s):
+    return float(s) if s is not None else None
+
+
+def _parse_limit(rest):
+    """Parse a leading ``[comparator] number[–number] [unit]`` from ``rest``."""
+    m = _LIMIT_RE.match(rest)
+    if m is None or (m.group("num") is None and m.group("lo") is None):
+        return None, None, None, rest
+    cmp = _COMPARATORS.get(m.group("cmp") or "", None)
+    if m.group("num") is not None:
+        limit, unit = 100.0 * float(m.group("num")) / float(m.group("den")), "%"
+    else:
+        lo, hi = float(m.group("lo")), _float(m.group("lo_hi"))
+        unit = m.group("unit")
+        if cmp is None:
+            # a bare value or range ("Dmean 4–15 Gy") reads as an upper bound
+            cmp, limit = "≤", hi if hi is not None else lo
+        elif cmp in ("<", "≤"):
+            limit = lo
+        else:
+            limit = hi if hi is not None else lo
+    return cmp, limit, unit, rest[m.end():]
+
+
+def parse_constraint(text, default_metric=None, bare_metric=None):
+    """Parse one constraint string into a list of field dicts.
+
+    Text holding several constraints separated by ``;`` yields one dict per
+    part.  Parts with no recognizable metric get ``default_metric`` if given,
+    ``bare_metric`` if they are only a limit ("≤ 45 Gy"), else
+    ``metric="other"`` with whatever comparator/limit could be found.  A
+    part with neither metric nor limit ("As low as possible") is folded
+    into a neighbouring record's note rather than becoming a record.
+    """
+    out, notes = [], []
+    for part in _clean(text).split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        fields = _parse_part(part, default_metric, bare_metric)
+        if fields["metric"] == "other" and fields["limit"] is None:
+            if out:
+                out[-1]["note"] = "; ".join(filter(None, (out[-1]["note"], part)))
+            else:
+                notes.append(part)
+            continue
+        if notes:
+            fields["note"] = "; ".join(filter(None, (*notes, fields["note"])))
+            notes = []
+        out.append(fields)
+    if not out and notes:
+        out.append(_parse_part("; ".join(notes), default_metric, bare_metric))
+    return out
+
+
+def _parse_part(part, default_metric, bare_metric=None):
+    fields = {"metric": "other", "dose": None, "volume": None, "volume_unit": None,
+              "comparator": None, "limit": None, "unit": None, "note": ""}
+
+    m = _VOLUME_RECEIVES_RE.search(part) or _CC_RECEIVES_RE.search(part)
+    if m is not None:
+        fields.update(metric="Dx", volume=float(m.group("vol")), volume_unit="cc")
+    else:
+        best = None
+        for metric, rx in _METRIC_RES:
+            hit = rx.search(part)
+            if hit is not None and (best is None or hit.start() < best[1].start()):
+                best = (metric, hit)
+        if best is not None:
+            metric, m = best
+            groups = m.groupdict()
+            fields["metric"] = metric
+            if metric == "Vx":
+                fields["dose"] = float(groups["dose"])
+            elif groups.get("vol") is not None:
+                fields["volume"] = float(groups["vol"])
+                fields["volume_unit"] = groups.get("vol_unit") or "cc"
+
+    if m is not None:
+        prefix, rest = part[:m.start()], part[m.end():]
+        cmp, limit, unit, tail = _parse_limit(rest)
+    else:
+        prefix, cmp, limit, unit, tail = "", None, None, None, part
+        bare = _BARE_LIMIT_RE.match(part) if bare_metric is not None else None
+        if default_metric is not None:
+            fields["metric"] = default_metric
+            cmp, limit, unit, tail = _parse_limit(part)
+        elif bare is not None:
+            fields["metric"] = bare_metric
+            prefix = part[:bare.end()]
+            cmp, limit, unit, tail = _parse_limit(part[bare.end():])
+    if limit is None:
+        hit = _ANY_LIMIT_RE.search(tail)
+        if hit is not None:
+            cmp = _COMPARATORS[hit.group("cmp")]
+            limit, unit = float(hit.group("lo")), hit.group("unit")
+            tail = tail[:hit.start()] + tail[hit.end():]
+
+    fields.update(comparator=cmp, limit=limit, unit=unit)
+    note = " ".join(s.strip(" :‑‐-") for s in (prefix, tail) if s.strip(" :‑‐-"))
+    fields["note"] = re.sub(r"\s+", " ", note)
+    return fields
+
+
+def _category_from_note(note):
+    low = note.lower()
+    for word in CATEGORY_WORDS:
+        if f"({word})" in low:
+            return word
+    return None
+
+
+def _records(setting, organ, scheme, text, source="", category=None, default_metric=None,
+             bare_metric=None):
+    for fields in parse_constraint(text, default_metric, bare_metric):
+        yield ConstraintRecord(
+            setting=setting, organ=organ, scheme=scheme, text=text, source=source,
+            category=category or _category_from_note(fields["note"]), **fields,
+        )
+
+
+def records_from_settings(settings):
+    """Records for the YAML settings ({label: {organ: {scheme: [entries]}}})."""
+    for setting, organs in settings.items():
+        for organ, schemes in organs.items():
+            for scheme, entries in schemes.items():
+                for e in entries or ():
+                    yield from _records(setting, organ.replace("_", " "), scheme,
+                                        e["constraint"], e.get("source", ""),
+                                        e.get("category"))
+
+
+def records_from_threed(threed):
+    """Records for the (normalized) 3D‑CRT palliative table."""
+    for region, rows in threed.items():
+        for row in rows:
+            default = "Dmax" if row["OAR"] == "Max Point Dose" else None
+            for col in ("Preferred", "Acceptable"):
+                if row[col]:
+                    yield from _records(f"3D‑CRT {region}", row["OAR"], "conventional",
+                                        row[col], category=col.lower(),
+                                        default_metric=default, bare_metric="Dmax")
+
+
+_SBRT_COLUMNS = {
+    "3fx_opt": ("3_fraction", "optimal"), "3fx_man": ("3_fraction", "mandatory"),
+    "5fx_opt": ("5_fraction", "optimal"), "5fx_man": ("5_fraction", "mandatory"),
+}
+
+
+def records_from_sbrt(setting, rows):
+    """Records for an SBRT table (numeric limits keyed by its ``Metric`` column)."""
+    for row in rows:
+        metric_fields = parse_constraint(row["Metric"])[0]
+        for col, (scheme, category) in _SBRT_COLUMNS.items():
+            value = row[col]
+            if value is None:
+                continue
+            if isinstance(value, str) and not re.fullmatch(rf"{_NUM}\s*%", value.strip()):
+                yield from _records(setting, row["OAR"], scheme, value,
+                                    source=row["Endpoint"], category=category,
+                                    bare_metric="Dmax")
+                continue
+            is_pct = isinstance(value, str)
+            fields = dict(metric_fields, comparator="<" if is_pct else "≤",
+                          limit=float(str(value).rstrip(" %")),
+                          unit="%" if is_pct else "Gy", note="")
+            yield ConstraintRecord(
+                setting=setting, organ=row["OAR"], scheme=scheme, category=category,
+                text=f"{row['Metric']} {fields['comparator']} {value}"
+                     f"{'' if is_pct else ' Gy'}",
+                source=row["Endpoint"], **fields,
+            )
+
+
+class ConstraintIndex:
+    """Constraint records indexed by (organ, scheme, metric).
+
+    ``scheme`` and ``metric`` may be ``None`` to mean "any"; every combination
+    is precomputed, so each query is a single dictionary lookup.
+    """
+
+    def __init__(self, records):
+        self.records = tuple(records)
+        index = {}
+        for r in self.records:
+            o = organ_key(r.organ)
+            for key in ((o, r.scheme, r.metric), (o, None, r.metric),
+                        (o, r.scheme, None), (o, None, None)):
+                index.setdefault(key, []).append(r)
+        self._index = {k: tuple(v) for k, v in index.items()}
+        self._organs = {}
+        by_setting = {}
+        for r in self.records:
+            self._organs.setdefault(organ_key(r.organ), r.organ)
+            by_setting.setdefault(r.setting, []).append(r)
+        self._by_setting = {k: tuple(v) for k, v in by_setting.items()}
+
+    def query(self, organ, scheme=None, metric=None):
+        return self._index.get((organ_key(organ), scheme, metric), ())
+
+    def for_setting(self, setting):
+        return self._by_setting.get(setting, ())
+
+    def settings(self):
+        return list(self._by_setting)
+
+    def organs(self):
+        return sorted(self._organs.values())
+
+    def __len__(self):
+        return len(self.records)
+
+
+def build_index(settings, threed, sbrt_tables):
+    """Parse every catalog into one :class:`ConstraintIndex`.
+
+    ``sbrt_tables`` maps a setting label to an SBRT row list.
+    """
+    records = list(records_from_settings(settings))
+    records.extend(records_from_threed(threed))
+    for setting, rows in sbrt_tables.items():
+        records.extend(records_from_sbrt(setting, rows))
+    return ConstraintIndex(records)
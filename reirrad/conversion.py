@@ -0,0 +1,105 @@
+"""SBRT dose limits as EQD₂ and at other fraction counts.
+
+The SBRT tables give limits only at 3 and 5 fractions.  When the catalog is
+compiled, every numeric (Gy) SBRT limit is converted in one broadcast of the
+LQ kernels to
+
+* its EQD₂ for each candidate α/β (:data:`~reirrad.tables.SBRT_CONVERSION_ALPHA_BETA`);
+* the iso-effective total dose at each fraction count
+  (:data:`~reirrad.tables.SBRT_CONVERSION_FRACTIONS`).
+
+The result is a :class:`ConversionTable` stored in the catalog snapshot, so
+cross-fraction comparisons are lookups into it.  It holds plain tuples, so
+loading the catalog still does not import NumPy; an α/β outside the
+tabulated ones is converted on the fly with the same kernels.
+"""
+from .constraints import organ_key
+from .tables import SBRT_CONVERSION_ALPHA_BETA, SBRT_CONVERSION_FRACTIONS
+
+_SCHEME_FRACTIONS = {"3_fraction": 3, "5_fraction": 5}
+
+
+def convert_limits(limit, n0, alpha_beta, fractions):
+    """EQD₂ (limits, α/β) and iso-effective totals (limits, α/β, fractions).
+
+    ``limit`` is each total dose limit (Gy) over ``n0`` fractions.
+    """
+    import numpy as np
+
+    from .radiobiology import eqd2_array, max_d_per_fraction_array
+
+    limit = np.asarray(limit, dtype=float)
+    n0 = np.asarray(n0, dtype=float)
+    ab = np.asarray(alpha_beta, dtype=float)[None, :]
+    fractions = np.asarray(fractions, dtype=float)
+    eqd2 = eqd2_array(n0[:, None], (limit / n0)[:, None], ab)
+    d = max_d_per_fraction_array(fractions[None, None, :], eqd2[:, :, None], ab[:, :, None])
+    return eqd2, d * fractions
+
+
+class ConversionTable:
+    """EQD₂ and iso-effective totals for the numeric SBRT dose limits.
+
+    ``records`` are the converted :class:`~reirrad.constraints.ConstraintRecord`
+    rows; ``eqd2[i][j]`` is record ``i``'s limit at ``alpha_beta[j]`` and
+    ``total[i][j][k]`` the total dose over ``fractions[k]`` with the same EQD₂.
+    """
+
+    def __init__(self, records, alpha_beta=SBRT_CONVERSION_ALPHA_BETA,
+                 fractions=SBRT_CONVERSION_FRACTIONS):
+        self.records = tuple(r for r in records
+                             if r.scheme in _SCHEME_FRACTIONS and r.unit == "Gy"
+                             and r.limit is not None)
+        self.alpha_beta = tuple(float(a) for a in alpha_beta)
+        self.fractions = tuple(int(n) for n in fractions)
+        rows = range(len(self.records))
+        eqd2, total = convert_limits(self._limits(rows), self._n0(rows), self.alpha_beta,
+                                     self.fractions)
+        self.eqd2 = tuple(map(tuple, eqd2.tolist()))
+        self.total = tuple(tuple(map(tuple, t)) for t in total.tolist())
+        by_organ = {}
+        for i, r in enumerate(self.records):
+            by_organ.setdefault(organ_key(r.organ), []).append(i)
+        self._by_organ = {k: tuple(v) for k, v in by_organ.items()}
+
+    def _limits(self, rows):
+        return [self.records[i].limit for i in rows]
+
+    def _n0(self, rows):
+        return [_SCHEME_FRACTIONS[self.records[i].scheme] for i in rows]
+
+    def __len__(self):
+        return len(self.records)
+
+    def organs(self):
+        return sorted({r.organ for r in self.records}, key=organ_key)
+
+    def rows(self, organ=None):
+        """Indices of the records for ``organ`` (all records when ``None``)."""
+        if organ is None:
+            return tuple(range(len(self.records)))
+        return self._by_organ.get(organ_key(organ), ())
+
+    def convert(self, alpha_beta, rows=None):
+        """([EQD₂ per row], [[total per fraction count] per row]) at ``alpha_beta``."""
+        rows = self.rows() if rows is None else tuple(rows)
+        alpha_beta = float(alpha_beta)
+        if alpha_beta in self.alpha_beta:
+            j = self.alpha_beta.index(alpha_beta)
+            return [self.eqd2[i][j] for i in rows], [self.total[i][j] for i in rows]
+        if not rows:
+            return [], []
+        eqd2, total = convert_limits(self._limits(rows), self._n0(rows), [alpha_beta],
+                                     self.fractions)
+        return eqd2[:, 0].tolist(), total[:, 0].tolist()
+
+    def table(self, alpha_beta, organ=None):
+        """One dict per limit of ``organ`` (or every organ) at ``alpha_beta``."""
+        rows = self.rows(organ)
+        eqd2, total = self.convert(alpha_beta, rows)
+        return [
+            {"setting": r.setting, "organ": r.organ, "constraint": r.text,
+             "scheme": r.scheme, "category": r.category, "source": r.source,
+             "limit": r.limit, "eqd2": e, "totals": dict(zip(self.fractions, t))}
+            for r, e, t in zip((self.records[i] for i in rows), eqd2, total)
+        ]
@@ -0,0 +1,431 @@
+"""Dose-volume histograms: ingest, per-bin EQD₂ and constraint evaluation.
+
+A :class:`DVH` is kept in cumulative form (volume receiving at least each
+dose level).  Converting a prior plan's DVH to EQD₂ is one array operation
+over its dose bins, and every metric (Dmax, Dmean, Dmin, Dx, Vx) is a
+vectorized lookup on that curve.
+
+Two export layouts are read, one structure at a time so that large
+multi-structure files are streamed rather than loaded whole:
+
+* long-form CSV with ``structure``, ``dose`` and ``volume`` columns (the
+  header may carry units, e.g. ``dose_cgy`` or ``volume_pct``), rows grouped
+  by structure (each structure's rows are converted to floats as one
+  array);
+* Eclipse-style text exports (``Structure:`` blocks with a ``Dose [Gy]`` /
+  ``Dose [cGy]`` table).
+"""
+import csv
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .constraints import organ_key
+from .radiobiology import eqd2_array
+
+
+@dataclass
+class DVH:
+    structure: str
+    dose: np.ndarray                     # ascending dose levels (Gy)
+    volume: np.ndarray                   # cumulative volume at each level
+    volume_unit: str = "cc"              # "cc" or "%"
+    total_volume: Optional[float] = None # cc; needed for %↔cc conversion
+
+    @classmethod
+    def from_cumulative(cls, structure, dose, volume, volume_unit="cc", total_volume=None):
+        dose = np.asarray(dose, dtype=float)
+        volume = np.asarray(volume, dtype=float)
+        order = np.argsort(dose, kind="stable")
+        dose, volume = dose[order], volume[order]
+        if total_volume is None and volume_unit == "cc" and volume.size:
+            total_volume = float(volume[0])
+        return cls(structure, dose, volume, volume_unit, total_volume)
+
+    @classmethod
+    def from_differential(cls, structure, dose, volume, volume_unit="cc", total_volume=None):
+        dose = np.asarray(dose, dtype=float)
+        volume = np.asarray(volume, dtype=float)
+        order = np.argsort(dose, kind="stable")
+        dose, volume = dose[order], volume[order]
+        if dose.size >= 2:
+            # close the last bin one bin width up, where the curve reaches 0
+            dose = np.append(dose, 2 * dose[-1] - dose[-2])
+            volume = np.append(volume, 0.0)
+        cumulative = np.cumsum(volume[::-1])[::-1]
+        return cls.from_cumulative(structure, dose, cumulative, volume_unit, total_volume)
+
+    # ——— unit helpers ———
+    def _cc(self):
+        if self.volume_unit == "cc":
+            return self.volume
+        if self.total_volume is None:
+            return None
+        return self.volume * (self.total_volume / 100.0)
+
+    def _pct(self):
+        if self.volume_unit == "%":
+            return self.volume
+        total = self.total_volume or (self.volume[0] if self.volume.size else 0.0)
+        return self.volume * (100.0 / total) if total else None
+
+    def differential(self):
+        """Volume in each bin [dose[i], dose[i+1])."""
+        return self.volume - np.append(self.volume[1:], 0.0)
+
+    def to_eqd2(self, n_fractions, ab):
+        """Return this DVH with every dose bin converted to EQD₂."""
+        dose = eqd2_array(n_fractions, self.dose / n_fractions, ab)
+        return DVH(self.structure, dose, self.volume, self.volume_unit, self.total_volume)
+
+    # ——— metrics ———
+    def dmax(self):
+        """Dose where the cumulative curve reaches zero volume.
+
+        Between levels the curve is linear, so this is the first level after
+        the last one with volume; a curve that never reaches zero ends at its
+        last level.
+        """
+        nonzero = np.flatnonzero(self.volume > 0)
+        if not nonzero.size:
+            return 0.0
+        return float(self.dose[min(nonzero[-1] + 1, self.dose.size - 1)])
+
+    def dmean(self):
+        """Volume-weighted mean over bin midpoints (the last level counts as is)."""
+        diff = self.differential()
+        total = diff.sum()
+        mid = np.append(0.5 * (self.dose[:-1] + self.dose[1:]), self.dose[-1:])
+        return float(np.dot(diff, mid) / total) if total > 0 else 0.0
+
+    def dmin(self):
+        return self.dose_at(self.volume[0] if self.volume.size else 0.0, self.volume_unit)
+
+    def dose_at(self, volume, unit="cc"):
+        """Dx: the minimum dose received by the hottest ``volume`` (cc or %)."""
+        curve = self._cc() if unit == "cc" else self._pct()
+        if curve is None:
+            return None
+        # cumulative volume falls with dose; interpolate on the reversed curve
+        return float(np.interp(volume, curve[::-1], self.dose[::-1]))
+
+    def volume_at(self, dose, unit="cc"):
+        """Vx: the volume (cc or %) receiving at least ``dose`` Gy."""
+        curve = self._cc() if unit == "cc" else self._pct()
+        if curve is None:
+            return None
+        return float(np.interp(dose, self.dose, curve, right=0.0))
+
+
+# ——— reading exports ———
+_UNIT_SCALE = {"gy": 1.0, "cgy": 0.01}
+
+
+def _column_unit(name, default):
+    low = name.lower()
+    for unit in ("cgy", "gy", "pct", "%", "cc", "cm3", "cm³"):
+        if low.endswith(unit) or f"[{unit}]" in low or f"({unit})" in low:
+            return {"pct": "%", "cm3": "cc", "cm³": "cc"}.get(unit, unit)
+    return default
+
+
+def _iter_long_csv(f, kind):
+    reader = csv.reader(f)
+    header = next(reader)
+    fields = [h.lower().split("[")[0].split("(")[0].strip(" _") for h in header]
+
+    def pick(prefix):
+        for i, key in enumerate(fields):
+            if key.startswith(prefix):
+                return i
+        raise ValueError(f"DVH CSV needs a {prefix!r} column, got {header}")
+
+    s_col, d_col, v_col = pick("structure"), pick("dose"), pick("volume")
+    d_scale = _UNIT_SCALE[_column_unit(header[d_col], "gy")]
+    v_unit = "%" if _column_unit(header[v_col], "cc") == "%" else "cc"
+    build = DVH.from_cumulative if kind == "cumulative" else DVH.from_differential
+
+    def make(name, rows):
+        # one string→float conversion per structure rather than per cell
+        data = np.array(rows).astype(float)
+        return build(name, data[:, 0] * d_scale, data[:, 1], v_unit)
+
+    name, rows = None, []
+    for row in reader:
+        if not row:
+            continue
+        if row[s_col] != name:
+            if rows:
+                yield make(name, rows)
+            name, rows = row[s_col], []
+        rows.append((row[d_col], row[v_col]))
+    if rows:
+        yield make(name, rows)
+
+
+_NUMBER_ROW = re.compile(r"^\s*[-+\d.]")
+
+
+def _iter_eclipse(f, kind):
+    build = DVH.from_cumulative if kind == "cumulative" else DVH.from_differential
+    name = total = None
+    d_scale, v_col, v_unit = 1.0, -1, "cc"
+    rows = []
+
+    def flush():
+        if name is not None and rows:
+            data = np.array(rows, dtype=float)
+            return build(name, data[:, 0] * d_scale, data[:, 1], v_unit, total)
+        return None
+
+    for line in f:
+        stripped = line.strip()
+        low = stripped.lower()
+        if low.startswith("type:") and "differential" in low:
+            kind, build = "differential", DVH.from_differential
+        elif low.startswith("structure:"):
+            dvh = flush()
+            if dvh is not None:
+                yield dvh
+            name, total, rows = stripped.split(":", 1)[1].strip(), None, []
+        elif low.startswith("volume [") and ":" in low:
+            total = float(stripped.split(":", 1)[1])
+        elif low.startswith("dose ["):
+            d_scale = _UNIT_SCALE["cgy" if "[cgy]" in low else "gy"]
+            headers = re.split(r"\s{2,}|\t", stripped)
+            v_col = len(headers) - 1
+            v_unit = "%" if "[%]" in headers[-1] else "cc"
+        elif name is not None and _NUMBER_ROW.match(stripped):
+            values = stripped.split()
+            rows.append((float(values[0]), float(values[v_col])))
+    dvh = flush()
+    if dvh is not None:
+        yield dvh
+
+
+def iter_dvh_file(path, kind="cumulative"):
+    """Yield one :class:`DVH` per structure from an export, streaming the file.
+
+    ``kind`` ("cumulative" or "differential") applies to CSV input; text
+    exports announce their type in their header.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        first = f.readline()
+        f.seek(0)
+        if "," in first and "structure" in first.lower():
+            yield from _iter_long_csv(f, kind)
+        else:
+            yield from _iter_eclipse(f, kind)
+
+
+def load_dvh_file(path, kind="cumulative"):
+    """Return {structure: DVH} for an export (see :func:`iter_dvh_file`)."""
+    return {d.structure: d for d in iter_dvh_file(path, kind)}
+
+
+# ——— DVHs from a dose grid ———
+def _mask_indices(name, mask, shape, size):
+    """Flat voxel indices of one structure's mask (see :func:`label_map`)."""
+    mask = np.asarray(mask)
+    if mask.dtype == bool:
+        if mask.size != size:
+            raise ValueError(f"{name}: mask has shape {mask.shape}, expected {tuple(shape)}")
+        return np.flatnonzero(mask.reshape(-1))
+    if mask.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if mask.ndim != 1 or not np.issubdtype(mask.dtype, np.integer):
+        raise ValueError(f"{name}: expected a boolean mask or 1-D voxel indices, "
+                         f"got a {mask.dtype} array of shape {mask.shape}")
+    if mask[0] < 0 or mask[-1] >= size or np.any(mask[1:] <= mask[:-1]):
+        raise ValueError(f"{name}: voxel indices must be increasing and within the grid "
+                         "(pass a 0/1 mask as a boolean array)")
+    return mask
+
+
+def label_map(masks, shape):
+    """Dense label map of possibly overlapping structure ``masks``.
+
+    ``masks`` maps each structure name to a boolean array of ``shape`` or to
+    sorted flat voxel indices (as :func:`reirrad.dicom.structure_masks`
+    returns); anything else, e.g. a 0/1 integer mask, is a ``ValueError``.
+    Every distinct combination of structures a voxel belongs to gets its own
+    label (0: none), so overlaps need no extra pass.  Returns ``(labels,
+    members)``: the label array (smallest unsigned dtype that fits) and a
+    boolean ``(labels, structures)`` membership matrix.
+    """
+    names = list(masks)
+    size = int(np.prod(shape))
+    labels = np.zeros(size, dtype=np.uint8)
+    combos = {(): 0}   # sorted structure positions → label
+    for s, (name, mask) in enumerate(masks.items()):
+        idx = _mask_indices(name, mask, shape, size)
+        old, inverse = np.unique(labels[idx], return_inverse=True)
+        by_label = {v: k for k, v in combos.items()}
+        new = np.array([combos.setdefault(by_label[o] + (s,), len(combos))
+                        for o in old.tolist()], dtype=np.int64)
+        if len(combos) > np.iinfo(labels.dtype).max + 1:
+            labels = labels.astype(np.uint16 if len(combos) <= 1 << 16 else np.uint32)
+        labels[idx] = new[inverse]
+    members = np.zeros((len(combos), len(names)), dtype=bool)
+    for combo, label in combos.items():
+        members[label, list(combo)] = True
+    return labels.reshape(shape), members
+
+
+def _dose_chunks(dose, chunk):
+    """(flat start, flat dose values) over a grid array or a frame-wise grid."""
+    if hasattr(dose, "frame"):  # reirrad.dicom grids decode one frame at a time
+        frame_size = dose.shape[1] * dose.shape[2]
+        for k in range(dose.shape[0]):
+            yield k * frame_size, np.asarray(dose.frame(k)).reshape(-1)
+        return
+    flat = np.asarray(dose).reshape(-1)
+    for start in range(0, flat.size, chunk):
+        yield start, flat[start:start + chunk]
+
+
+def grid_dvhs(dose, labels, members, names, bin_width=0.1, voxel_cc=None,
+              fractions=None, alpha_beta=None, default_ab=3.0, chunk=1 << 22):
+    """DVHs of every structure from a dose grid and a label map, in one sweep.
+
+    ``labels`` and ``members`` come from :func:`label_map` (``names`` in the
+    same order).  ``dose`` is an array or memory map in Gy, or a
+    :mod:`reirrad.dicom` grid read frame by frame.  Each chunk costs one
+    ``bincount`` over (label, dose bin) pairs whatever the number of
+    structures; a structure's histogram is then the sum of its labels' rows.
+    Doses are binned at ``bin_width`` Gy; each curve closes one bin above
+    its hottest voxel, so Dmax errs high by less than ``bin_width``.
+    Non-finite doses outside every structure are ignored; inside one they
+    are a ``ValueError``.  ``voxel_cc`` defaults to the grid's own voxel
+    size.  With ``fractions`` the bins are converted to EQD₂ as in
+    :meth:`DVH.to_eqd2`.
+
+    Returns {name: DVH}; :func:`evaluate` checks them against any catalog's
+    records (3D‑CRT, SBRT, the YAML settings).
+    """
+    voxel_cc = voxel_cc if voxel_cc is not None else getattr(dose, "voxel_cc", 1.0)
+    flat_labels = np.asarray(labels).reshape(-1)
+    n_labels = members.shape[0]
+    scale = 1.0 / bin_width
+    hist = np.zeros((n_labels, 0), dtype=np.int64)
+    for start, values in _dose_chunks(dose, chunk):
+        lab = flat_labels[start:start + values.size].astype(np.int64)
+        # One reduction per chunk; the mask is only built when it is needed.
+        if not np.isfinite(values.sum()):
+            finite = np.isfinite(values)
+            inside = np.flatnonzero(~finite & (lab > 0))
+            if inside.size:
+                raise ValueError(f"dose grid is not finite at {inside.size} structure "
+                                 f"voxel(s), first at flat index {start + int(inside[0])}")
+            lab, values = lab[finite], values[finite]
+        bins = np.maximum(values * scale, 0).astype(np.int64)
+        n_bins = int(bins.max()) + 1 if bins.size else 1
+        if n_bins > hist.shape[1]:
+            hist = np.pad(hist, ((0, 0), (0, n_bins - hist.shape[1])))
+        counts = np.bincount(lab * n_bins + bins, minlength=n_labels * n_bins)
+        hist[:, :n_bins] += counts.reshape(n_labels, n_bins)
+
+    per_structure = members[1:].T.astype(np.int64) @ hist[1:]
+    levels = np.arange(hist.shape[1]) * bin_width
+    alpha_beta = alpha_beta or {}
+    out = {}
+    for name, counts in zip(names, per_structure):
+        volume = counts * voxel_cc
+        dvh = DVH.from_differential(name, levels, volume, "cc", float(volume.sum()))
+        if fractions is not None:
+            dvh = dvh.to_eqd2(fractions, alpha_beta.get(name, default_ab))
+        out[name] = dvh
+    return out
+
+
+def dvhs_from_masks(dose, masks, **options):
+    """{name: DVH} for ``masks`` on ``dose`` (see :func:`grid_dvhs` for options).
+
+    ``masks`` may be boolean arrays or the flat indices of
+    :func:`reirrad.dicom.structure_masks`.
+    """
+    labels, members = label_map(masks, dose.shape)
+    return grid_dvhs(dose, labels, members, list(masks), **options)
+
+
+# ——— constraint evaluation ———
+@dataclass(frozen=True, slots=True)
+class ConstraintResult:
+    record: object           # the ConstraintRecord evaluated
+    structure: str
+    value: Optional[float]   # achieved metric in the limit's unit; None if not evaluable
+    passed: Optional[bool]
+
+
+_CHECKS = {
+    "<": np.less, "≤": np.less_equal, ">": np.greater, "≥": np.greater_equal,
+    "=": np.isclose,
+}
+
+
+def metric_value(dvh, record):
+    """The DVH's value for ``record``'s metric, in the unit of its limit."""
+    if record.metric == "Vx":
+        if record.unit not in ("cc", "%"):
+            return None
+        return dvh.volume_at(record.dose, record.unit)
+    if record.unit != "Gy":
+        return None  # % of prescription etc. needs plan context
+    if record.metric == "Dmean":
+        return dvh.dmean()
+    if record.metric == "Dmin":
+        return dvh.dmin()
+    if record.metric == "Dmax" and record.volume is None:
+        return dvh.dmax()
+    if record.metric in ("Dmax", "Dx"):
+        return dvh.dose_at(record.volume, record.volume_unit or "cc")
+    return None
+
+
+def evaluate(dvhs, records, fractions=None, alpha_beta=None, default_ab=3.0):
+    """Evaluate constraint ``records`` against the matching structures.
+
+    ``dvhs`` is a {structure: DVH} mapping; records are matched to structures
+    by normalized organ name.  When ``fractions`` is given, each DVH is first
+    converted bin-wise to EQD₂ with its α/β from ``alpha_beta`` (a
+    {structure: α/β} mapping, falling back to ``default_ab``).
+    """
+    by_key = {organ_key(name): d for name, d in dvhs.items()}
+    if fractions is not None:
+        alpha_beta = {organ_key(k): v for k, v in (alpha_beta or {}).items()}
+        by_key = {k: d.to_eqd2(fractions, alpha_beta.get(k, default_ab))
+                  for k, d in by_key.items()}
+
+    results = []
+    for r in records:
+        dvh = by_key.get(organ_key(r.organ))
+        if dvh is None or r.limit is None or r.comparator is None:
+            continue
+        value = metric_value(dvh, r)
+        passed = None if value is None else bool(_CHECKS[r.comparator](value, r.limit))
+        results.append(ConstraintResult(r, dvh.structure, value, passed))
+    return results
+
+
+def threed_constraints(region, index=None):
+    """Parsed 3D‑CRT constraints for a THREED_CONSTRAINTS region."""
+    from .catalog import constraint_index
+
+    return (index or constraint_index()).for_setting(f"3D‑CRT {region}")
+
+
+def sbrt_constraints(region, fractions, index=None):
+    """Parsed SBRT constraints for an SBRT_CONSTRAINTS region at 3 or 5 fractions."""
+    from .catalog import constraint_index
+    from .tables import SBRT_CONSTRAINTS
+
+    index = index or constraint_index()
+    organs = {organ_key(row["OAR"]) for row in SBRT_CONSTRAINTS[region]}
+    scheme = f"{fractions}_fraction"
+    return tuple(
+        r for setting in ("SBRT Intracranial", "SBRT Body")
+        for r in index.for_setting(setting)
+        if r.scheme == scheme and organ_key(r.organ) in organs
+    )
@@ -0,0 +1,241 @@
+"""Streaming export of reports and constraint listings to CSV, JSON and PDF.
+
+Every writer takes one row at a time and writes it through, so exporting a
+batch run of any size needs memory for one row (CSV, JSON) or one page
+(PDF):
+
+    with open_writer("reports.pdf", REPORT_COLUMNS, title="Re-irradiation") as w:
+        for row in report_rows(report, patient="P001"):
+            w.write(row)
+
+Rows are sequences ordered like the writer's ``columns``.  JSON is written as
+one array of objects (``jsonl`` gives one object per line).  The PDF writer
+is self-contained (no PDF library): a monospaced table on A4 landscape
+pages, with the header repeated on every page and each page's content
+stream compressed and flushed as soon as the page is full.
+"""
+import csv
+import io
+import json
+import math
+import zlib
+from contextlib import contextmanager
+
+from .batch import output_fields
+from .tables import FRACTION_OPTIONS, SCHEME_LABELS
+
+FORMATS = ("csv", "json", "jsonl", "pdf")
+REPORT_COLUMNS = tuple(output_fields(FRACTION_OPTIONS)[:-1])  # without "error"
+CONSTRAINT_COLUMNS = ("source", "scheme", "organ", "constraint", "category", "reference")
+
+
+# ——— rows ———
+def report_rows(report, patient="", fraction_options=FRACTION_OPTIONS):
+    """Rows for a Tab 1 report ({oar: report dict}), ordered like
+    :func:`~reirrad.batch.output_fields` without the ``error`` column."""
+    from .reirradiation import permissible_regimens
+
+    for oar, r in report.items():
+        row = [patient, oar, r["ab"], r["limit"], r["raw"], r["recovered"], r["eff"], r["left"]]
+        for _, d, total in permissible_regimens(r["left"], r["ab"], fraction_options,
+                                                r.get("model", "lq"), r.get("d_t")):
+            row += [d, total]
+        yield row
+
+
+def constraint_rows(records):
+    """Rows (:data:`CONSTRAINT_COLUMNS`) for constraint records."""
+    for r in records:
+        yield [r.setting, SCHEME_LABELS.get(r.scheme, r.scheme.replace("_", " ")),
+               r.organ, r.text, r.category or "", r.source]
+
+
+# ——— writers ———
+class CsvWriter:
+    def __init__(self, f, columns):
+        self._csv = csv.writer(f, lineterminator="\n")
+        self._csv.writerow(columns)
+
+    def write(self, row):
+        self._csv.writerow(row)
+
+    def writerows(self, rows):
+        self._csv.writerows(rows)
+
+    def close(self):
+        pass
+
+
+def _json_value(value):
+    return None if isinstance(value, float) and not math.isfinite(value) else value
+
+
+class JsonWriter:
+    """A JSON array of objects, or JSON lines with ``lines=True``."""
+
+    def __init__(self, f, columns, lines=False):
+        self._f, self._columns, self._lines = f, tuple(columns), lines
+        self._first = True
+        if not lines:
+            f.write("[")
+
+    def write(self, row):
+        text = json.dumps({k: _json_value(v) for k, v in zip(self._columns, row)},
+                          ensure_ascii=False)
+        if self._lines:
+            self._f.write(text + "\n")
+        else:
+            self._f.write(("\n" if self._first else ",\n") + text)
+        self._first = False
+
+    def writerows(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def close(self):
+        if not self._lines:
+            self._f.write("\n]\n" if not self._first else "]\n")
+
+
+# PDF text uses the standard Courier font with WinAnsi encoding; characters
+# outside it are spelled out or replaced.
+_PDF_TEXT = str.maketrans({
+    "α": "alpha", "β": "beta", "≤": "<=", "≥": ">=", "₂": "2", "³": "3",
+    " ": " ", "\xa0": " ", "‑": "-", "‐": "-", "’": "'",
+})
+
+
+def _pdf_string(text):
+    raw = str(text).translate(_PDF_TEXT).encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _cell(value, width):
+    if isinstance(value, float):
+        text = f"{value:.2f}" if math.isfinite(value) else "-"
+    else:
+        text = "" if value is None else str(value)
+    return text[:width - 1] + "~" if len(text) > width else text.ljust(width)
+
+
+class PdfWriter:
+    """Paginated monospaced table written straight to a binary stream.
+
+    ``widths`` gives each column's width in characters (default: the longer
+    of the header and 10); longer cells are truncated with ``~``.
+    """
+
+    PAGE = (842, 595)  # A4 landscape, points
+    MARGIN = 36
+
+    def __init__(self, f, columns, title="", widths=None, font_size=7):
+        self._f = f
+        self._title = title
+        self._widths = list(widths or [max(len(c), 10) for c in columns])
+        self._font_size = font_size
+        self._leading = font_size * 1.25
+        self._header = " ".join(_cell(c, w) for c, w in zip(columns, self._widths))
+        usable = self.PAGE[1] - 2 * self.MARGIN - 4 * self._leading  # title, header, footer
+        self._rows_per_page = max(int(usable // self._leading), 1)
+        self._offsets = []      # byte offset of each object, by object number - 1
+        self._pages = []        # page object numbers
+        self._lines = []        # rows of the page being filled
+        self._pos = 0
+        self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        # objects 1-3 are fixed: catalog, page tree (written last) and font
+        self._next = 4
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._offsets.append(None)
+        self._object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier "
+                        b"/Encoding /WinAnsiEncoding >>")
+
+    def _emit(self, data):
+        self._f.write(data)
+        self._pos += len(data)
+
+    def _object(self, number, body):
+        if number > len(self._offsets):
+            self._offsets.append(self._pos)
+        else:
+            self._offsets[number - 1] = self._pos
+        self._emit(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def write(self, row):
+        self._lines.append(" ".join(_cell(v, w) for v, w in zip(row, self._widths)))
+        if len(self._lines) >= self._rows_per_page:
+            self._flush_page()
+
+    def writerows(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def _flush_page(self):
+        x, top = self.MARGIN, self.PAGE[1] - self.MARGIN
+        page_no = len(self._pages) + 1
+        text = [b"BT /F1 %g Tf %g TL %g %g Td" % (self._font_size, self._leading, x, top)]
+        for line in (self._title, "", self._header, *self._lines):
+            text.append(b"(" + _pdf_string(line) + b") Tj T*")
+        text.append(b"ET")
+        text.append(b"BT /F1 %g Tf %g %g Td (%s) Tj ET"
+                    % (self._font_size, x, self.MARGIN / 2, _pdf_string(f"Page {page_no}")))
+        stream = zlib.compress(b"\n".join(text))
+        content, page = self._next, self._next + 1
+        self._next += 2
+        self._object(content, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream)
+                     + stream + b"\nendstream")
+        self._object(page, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                           b"/Contents %d 0 R /Resources << /Font << /F1 3 0 R >> >> >>"
+                     % (*self.PAGE, content))
+        self._pages.append(page)
+        self._lines = []
+
+    def close(self):
+        if self._lines or not self._pages:
+            self._flush_page()
+        kids = b" ".join(b"%d 0 R" % p for p in self._pages)
+        self._object(2, b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self._pages))
+        xref = self._pos
+        entries = b"".join(b"%010d 00000 n \n" % off for off in self._offsets)
+        self._emit(b"xref\n0 %d\n0000000000 65535 f \n" % (len(self._offsets) + 1) + entries)
+        self._emit(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                   % (len(self._offsets) + 1, xref))
+
+
+def writer(f, columns, fmt, **options):
+    """A streaming writer of ``fmt`` over ``f`` (binary for PDF, text otherwise).
+
+    ``options`` go to the PDF writer (``title``, ``widths``, ``font_size``).
+    """
+    if fmt == "csv":
+        return CsvWriter(f, columns)
+    if fmt in ("json", "jsonl"):
+        return JsonWriter(f, columns, lines=fmt == "jsonl")
+    if fmt == "pdf":
+        return PdfWriter(f, columns, **options)
+    raise ValueError(f"unknown export format {fmt!r} (expected one of {', '.join(FORMATS)})")
+
+
+def format_for(path):
+    """Export format implied by a file name's extension."""
+    suffix = str(path).rsplit(".", 1)[-1].lower()
+    return {"ndjson": "jsonl"}.get(suffix, suffix if suffix in FORMATS else "csv")
+
+
+@contextmanager
+def open_writer(path, columns, fmt=None, **options):
+    """Open ``path`` and yield a writer for it; the document is finished on exit."""
+    fmt = fmt or format_for(path)
+    mode = ("wb", {}) if fmt == "pdf" else ("w", {"encoding": "utf-8", "newline": ""})
+    with open(path, mode[0], **mode[1]) as f:
+        w = writer(f, columns, fmt, **options)
+        yield w
+        w.close()
+
+
+def to_bytes(rows, columns, fmt, **options):
+    """Render ``rows`` to an in-memory document (for downloads of one report)."""
+    buf = io.BytesIO() if fmt == "pdf" else io.StringIO()
+    w = writer(buf, columns, fmt, **options)
+    w.writerows(rows)
+    w.close()
+    return buf.getvalue() if fmt == "pdf" else buf.getvalue().encode("utf-8")
@@ -0,0 +1,60 @@
+"""Iso-effective dose surfaces over (n₂, T₂) grids.
+
+:class:`IsoSurface` holds the solutions for one baseline (goal BED, α/β,
+α, T_d, T_k).  Solved points are kept on a dense grid anchored at
+n₂ = T₂ = 1; asking for wider bounds solves only the strips that are new,
+so moving the sweep bounds back and forth costs nothing once seen.
+"""
+import numpy as np
+
+from .radiobiology import iso_effective_dose_array
+
+
+class IsoSurface:
+    def __init__(self, BED_goal, ab, alpha, Td, Tk=0):
+        self.baseline = (float(BED_goal), float(ab), float(alpha), float(Td), float(Tk))
+        self._d = np.empty((0, 0))
+        self._R = np.empty(0)
+        self.solved = 0  # points solved so far (for diagnostics)
+
+    def matches(self, BED_goal, ab, alpha, Td, Tk=0):
+        return self.baseline == (float(BED_goal), float(ab), float(alpha), float(Td), float(Tk))
+
+    def _solve(self, n, T):
+        BED_goal, ab, alpha, Td, Tk = self.baseline
+        d2, _, R2 = iso_effective_dose_array(n[:, None], T[None, :], ab, alpha, Td,
+                                             BED_goal, Tk)
+        self.solved += d2.size
+        return d2, R2[0]
+
+    def _grow(self, n_hi, T_hi):
+        n0, t0 = self._d.shape
+        if n_hi <= n0 and T_hi <= t0:
+            return
+        N, T = max(n_hi, n0), max(T_hi, t0)
+        d = np.empty((N, T))
+        d[:n0, :t0] = self._d
+        n_all, T_all = np.arange(1, N + 1), np.arange(1, T + 1)
+        R = self._R
+        if T > t0 and n0:
+            d[:n0, t0:], R_new = self._solve(n_all[:n0], T_all[t0:])
+            R = np.concatenate([R, R_new])
+        if N > n0:
+            d[n0:, :], R = self._solve(n_all[n0:], T_all)
+        self._d, self._R = d, R
+
+    def sweep(self, n_range, T_range):
+        """Solutions for integer n₂ and T₂ (days) in the inclusive ranges.
+
+        Returns a dict with ``n``, ``T``, ``d_per_fx`` and ``total`` (shape
+        ``(len(n), len(T))``) and ``R`` (repopulation term, one per T₂).
+        """
+        (n_lo, n_hi), (T_lo, T_hi) = n_range, T_range
+        if min(n_lo, T_lo) < 1 or n_lo > n_hi or T_lo > T_hi:
+            raise ValueError("ranges must be increasing and start at 1 or more")
+        self._grow(int(n_hi), int(T_hi))
+        n = np.arange(int(n_lo), int(n_hi) + 1)
+        T = np.arange(int(T_lo), int(T_hi) + 1)
+        d = self._d[n[0] - 1:n[-1], T[0] - 1:T[-1]]
+        return {"n": n, "T": T, "d_per_fx": d, "total": d * n[:, None],
+                "R": self._R[T[0] - 1:T[-1]]}
@@ -0,0 +1,162 @@
+"""Normal-tissue complication probability: gEUD and the Lyman–Kutcher–Burman model.
+
+For a differential DVH with relative volumes ``vᵢ`` at EQD₂ ``Dᵢ``::
+
+    gEUD = (Σᵢ vᵢ Dᵢ^(1/n))ⁿ
+    NTCP = Φ((gEUD − TD₅₀) / (m · TD₅₀))
+
+with the per-organ ``n``, ``m`` and ``TD₅₀`` of
+:data:`~reirrad.tables.NTCP_PARAMETERS` (or passed explicitly).
+
+Everything broadcasts: DVH bins are the last axis and any leading axes
+(patients, candidate regimens, parameter sets) ride along.
+:func:`regimen_ntcp` evaluates a whole cohort against every candidate
+regimen in one array expression, and :func:`rank_regimens` orders the
+regimens from its result.
+"""
+import numpy as np
+
+from .constraints import organ_key
+from .radiobiology import eqd2_array
+from .tables import FRACTION_OPTIONS, NTCP_PARAMETERS, OAR_ALPHA_BETA
+
+# Coefficients of the Chebyshev fit to erfc (fractional error < 1.2e-7).
+_ERFC = (-1.26551223, 1.00002368, 0.37409196, 0.09678418, -0.18628806,
+         0.27886807, -1.13520398, 1.48851587, -0.82215223, 0.17087277)
+
+
+def normal_cdf(x):
+    """Standard normal CDF Φ, elementwise."""
+    z = np.abs(np.asarray(x, dtype=float)) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.5 * z)
+    poly = np.zeros_like(t)
+    for c in _ERFC[:0:-1]:
+        poly = t * (c + poly)
+    tail = 0.5 * t * np.exp(-z * z + _ERFC[0] + poly)  # ½·erfc(|x|/√2)
+    return np.where(np.asarray(x) < 0, tail, 1.0 - tail)
+
+
+def _lookup(table, organ):
+    if organ in table:
+        return table[organ]
+    by_key = {organ_key(k): v for k, v in table.items()}
+    return by_key.get(organ_key(organ))
+
+
+def ntcp_parameters(organ=None, params=None):
+    """(n, m, TD₅₀) for ``organ``; ``params`` overrides any of them."""
+    merged = dict(_lookup(NTCP_PARAMETERS, organ) or {}) if organ is not None else {}
+    merged.update(params or {})
+    missing = [k for k in ("n", "m", "td50") if k not in merged]
+    if missing:
+        raise ValueError(f"no NTCP parameters for {organ!r} (missing {', '.join(missing)})")
+    return merged["n"], merged["m"], merged["td50"]
+
+
+def _alpha_beta(organ, alpha_beta):
+    if alpha_beta is not None:
+        return alpha_beta
+    found = _lookup(OAR_ALPHA_BETA, organ) if organ is not None else None
+    return 3.0 if found is None else found
+
+
+def geud(dose, volume, n):
+    """Generalized EUD of differential DVHs (bins on the last axis).
+
+    ``volume`` is normalized per DVH, so cc, % or voxel counts all work;
+    ``n`` broadcasts with the leading axes.
+    """
+    dose = np.asarray(dose, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    a = 1.0 / np.asarray(n, dtype=float)[..., None]
+    # scale by the hottest bin so D^(1/n) cannot overflow for small n
+    top = np.max(np.where(volume > 0, dose, 0.0), axis=-1, keepdims=True)
+    safe = np.where(top > 0, top, 1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        v = volume / volume.sum(axis=-1, keepdims=True)
+        s = np.sum(v * (np.maximum(dose, 0.0) / safe) ** a, axis=-1, keepdims=True)
+        out = safe * s ** (1.0 / a)
+    return np.where(top > 0, out, 0.0)[..., 0]
+
+
+def lkb_ntcp(geud, m, td50):
+    """LKB complication probability for a gEUD (all arguments broadcast)."""
+    td50 = np.asarray(td50, dtype=float)
+    return normal_cdf((np.asarray(geud, dtype=float) - td50) / (np.asarray(m) * td50))
+
+
+def ntcp(dose, volume, n, m, td50):
+    """NTCP of differential EQD₂ DVHs (see :func:`geud`)."""
+    return lkb_ntcp(geud(dose, volume, n), m, td50)
+
+
+def dvh_arrays(dvhs):
+    """Stack :class:`~reirrad.dvh.DVH` objects into differential (dose, volume) arrays.
+
+    Shorter DVHs are padded with empty bins, so the result is ``(len(dvhs),
+    bins)`` whatever each DVH's own dose grid.
+    """
+    dvhs = list(dvhs)
+    width = max((d.dose.size for d in dvhs), default=0)
+    dose = np.zeros((len(dvhs), width))
+    volume = np.zeros((len(dvhs), width))
+    for i, d in enumerate(dvhs):
+        dose[i, :d.dose.size] = d.dose
+        volume[i, :d.dose.size] = d.differential()
+    return dose, volume
+
+
+def dvh_ntcp(dvh, organ=None, fractions=None, alpha_beta=None, params=None,
+             model="lq", d_t=None):
+    """NTCP of one :class:`~reirrad.dvh.DVH`.
+
+    ``organ`` defaults to the DVH's structure name.  With ``fractions`` the
+    physical dose bins are converted to EQD₂ first; without, the DVH is
+    taken to be in EQD₂ already.
+    """
+    organ = dvh.structure if organ is None else organ
+    n, m, td50 = ntcp_parameters(organ, params)
+    dose = dvh.dose
+    if fractions is not None:
+        dose = eqd2_array(fractions, dose / fractions, _alpha_beta(organ, alpha_beta),
+                          model, d_t)
+    return float(ntcp(dose, dvh.differential(), n, m, td50))
+
+
+def regimen_ntcp(relative_dose, volume, dose_per_fraction, fractions=FRACTION_OPTIONS,
+                 organ=None, params=None, alpha_beta=None, prior_eqd2=None,
+                 model="lq", d_t=None):
+    """NTCP of every DVH under every candidate regimen, in one broadcast.
+
+    ``relative_dose`` and ``volume`` are differential DVHs of the planned
+    course (bins on the last axis, e.g. ``(patients, bins)`` from
+    :func:`dvh_arrays`) with doses as fractions of the prescription.  The
+    regimens are ``fractions`` × ``dose_per_fraction`` (prescription dose per
+    fraction); both broadcast over the leading axes, so per-patient
+    regimens — e.g. the ``d_per_fx`` of
+    :func:`~reirrad.regimen.solve_regimens` over a full fraction sweep — work
+    as ``(patients, regimens)`` arrays.  ``prior_eqd2`` is the EQD₂ already
+    received in each bin (after any recovery), added before the gEUD.
+
+    Returns NTCP with shape ``(..., regimens)``.
+    """
+    n_vol, m, td50 = ntcp_parameters(organ, params)
+    n = np.asarray(fractions, dtype=float)[..., :, None]
+    d = np.asarray(dose_per_fraction, dtype=float)[..., :, None]
+    relative_dose = np.asarray(relative_dose, dtype=float)[..., None, :]
+    eqd2 = eqd2_array(n, relative_dose * d, _alpha_beta(organ, alpha_beta), model, d_t)
+    if prior_eqd2 is not None:
+        eqd2 = eqd2 + np.asarray(prior_eqd2, dtype=float)[..., None, :]
+    volume = np.asarray(volume, dtype=float)[..., None, :]
+    return ntcp(eqd2, volume, n_vol, m, td50)
+
+
+def rank_regimens(ntcp):
+    """Regimen indices by ascending cohort-mean NTCP, and those means.
+
+    ``ntcp`` is a :func:`regimen_ntcp` result; every axis but the last is
+    averaged over.
+    """
+    ntcp = np.asarray(ntcp, dtype=float)
+    mean = ntcp.reshape(-1, ntcp.shape[-1]).mean(axis=0)
+    return np.argsort(mean, kind="stable"), mean
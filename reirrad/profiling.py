@@ -0,0 +1,148 @@
+"""Opt-in per-stage timing of app script runs.
+
+Enabled by the ``REIRRAD_PROFILE`` environment variable:
+
+* unset or empty — off: :func:`stage` returns a shared no-op context
+  manager, so instrumented code pays one function call per stage;
+* ``1`` — time stages and append one JSON line per script run to
+  ``REIRRAD_PROFILE_LOG`` (default ``.reirrad_cache/timings.jsonl``);
+* ``cprofile`` / ``pyinstrument`` — additionally capture a profile of every
+  run into ``.reirrad_cache/profiles/`` (``.prof`` for cProfile, ``.html``
+  for pyinstrument, which must be installed).
+
+A run is bracketed by :func:`begin_run` / :func:`end_run`; stages opened
+outside a run (e.g. in a fragment rerun or a library call) are not recorded.
+Runs are tracked per thread, as Streamlit runs each session's script in its
+own thread.  A run that never reaches :func:`end_run` — it ended in
+``st.rerun()`` or an exception — is closed by the next :func:`begin_run` on
+its thread and logged with ``"interrupted": true``, timed to the end of its
+last stage.
+"""
+import itertools
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+MODE = os.environ.get("REIRRAD_PROFILE", "").strip().lower()
+ENABLED = MODE not in ("", "0", "off", "false")
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         ".reirrad_cache")
+LOG_PATH = os.environ.get("REIRRAD_PROFILE_LOG", os.path.join(CACHE_DIR, "timings.jsonl"))
+
+_NOOP = nullcontext()
+_local = threading.local()
+_write_lock = threading.Lock()
+_profile_ids = itertools.count()
+
+
+class _Stage:
+    __slots__ = ("run", "name", "t0")
+
+    def __init__(self, run, name):
+        self.run, self.name = run, name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        t1 = time.perf_counter()
+        stages = self.run["stages"]
+        stages[self.name] = stages.get(self.name, 0.0) + (t1 - self.t0) * 1000.0
+        self.run["t_last"] = t1
+        return False
+
+
+def stage(name):
+    """Context manager timing ``name`` within the current run (no-op when off)."""
+    if not ENABLED:
+        return _NOOP
+    run = getattr(_local, "run", None)
+    return _NOOP if run is None else _Stage(run, name)
+
+
+def begin_run(label="app"):
+    """Start timing a script run on this thread; no-op when profiling is off."""
+    if not ENABLED:
+        return
+    stale = getattr(_local, "run", None)
+    if stale is not None:
+        _local.run = None
+        _finish(stale, stale["t_last"], interrupted=True)
+    t0 = time.perf_counter()
+    run = {"label": label, "stages": {}, "t0": t0, "t_last": t0, "profiler": None}
+    if MODE == "cprofile":
+        import cProfile
+
+        run["profiler"] = cProfile.Profile()
+        run["profiler"].enable()
+    elif MODE == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            pass
+        else:
+            run["profiler"] = Profiler()
+            run["profiler"].start()
+    _local.run = run
+
+
+def end_run():
+    """Finish the current run; return its record (``None`` when off).
+
+    The record — ``{"time", "label", "total_ms", "stages", "profile"}`` — is
+    also appended to :data:`LOG_PATH` as one JSON line.
+    """
+    run = getattr(_local, "run", None)
+    if run is None:
+        return None
+    _local.run = None
+    return _finish(run, time.perf_counter())
+
+
+def _finish(run, t_end, interrupted=False):
+    record = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "label": run["label"],
+        "total_ms": round((t_end - run["t0"]) * 1000.0, 3),
+        "stages": {k: round(v, 3) for k, v in run["stages"].items()},
+        "profile": _save_profile(run["profiler"]),
+    }
+    if interrupted:
+        record["interrupted"] = True
+    _append(record)
+    return record
+
+
+def _save_profile(profiler):
+    if profiler is None:
+        return None
+    # two runs around st.rerun() share the second and the thread
+    stamp = (f"{time.strftime('%Y%m%d-%H%M%S')}-{threading.get_ident()}"
+             f"-{os.getpid()}-{next(_profile_ids)}")
+    directory = os.path.join(CACHE_DIR, "profiles")
+    os.makedirs(directory, exist_ok=True)
+    if MODE == "cprofile":
+        profiler.disable()
+        path = os.path.join(directory, f"run-{stamp}.prof")
+        profiler.dump_stats(path)
+    else:
+        profiler.stop()
+        path = os.path.join(directory, f"run-{stamp}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(profiler.output_html())
+    return path
+
+
+def _append(record):
+    import json
+
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        with _write_lock:
+            os.makedirs(os.path.dirname(LOG_PATH) or ".", exist_ok=True)
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(line)
+    except OSError:
+        pass  # timing must never break the app
@@ -0,0 +1,329 @@
+"""Plan checks against the site protocols in ``planning_protocols.yaml``.
+
+Each protocol's OAR ``metric`` / ``limit`` pairs are compiled once into
+:class:`~reirrad.constraints.ConstraintRecord` checks (``setting`` is the
+site, ``scheme`` the protocol name) and laid out as flat arrays: the
+distinct DVH metrics they ask for, the metric each check reads, its limit and
+comparator.  Checking a plan computes every distinct metric once and then
+compares all matching protocols' checks in one vectorized pass.
+
+Nothing is read until :func:`load_protocols` is first called; the compiled
+:class:`ProtocolBook` is cached in a snapshot next to the catalog's, so later
+processes skip the YAML parse.
+
+    python -m reirrad.protocols plan_dvh.csv --site Lung --fractions 5
+"""
+import re
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from . import snapshot
+from .constraints import ConstraintRecord, organ_key, parse_constraint
+from .tables import PROTOCOLS_SOURCE
+
+# Bump when the compiled layout or the compilation rules change.
+PROTOCOLS_VERSION = 2
+
+_COMPILER_MODULES = ("protocols.py", "constraints.py")
+
+_NUM = r"\d*\.?\d+"
+_FRACTIONS_RE = re.compile(rf"({_NUM})\s*(?:fx|fractions?)\b", re.I)
+# "<50 Gy (<10 cc)": no more than 10 cc above 50 Gy, i.e. D10cc < 50 Gy
+_VOLUME_NOTE_RE = re.compile(rf"^\(\s*<\s*(?P<volume>{_NUM})\s*cc\s*\)\s*")
+_LABEL_RE = re.compile(
+    r"(?P<stat>dmax|max|dmean|mean|dmin|min)"
+    rf"|d(?P<volume>{_NUM})(?P<volume_unit>cc|%)"
+    rf"|v(?P<dose>{_NUM})(?:gy)?(?P<unit>cc|%)?"
+)
+_STATS = {"dmax": "Dmax", "max": "Dmax", "dmean": "Dmean", "mean": "Dmean",
+          "dmin": "Dmin", "min": "Dmin"}
+_CMP_CODES = {"<": 0, "≤": 1, ">": 2, "≥": 3, "=": 4}
+
+
+@dataclass(frozen=True, slots=True)
+class Protocol:
+    site: str
+    name: str
+    description: str
+    fractions: Optional[int]
+    checks: tuple            # ConstraintRecord per OAR metric/limit pair
+
+
+# ——— compilation ———
+def read_protocols(data_dir):
+    """Parse the protocol YAML into {site: {protocol: fields}}.
+
+    Sites that appear more than once at the top level (``CNS`` does) are
+    merged rather than letting the last one win.
+    """
+    import yaml
+
+    with open(Path(data_dir) / PROTOCOLS_SOURCE, "r", encoding="utf-8") as f:
+        loader = yaml.SafeLoader(f)
+        try:
+            root = loader.get_single_node()
+            sites = {}
+            for key_node, value_node in root.value:
+                site = loader.construct_object(key_node, deep=True)
+                sites.setdefault(site, {}).update(
+                    loader.construct_object(value_node, deep=True) or {})
+        finally:
+            loader.dispose()
+    return sites
+
+
+def _fractions(name, fields):
+    if isinstance(fields.get("fractions"), int):
+        return fields["fractions"]
+    for text in (name, fields.get("dose")):
+        m = _FRACTIONS_RE.search(str(text or ""))
+        if m:
+            return int(float(m.group(1)))
+    return None
+
+
+def _checks(site, name, items):
+    for item in items or ():
+        organ = item.get("OAR")
+        if not organ:
+            continue  # plan-level indices (conformality etc.) are not DVH metrics
+        text = f"{item.get('metric', '')} {item.get('limit', '')}".strip()
+        for fields in parse_constraint(text):
+            m = _VOLUME_NOTE_RE.match(fields["note"])
+            if m and fields["metric"] == "Dmax":
+                fields.update(metric="Dx", volume=float(m.group("volume")),
+                              volume_unit="cc", note=fields["note"][m.end():])
+            note = "; ".join(n for n in (fields.pop("note"), item.get("note", "")) if n)
+            yield ConstraintRecord(setting=site, organ=organ, scheme=name, category=None,
+                                   text=text, source=PROTOCOLS_SOURCE, note=note,
+                                   **fields)
+
+
+def compile_protocols(sites):
+    """Compile {site: {protocol: fields}} into :class:`Protocol` objects."""
+    for site, protocols in sites.items():
+        for name, fields in protocols.items():
+            items = fields.get("oar_constraints") or fields.get("constraints")
+            yield Protocol(site=site, name=name,
+                           description=fields.get("description", ""),
+                           fractions=_fractions(name, fields),
+                           checks=tuple(_checks(site, name, items)))
+
+
+def _request_key(record):
+    metric = "Dx" if record.metric == "Dmax" and record.volume is not None else record.metric
+    return (organ_key(record.organ), metric, record.dose, record.volume,
+            record.volume_unit, record.unit)
+
+
+def label_key(label):
+    """(metric, dose, volume, volume_unit, unit) for a metric label.
+
+    Labels follow the protocols' own spelling: ``Dmax``/``Max``,
+    ``Dmean``/``Mean``, ``Dmin``, ``D0.03cc``, ``D100%``, ``V20`` (percent of
+    the structure), ``V20Gy%`` or ``V62Gy cc``.  Dose metrics are in Gy.
+    Returns ``None`` for anything else.
+    """
+    m = _LABEL_RE.fullmatch(re.sub(r"[\s_\[\]]+", "", str(label)).lower())
+    if m is None:
+        return None
+    if m.group("stat"):
+        return (_STATS[m.group("stat")], None, None, None, "Gy")
+    if m.group("volume"):
+        return ("Dx", None, float(m.group("volume")), m.group("volume_unit"), "Gy")
+    return ("Vx", float(m.group("dose")), None, None, m.group("unit") or "%")
+
+
+# ——— evaluation ———
+class ProtocolBook:
+    """All compiled protocols with their checks laid out for batch evaluation."""
+
+    def __init__(self, protocols):
+        self.protocols = tuple(protocols)
+        records, owner = [], []
+        for i, p in enumerate(self.protocols):
+            records.extend(p.checks)
+            owner.extend([i] * len(p.checks))
+        self.records = tuple(records)
+
+        requests = {}
+        self._request = np.array(
+            [requests.setdefault(_request_key(r), len(requests)) for r in records],
+            dtype=np.intp)
+        self._examples = [None] * len(requests)
+        for r, j in zip(records, self._request):
+            if self._examples[j] is None:
+                self._examples[j] = r
+        by_organ = {}
+        for key, j in requests.items():
+            by_organ.setdefault(key[0], []).append((j, key[1:]))
+        self._by_organ = by_organ
+        self._protocol = np.array(owner, dtype=np.intp)
+        self._limit = np.array([np.nan if r.limit is None else r.limit for r in records])
+        self._cmp = np.array([_CMP_CODES.get(r.comparator, -1) for r in records],
+                             dtype=np.int8)
+        self._fractions = np.array([p.fractions or 0 for p in self.protocols])
+        self._sites = [organ_key(p.site) for p in self.protocols]
+
+    def __len__(self):
+        return len(self.protocols)
+
+    def matching(self, site=None, fractions=None):
+        """Protocols for ``site`` (case-insensitive prefix, e.g. ``"lung"``) and
+        ``fractions``; ``None`` matches anything."""
+        return [self.protocols[i] for i in np.flatnonzero(self._match(site, fractions))]
+
+    def _match(self, site, fractions):
+        mask = np.ones(len(self.protocols), dtype=bool)
+        if site is not None:
+            prefix = organ_key(site)
+            mask &= np.array([s.startswith(prefix) for s in self._sites], dtype=bool)
+        if fractions is not None:
+            mask &= self._fractions == int(fractions)
+        return mask
+
+    def check(self, plan, site=None, fractions=None):
+        """Evaluate ``plan`` against every matching protocol.
+
+        ``plan`` maps structure names to a :class:`~reirrad.dvh.DVH` or to a
+        {metric label: value} dict (see :func:`label_key`).  Structures are
+        matched to protocol OARs by normalized name.  Returns a
+        :class:`~reirrad.dvh.ConstraintResult` for every check whose OAR is in
+        the plan; ``passed`` is ``None`` where the check cannot be evaluated
+        (no numeric limit, or a metric the plan does not provide).
+        """
+        from .dvh import ConstraintResult, metric_value
+
+        selected = self._match(site, fractions)[self._protocol]
+        needed = np.zeros(len(self._examples), dtype=bool)
+        needed[self._request[selected]] = True
+        values = np.full(len(self._examples), np.nan)
+        present = np.zeros(len(self._examples), dtype=bool)
+        structure = {}
+        for name, data in plan.items():
+            wanted = [(j, key) for j, key in self._by_organ.get(organ_key(name), ())
+                      if needed[j]]
+            if not wanted:
+                continue
+            if isinstance(data, dict):
+                given = {label_key(k): v for k, v in data.items()}
+                for j, key in wanted:
+                    value = given.get(key)
+                    values[j] = np.nan if value is None else float(value)
+            else:
+                for j, _ in wanted:
+                    value = metric_value(data, self._examples[j])
+                    values[j] = np.nan if value is None else value
+            for j, _ in wanted:
+                present[j] = True
+                structure[j] = name
+
+        mask = selected & present[self._request]
+        idx = np.flatnonzero(mask)
+        req = self._request[idx]
+        v, limit, code = values[req], self._limit[idx], self._cmp[idx]
+        with np.errstate(invalid="ignore"):
+            ok = np.select(
+                [code == 0, code == 1, code == 2, code == 3, code == 4],
+                [v < limit, v <= limit, v > limit, v >= limit, np.isclose(v, limit)],
+                False)
+        evaluable = ~np.isnan(v) & ~np.isnan(limit) & (code >= 0)
+        return [
+            ConstraintResult(self.records[i], structure[j],
+                             None if np.isnan(x) else float(x), bool(p) if e else None)
+            for i, j, x, p, e in zip(idx.tolist(), req.tolist(), v, ok, evaluable)
+        ]
+
+
+def summarize(results):
+    """{(site, protocol): {"passed", "failed", "review"}} counts for results."""
+    out = {}
+    for res in results:
+        counts = out.setdefault((res.record.setting, res.record.scheme),
+                                {"passed": 0, "failed": 0, "review": 0})
+        counts["review" if res.passed is None else "passed" if res.passed else "failed"] += 1
+    return out
+
+
+# ——— loading ———
+def build_protocols(data_dir):
+    """Compile the protocol YAML in ``data_dir`` into a :class:`ProtocolBook`."""
+    return ProtocolBook(compile_protocols(read_protocols(data_dir)))
+
+
+def source_files(data_dir):
+    here = Path(__file__).resolve().parent
+    return [Path(data_dir) / PROTOCOLS_SOURCE] + [here / m for m in _COMPILER_MODULES]
+
+
+def snapshot_path(data_dir):
+    return Path(data_dir) / ".reirrad_cache" / "protocols.snapshot"
+
+
+_lock = threading.Lock()
+_loaded = {}  # data_dir → (source stats, book)
+
+
+def load_protocols(data_dir=None):
+    """Return the compiled :class:`ProtocolBook` (cached like the catalog)."""
+    from .catalog import DATA_DIR
+
+    data_dir = Path(data_dir or DATA_DIR)
+    sources = source_files(data_dir)
+    stats = snapshot.source_stats(sources)
+    hit = _loaded.get(data_dir)
+    if hit is not None and hit[0] == stats:
+        return hit[1]
+    with _lock:
+        hit = _loaded.get(data_dir)
+        if hit is not None and hit[0] == stats:
+            return hit[1]
+        book = snapshot.load_or_build(snapshot_path(data_dir), sources, PROTOCOLS_VERSION,
+                                      lambda: build_protocols(data_dir))
+        _loaded[data_dir] = (stats, book)
+        return book
+
+
+def main(argv=None):
+    import argparse
+
+    from .dvh import load_dvh_file
+
+    parser = argparse.ArgumentParser(
+        description="Check a plan's DVHs against the planning protocols.")
+    parser.add_argument("dvh", nargs="?", help="DVH export (long-form CSV or Eclipse text)")
+    parser.add_argument("--kind", choices=("cumulative", "differential"),
+                        default="cumulative")
+    parser.add_argument("--site", help="only protocols of this site (prefix)")
+    parser.add_argument("--fractions", type=int, help="only protocols with this many fractions")
+    parser.add_argument("--failed", action="store_true", help="print failed checks only")
+    parser.add_argument("--data-dir", default=None, help="directory holding the YAML")
+    args = parser.parse_args(argv)
+
+    book = load_protocols(args.data_dir)
+    if args.dvh is None:
+        for p in book.matching(args.site, args.fractions):
+            print(f"{p.site}\t{p.name}\t{p.fractions or '-'} fx\t{len(p.checks)} checks")
+        return 0
+
+    results = book.check(load_dvh_file(args.dvh, args.kind), args.site, args.fractions)
+    for res in results:
+        if args.failed and res.passed is not False:
+            continue
+        status = "review" if res.passed is None else "pass" if res.passed else "FAIL"
+        value = "-" if res.value is None else f"{res.value:.2f}"
+        r = res.record
+        print(f"{status:<6} {r.setting}/{r.scheme}\t{res.structure}\t{r.text}\t{value}")
+    for (site, name), c in summarize(results).items():
+        print(f"# {site}/{name}: {c['passed']} passed, {c['failed']} failed, "
+              f"{c['review']} to review", file=sys.stderr)
+    return 1 if any(res.passed is False for res in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Linear-quadratic radiobiology kernels.
+
+The ``*_array`` functions broadcast over NumPy arrays; the scalar helpers keep
+the signatures the app has always used and wrap the array versions.
+
+Dose-response models (``model=``):
+
+* ``"lq"`` — linear-quadratic (the default);
+* ``"lql"`` — LQ-L (Astrahan 2008): LQ up to the transition dose ``d_t`` per
+  fraction, then linear with the LQ slope at ``d_t``.
+
+``d_t`` broadcasts like the other arguments (``inf`` gives pure LQ).  The LQ-L
+inverse (:func:`max_d_per_fraction_array`) is solved for whole arrays at once
+by :func:`solve_increasing`.
+
+The universal survival curve (Park et al. 2008) joins the multi-target final
+slope to LQ where they are tangent, which makes it LQ-L with the α/β and
+``d_t`` that :func:`usc_parameters` derives from its α, D₀ and D_q.
+"""
+import math
+
+import numpy as np
+
+MODELS = ("lq", "lql")
+
+
+def _transition(model, d_t):
+    """The transition dose as an array, or ``None`` for pure LQ."""
+    if model == "lq":
+        return None
+    if model not in MODELS:
+        raise ValueError(f"unknown model {model!r} (expected one of {', '.join(MODELS)})")
+    if d_t is None:
+        raise ValueError(f"model {model!r} needs a transition dose d_t")
+    return np.asarray(d_t, dtype=float)
+
+
+def bed_per_fraction_array(d, ab, model="lq", d_t=None):
+    d = np.asarray(d, dtype=float)
+    ab = np.asarray(ab, dtype=float)
+    lq = d * (1 + d / ab)
+    d_t = _transition(model, d_t)
+    if d_t is None:
+        return lq
+    with np.errstate(invalid="ignore"):  # d_t = inf: the linear branch is unused
+        linear = d_t * (1 + d_t / ab) + (d - d_t) * (1 + 2 * d_t / ab)
+    return np.where(d > d_t, linear, lq)
+
+
+def bed_array(n, d, ab, model="lq", d_t=None):
+    n = np.asarray(n, dtype=float)
+    if model != "lq":
+        return n * bed_per_fraction_array(d, ab, model, d_t)
+    d = np.asarray(d, dtype=float)
+    ab = np.asarray(ab, dtype=float)
+    return n * d * (1 + d / ab)
+
+
+def eqd2_array(n, d, ab, model="lq", d_t=None):
+    ab = np.asarray(ab, dtype=float)
+    return bed_array(n, d, ab, model, d_t) / (1 + 2 / ab)
+
+
+def max_d_per_fraction_array(n, target_eqd2, ab, model="lq", d_t=None):
+    n = np.asarray(n, dtype=float)
+    target_eqd2 = np.asarray(target_eqd2, dtype=float)
+    ab = np.asarray(ab, dtype=float)
+    tb = target_eqd2 * (1 + 2 / ab)
+    a, b, c = n / ab, n, -tb
+    disc = b * b - 4 * a * c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.sqrt(np.where(disc < 0, 0.0, disc))
+        d1 = (-b + root) / (2 * a)
+        d2 = (-b - root) / (2 * a)
+    d_lq = np.where(disc < 0, 0.0, np.maximum(d1, d2))
+    d_t = _transition(model, d_t)
+    if d_t is None:
+        return d_lq
+
+    # BED per fraction is increasing and ≥ d, so the root lies in [0, tb / n];
+    # the LQ solution is exact below d_t and a lower bound above it.  With no
+    # room left (tb ≤ 0) the root is below d_t, so LQ-L answers as LQ does.
+    goal = np.maximum(tb / n, 0.0)
+    slope_t = 1 + 2 * d_t / ab
+    d = solve_increasing(
+        lambda d: bed_per_fraction_array(d, ab, model, d_t),
+        lambda d: np.where(d > d_t, slope_t, 1 + 2 * d / ab),
+        goal, 0.0, goal, x0=d_lq,
+    )
+    return np.where(tb > 0, d, d_lq)
+
+
+def usc_parameters(alpha, d0, dq):
+    """(α/β, d_t) of the LQ-L curve equal to the USC with ``alpha``, ``d0``, ``dq``.
+
+    Tangency gives β = (1 − α·D₀)² / (4·D₀·D_q) and D_T = 2·D_q / (1 − α·D₀)
+    (Park et al. 2008); needs α·D₀ < 1.
+    """
+    alpha, d0, dq = (np.asarray(a, dtype=float) for a in (alpha, d0, dq))
+    k = 1 - alpha * d0
+    if np.any(k <= 0):
+        raise ValueError("USC needs alpha * D0 < 1")
+    beta = k * k / (4 * d0 * dq)
+    return alpha / beta, 2 * dq / k
+
+
+def bed(n: int, d: float, ab: float, model="lq", d_t=None) -> float:
+    return float(bed_array(n, d, ab, model, d_t))
+
+
+def eqd2(n: int, d: float, ab: float, model="lq", d_t=None) -> float:
+    return float(eqd2_array(n, d, ab, model, d_t))
+
+
+def max_d_per_fraction(n: int, target_eqd2: float, ab: float, model="lq", d_t=None) -> float:
+    return float(max_d_per_fraction_array(n, target_eqd2, ab, model, d_t))
+
+
+# ——— Vectorized root finding ———
+def solve_increasing(f, fprime, target, lo, hi, x0=None, rtol=1e-12, maxiter=60):
+    """Solve ``f(x) = target`` elementwise for ``f`` increasing on ``[lo, hi]``.
+
+    Bracketed Newton: every element takes a Newton step, and a step that
+    leaves its (shrinking) bracket is replaced by bisection, so each element
+    converges whatever its starting point.  ``f`` and ``fprime`` are called
+    on the whole array of iterates and must broadcast with ``target``.
+    """
+    target, lo, hi = (np.array(a, dtype=float) for a in
+                      np.broadcast_arrays(target, lo, hi))
+    x = 0.5 * (lo + hi) if x0 is None else np.clip(np.broadcast_to(x0, target.shape), lo, hi)
+    tol = rtol * np.maximum(np.abs(target), 1.0)
+    for _ in range(maxiter):
+        r = f(x) - target
+        done = ~(np.abs(r) > tol)  # NaN inputs count as done
+        if done.all():
+            break
+        above = r > 0
+        hi = np.where(above, x, hi)
+        lo = np.where(above, lo, x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = x - r / fprime(x)
+        inside = (step > lo) & (step < hi)
+        x = np.where(done, x, np.where(inside, step, 0.5 * (lo + hi)))
+    return x
+
+
+# ——— Time-corrected BED (repopulation) ———
+def bed_time(n, d, ab, alpha, T, Td, Tk=0):
+    repop = 0.0
+    if T > Tk:
+        repop = (math.log(2) / alpha) * (T - Tk) / Td
+    return n * d * (1 + d / ab) - repop
+
+
+def iso_effective_dose_array(n2, T2, ab, alpha, Td, BED_goal, Tk=0):
+    """Broadcasting :func:`iso_effective_dose`: arrays of (d₂, total, R₂)."""
+    n2 = np.asarray(n2, dtype=float)
+    T2 = np.asarray(T2, dtype=float)
+    ab = np.asarray(ab, dtype=float)
+    R2 = (math.log(2) / alpha) * np.maximum(T2 - Tk, 0) / Td
+    C = (BED_goal + R2) / n2
+    disc = ab**2 + 4 * ab * C
+    d2 = (-ab + np.sqrt(disc)) / 2
+    return d2, d2 * n2, R2
+
+
+def iso_effective_dose(n2, T2, ab, alpha, Td, BED_goal, Tk=0):
+    """Return (dose per fraction, total dose, repopulation term)."""
+    d2, total, R2 = iso_effective_dose_array(n2, T2, ab, alpha, Td, BED_goal, Tk)
+    return float(d2), float(total), float(R2)
@@ -0,0 +1,47 @@
+"""Time-dependent recovery of prior dose.
+
+The curve of :data:`reirrad.tables.RECOVERY_CURVE` is tabulated once per
+process on a uniform month grid; every lookup after that is array
+interpolation, so millions of course intervals cost a few vector operations
+rather than a Python call each.  One curve serves every organ.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .tables import RECOVERY_CURVE, RECOVERY_TABLE_MONTHS
+
+
+def recovery_curve(months, r_max, lag, tau):
+    """r(t) = r_max · (1 − exp(−(t − lag) / tau)) for t > lag, else 0."""
+    t = np.maximum(np.asarray(months, dtype=float) - lag, 0.0)
+    return r_max * -np.expm1(-t / tau)
+
+
+@lru_cache(maxsize=None)
+def recovery_table():
+    """Return ``(months grid, curve)`` of :data:`RECOVERY_CURVE`."""
+    start, stop, step = RECOVERY_TABLE_MONTHS
+    months = np.arange(start, stop + step / 2, step)
+    curve = recovery_curve(months, **RECOVERY_CURVE)
+    curve.setflags(write=False)
+    return months, curve
+
+
+def recovery_array(months):
+    """Recovered fraction at ``months`` (any shape).
+
+    Linear interpolation on the uniform grid, clamped at both ends.
+    """
+    grid, curve = recovery_table()
+    start, step = grid[0], grid[1] - grid[0]
+    pos = np.clip((np.asarray(months, dtype=float) - start) / step, 0.0, grid.size - 1)
+    lo = np.minimum(pos.astype(np.intp), grid.size - 2)
+    frac = pos - lo
+    return curve[lo] * (1.0 - frac) + curve[lo + 1] * frac
+
+
+def recovery_fraction(months):
+    """Recovered fraction of a prior EQD₂ after ``months`` (scalar or array)."""
+    value = recovery_array(months)
+    return float(value) if np.ndim(value) == 0 else value
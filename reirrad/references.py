@@ -0,0 +1,64 @@
+"""Reference store and the (setting, organ, scheme) → reference-ID index.
+
+``References.yaml`` is a plain-text bibliography (``[n] Authors`` followed by
+title and journal lines), not a YAML mapping, so it is parsed here directly.
+Everything is built once at catalog-compile time; the lookup tab only does
+dictionary lookups.
+"""
+import re
+
+_ENTRY_RE = re.compile(r"^\[(\d+)\]\s*", re.M)
+_GROUP_RE = re.compile(r"\[(\d+(?:\s*[,–-]\s*\d+)*)\]")
+
+
+def parse_references_text(text):
+    """Return {id: citation} from the ``[n] …`` blocks of a bibliography."""
+    refs = {}
+    starts = list(_ENTRY_RE.finditer(text))
+    for m, nxt in zip(starts, starts[1:] + [None]):
+        body = text[m.end():nxt.start() if nxt else len(text)]
+        lines = (re.sub(r"\s+", " ", ln).strip() for ln in body.splitlines())
+        refs[int(m.group(1))] = " ".join(ln for ln in lines if ln)
+    return refs
+
+
+def ref_ids(source):
+    """Reference IDs cited by a source string, e.g. "CORSAIR [5,26], [30–32]"."""
+    ids = []
+    for group in _GROUP_RE.findall(source or ""):
+        for part in group.split(","):
+            lo, _, hi = re.sub(r"\s", "", part).replace("–", "-").partition("-")
+            ids.extend(range(int(lo), int(hi or lo) + 1))
+    return tuple(dict.fromkeys(ids))
+
+
+def build_store(bibliography_text, fallback):
+    """Citations from the bibliography, completed with ``fallback`` entries."""
+    store = dict(fallback)
+    store.update(parse_references_text(bibliography_text))
+    return dict(sorted(store.items()))
+
+
+def build_reference_index(settings, store):
+    """Return ``(index, dangling)`` for the YAML settings.
+
+    ``index`` maps (setting, organ, scheme) to the sorted reference IDs its
+    entries cite; ``dangling`` maps each cited ID missing from ``store`` to
+    the keys citing it.
+    """
+    index = {}
+    dangling = {}
+    for setting, organs in settings.items():
+        for organ, schemes in organs.items():
+            for scheme, entries in schemes.items():
+                ids = set()
+                for e in entries or ():
+                    ids.update(ref_ids(e.get("source", "")))
+                if not ids:
+                    continue
+                key = (setting, organ, scheme)
+                index[key] = tuple(sorted(ids))
+                for i in index[key]:
+                    if i not in store:
+                        dangling.setdefault(i, []).append(key)
+    return index, {i: tuple(keys) for i, keys in sorted(dangling.items())}
@@ -0,0 +1,46 @@
+"""Multi-OAR regimen solver.
+
+For every fraction count ``n`` in a range, the permissible dose per fraction
+is the smallest of the per-OAR solutions of ``max_d_per_fraction``; the OAR
+that attains it is the binding one.  All OARs × all ``n`` are solved as a
+single broadcast of :func:`reirrad.radiobiology.max_d_per_fraction_array`.
+"""
+import numpy as np
+
+from .radiobiology import max_d_per_fraction_array
+from .tables import FRACTION_RANGE
+
+
+def fraction_counts(lo=FRACTION_RANGE[0], hi=FRACTION_RANGE[1]):
+    return np.arange(int(lo), int(hi) + 1)
+
+
+def solve_regimens(left, ab, names=None, fractions=None, model="lq", d_t=None):
+    """Jointly permissible regimens for several OARs.
+
+    ``left`` and ``ab`` hold each OAR's remaining EQD₂ room and α/β (Gy);
+    ``names`` labels them (defaults to their positions); ``d_t`` gives each
+    OAR's transition dose for the LQ-L model.  Returns a dict
+    with ``fractions``, ``d_per_fx`` and ``total`` (one entry per fraction
+    count), ``binding`` (the limiting OAR's name for each count) and
+    ``per_oar`` (the unconstrained dose per fraction, shape ``(oars, n)``).
+    """
+    left = np.atleast_1d(np.asarray(left, dtype=float))
+    ab = np.atleast_1d(np.asarray(ab, dtype=float))
+    if left.shape != ab.shape or left.ndim != 1:
+        raise ValueError("left and ab need one entry per OAR")
+    names = list(range(left.size)) if names is None else list(names)
+    n = fraction_counts() if fractions is None else np.asarray(fractions)
+
+    if d_t is not None:
+        d_t = np.broadcast_to(np.asarray(d_t, dtype=float), left.shape)[:, None]
+    per_oar = max_d_per_fraction_array(n[None, :], left[:, None], ab[:, None], model, d_t)
+    idx = np.argmin(per_oar, axis=0)
+    d = per_oar[idx, np.arange(n.size)]
+    return {
+        "fractions": n,
+        "d_per_fx": d,
+        "total": d * n,
+        "binding": [names[i] for i in idx],
+        "per_oar": per_oar,
+    }
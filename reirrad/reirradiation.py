@@ -0,0 +1,84 @@
+"""Re-irradiation dose-limit logic (Tab 1) without any UI.
+
+:func:`reirradiation_report` is the per-OAR calculation the app shows;
+:func:`batch_reports` is the same calculation for many (patient, OAR) rows
+at once, with the prior courses passed as flat arrays.
+
+Both take a dose-response ``model`` ("lq" or "lql") and, for LQ-L, the
+transition dose ``d_t`` per fraction; see :mod:`reirrad.radiobiology`.
+"""
+import numpy as np
+
+from .radiobiology import eqd2, eqd2_array, max_d_per_fraction_array
+from .tables import FRACTION_OPTIONS, OAR_TRANSITION_DOSE
+
+
+def transition_dose(oar):
+    """Default LQ-L transition dose (Gy per fraction) for ``oar``."""
+    return OAR_TRANSITION_DOSE.get(oar, OAR_TRANSITION_DOSE["default"])
+
+
+def reirradiation_report(courses, ab, limit, model="lq", d_t=None):
+    """Return the Tab 1 report dict for one OAR.
+
+    ``courses`` is a list of {"dose", "fractions", "recovery"} dicts, with
+    recovery as a fraction (0–1) of the course's EQD₂ that has been recovered.
+    """
+    raw = eff = 0.0
+    for c in courses:
+        eq = eqd2(c["fractions"], c["dose"] / c["fractions"], ab, model, d_t)
+        raw += eq
+        eff += eq * (1 - c["recovery"])
+
+    return {
+        "limit":     limit,
+        "raw":       raw,
+        "recovered": raw - eff,
+        "eff":       eff,
+        "left":      max(limit - eff, 0.0),
+        "ab":        ab,
+        "model":     model,
+        "d_t":       d_t,
+    }
+
+
+def permissible_regimens(left, ab, fractions=FRACTION_OPTIONS, model="lq", d_t=None):
+    """Return [(n, dose per fraction, total dose), …] using up ``left`` Gy EQD₂."""
+    d_per_fx = max_d_per_fraction_array(fractions, left, ab, model, d_t)
+    return [(n, float(d), float(d) * n) for n, d in zip(fractions, d_per_fx)]
+
+
+def batch_reports(ab, limit, course_row, dose, fractions, recovery,
+                  fraction_options=FRACTION_OPTIONS, model="lq", d_t=None):
+    """Vectorized :func:`reirradiation_report` + regimens for many rows.
+
+    ``ab`` and ``limit`` have one entry per row; the course arrays have one
+    entry per course, with ``course_row`` giving the row each belongs to.
+    ``d_t`` (LQ-L) is a scalar or has one entry per row.
+    Returns a dict of arrays: ``raw``, ``recovered``, ``eff`` and ``left``
+    (shape ``(rows,)``) and ``d_per_fx`` (shape ``(rows, len(fraction_options))``).
+    """
+    ab = np.asarray(ab, dtype=float)
+    limit = np.asarray(limit, dtype=float)
+    course_row = np.asarray(course_row, dtype=np.intp)
+    dose = np.asarray(dose, dtype=float)
+    fractions = np.asarray(fractions, dtype=float)
+    recovery = np.asarray(recovery, dtype=float)
+    if d_t is not None:
+        d_t = np.broadcast_to(np.asarray(d_t, dtype=float), ab.shape)
+
+    eq = eqd2_array(fractions, dose / fractions, ab[course_row], model,
+                    None if d_t is None else d_t[course_row])
+    raw = np.bincount(course_row, weights=eq, minlength=ab.size)
+    eff = np.bincount(course_row, weights=eq * (1 - recovery), minlength=ab.size)
+    left = np.maximum(limit - eff, 0.0)
+    options = np.asarray(fraction_options, dtype=float)
+    d_per_fx = max_d_per_fraction_array(options[None, :], left[:, None], ab[:, None], model,
+                                        None if d_t is None else d_t[:, None])
+    return {
+        "raw": raw,
+        "recovered": raw - eff,
+        "eff": eff,
+        "left": left,
+        "d_per_fx": d_per_fx,
+    }
@@ -0,0 +1,182 @@
+"""Cross-catalog organ search.
+
+Every constraint record — the YAML settings, 3D‑CRT, SBRT and the planning
+protocols — is filed under a normalized organ name: lower case, laterality
+and parentheticals dropped, words singularized, "gland"/"muscle" dropped and
+:data:`~reirrad.tables.ORGAN_ALIASES` applied, so "Brain Stem", "Brainstem",
+"Cochleae (bilateral)" and "Left Parotid Gland" land with their synonyms.
+The side is kept for :data:`~reirrad.tables.SIDED_STRUCTURES` ("Left
+Ventricle" is not a ventricle of either side), and a query naming a side
+never returns a structure of the other side.
+
+The index maps every prefix of every name word to the organs carrying it, so a
+type-ahead query is one dictionary lookup per query word; a word with no
+prefix hit falls back to a close match among the indexed prefixes of the same
+length (typos).
+"""
+import difflib
+import re
+import threading
+from dataclasses import dataclass
+
+from .constraints import organ_key
+from .tables import ORGAN_ALIASES, SIDED_STRUCTURES
+
+_LEFT = frozenset({"left", "lt", "l"})
+_RIGHT = frozenset({"right", "rt", "r"})
+_SIDES = _LEFT | _RIGHT | {"bilateral", "ipsilateral", "contralateral"}
+_OPPOSITE = {"left": "right", "right": "left"}
+_DROP = frozenset({"gland", "muscle"})
+_NOT_PLURAL = ("ss", "us", "is", "as")
+
+
+@dataclass(frozen=True, slots=True)
+class OrganMatch:
+    key: str        # normalized organ name
+    name: str       # display spelling taken from the catalogs
+    count: int      # number of constraint records filed under it
+
+
+def _singular(word):
+    if len(word) <= 3 or word.endswith(_NOT_PLURAL) or word == "lens":
+        return word
+    if word.endswith("ae"):
+        return word[:-1]
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    return word[:-1] if word.endswith("s") else word
+
+
+def _words(name):
+    s = re.sub(r"\([^)]*\)", " ", str(name).lower())
+    return [_singular(w) for w in re.findall(r"[a-z0-9]+", s) if w not in _SIDES]
+
+
+def _side(name):
+    """``"left"``, ``"right"`` or None, from the side words of ``name``."""
+    words = set(re.findall(r"[a-z]+", re.sub(r"\([^)]*\)", " ", str(name).lower())))
+    left, right = bool(words & _LEFT), bool(words & _RIGHT)
+    return "left" if left and not right else "right" if right and not left else None
+
+
+def canonical_organ(name):
+    """Normalized organ name used to file and look up constraints."""
+    words = _words(name)
+    kept = [w for w in words if w not in _DROP] or words
+    key = " ".join(kept)
+    key = ORGAN_ALIASES.get(key, key)
+    side = _side(name) if key in SIDED_STRUCTURES else None
+    return f"{side} {key}" if side else key
+
+
+def _display_name(key, spellings):
+    """A spelling that reads as ``key`` if there is one, else the most common."""
+    return min(spellings, key=lambda s: (organ_key(s) != key, -spellings[s], len(s), s))
+
+
+class OrganSearch:
+    """Inverted index of constraint records by normalized organ name."""
+
+    def __init__(self, records):
+        by_key, spellings = {}, {}
+        for r in records:
+            key = canonical_organ(r.organ)
+            by_key.setdefault(key, []).append(r)
+            counts = spellings.setdefault(key, {})
+            counts[r.organ] = counts.get(r.organ, 0) + 1
+        self._records = {k: tuple(v) for k, v in by_key.items()}
+        self.organs = tuple(
+            OrganMatch(k, _display_name(k, spellings[k]), len(v))
+            for k, v in sorted(self._records.items(), key=lambda kv: (-len(kv[1]), kv[0]))
+        )
+        self._rank = {m.key: i for i, m in enumerate(self.organs)}
+
+        words = {}  # word → organ ranks
+        for m in self.organs:
+            i = self._rank[m.key]
+            for name in (m.key, *spellings[m.key]):
+                for w in m.key.split() + _words(name):
+                    words.setdefault(w, set()).add(i)
+        for alias, target in ORGAN_ALIASES.items():
+            if target in self._rank:
+                for w in alias.split():
+                    words.setdefault(w, set()).add(self._rank[target])
+        prefixes = {}
+        for w, ranks in words.items():
+            for n in range(1, len(w) + 1):
+                prefixes.setdefault(w[:n], set()).update(ranks)
+        self._prefixes = {p: frozenset(r) for p, r in prefixes.items()}
+        by_len = {}
+        for p in self._prefixes:
+            by_len.setdefault(len(p), []).append(p)
+        self._by_len = by_len
+
+    def __len__(self):
+        return len(self.organs)
+
+    def _hits(self, word):
+        hits = self._prefixes.get(word)
+        if hits is not None:
+            return hits
+        close = difflib.get_close_matches(word, self._by_len.get(len(word), ()), n=3,
+                                          cutoff=0.75)
+        return frozenset().union(*(self._prefixes[p] for p in close))
+
+    def search(self, query, limit=10):
+        """Organs matching every word of ``query`` as a prefix (best first).
+
+        An exact normalized-name match ranks first, then names starting with
+        the query, then the rest by number of constraints.  When the query
+        names a side, structures of the other side are left out.
+        """
+        words = _words(query)
+        if not words:
+            return []
+        ranks = None
+        for w in words:
+            hits = self._hits(w)
+            ranks = hits if ranks is None else ranks & hits
+            if not ranks:
+                return []
+        side = _side(query)
+        if side:
+            other = _OPPOSITE[side] + " "
+            ranks = [i for i in ranks if not self.organs[i].key.startswith(other)]
+        exact = self._rank.get(canonical_organ(query))
+        head = " ".join(words)
+        ordered = sorted(ranks, key=lambda i: (i != exact,
+                                               not self.organs[i].key.startswith(head), i))
+        return [self.organs[i] for i in ordered[:limit]]
+
+    def constraints(self, organ):
+        """Every constraint record for ``organ`` (any spelling) across all catalogs."""
+        return self._records.get(canonical_organ(organ), ())
+
+    def lookup(self, query):
+        """Records for the best match of ``query`` (empty when nothing matches)."""
+        best = self.search(query, limit=1)
+        return self._records[best[0].key] if best else ()
+
+
+_lock = threading.Lock()
+_built = {}  # data_dir → (catalog index, protocol book, OrganSearch)
+
+
+def organ_search(data_dir=None):
+    """The :class:`OrganSearch` over all catalogs and protocols.
+
+    Rebuilt only when :func:`~reirrad.catalog.load_catalog` or
+    :func:`~reirrad.protocols.load_protocols` hand back a recompiled source.
+    """
+    from .catalog import load_catalog
+    from .protocols import load_protocols
+
+    index = load_catalog(data_dir)["index"]
+    book = load_protocols(data_dir)
+    hit = _built.get(data_dir)
+    if hit is not None and hit[0] is index and hit[1] is book:
+        return hit[2]
+    with _lock:
+        search = OrganSearch(index.records + book.records)
+        _built[data_dir] = (index, book, search)
+        return search
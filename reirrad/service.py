@@ -0,0 +1,496 @@
+"""Local HTTP/JSON service for the Tab 1 / Tab 4 calculations.
+
+    python -m reirrad.service --port 8765
+
+Endpoints (JSON bodies in and out):
+
+``POST /v1/remaining-room``
+    ``{"courses": [{"dose", "fractions", "recovery"}], "ab", "limit",
+    "fractions": [1, 3, 5, 10], "model": "lq", "d_t"}`` → the Tab 1 report
+    plus its regimens.  ``model`` is ``lq`` or ``lql``; ``d_t``
+    (transition dose, Gy per fraction) defaults to the ``oar``'s.
+``POST /v1/regimen``
+    ``{"oars": [{"name", "left", "ab", "d_t"}], "fractions": [1, 40],
+    "model": "lq"}`` → the jointly permissible regimen and binding OAR per
+    fraction count.  ``fractions`` is a list of counts, or
+    ``{"lo": 1, "hi": 40}`` for an inclusive range (the default).
+``POST /v1/iso-effective``
+    ``{"n1", "d1", "T1", "n2", "T2", "ab", "alpha", "Td", "Tk"}`` (or
+    ``"BED"`` in place of the baseline regimen) → d₂, total and R₂.
+``POST /v1/batch/remaining-room``
+    ``{"rows": [{"patient", "oar", "ab", "limit", "courses"}], "fractions",
+    "model"}``
+    → one output row per input row, computed as one array pass (rows are
+    the records :mod:`reirrad.batch` reads from JSON lines).
+``POST /v1/plan-check``
+    ``{"plan": {structure: {metric label: value}}, "site", "fractions"}`` →
+    every matching protocol check from ``planning_protocols.yaml`` with its
+    value and verdict, plus pass/fail counts per protocol.
+``GET /v1/constraints?organ=…&scheme=…&metric=…``
+    → the parsed constraint records for an organ.
+``GET /v1/organs?q=…&limit=10``
+    → organs matching a (partial, misspelled or synonym) name across every
+    catalog and protocol, best first, with all constraint records of the
+    best match.
+``GET /v1/sbrt-eqd2?ab=…&organ=…``
+    → every numeric SBRT limit (of ``organ``, or all) as EQD₂ at α/β
+    ``ab`` and as the iso-effective total at 1–10 fractions, read from the
+    conversion table compiled with the catalog.
+``GET /v1/health``
+    → cache statistics.
+
+:class:`Service` is the transport-free core (``handle(method, target, body)``
+→ ``(status, body)``) with an LRU cache keyed on the normalized request;
+:class:`LocalClient` calls it in-process for tests and scripts, and
+:func:`serve` puts it behind an asyncio HTTP/1.1 server with keep-alive.
+The server answers cache hits on the event loop and computes everything
+else on executor threads, so a slow request never stalls the others.
+"""
+import asyncio
+import json
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from urllib.parse import parse_qsl, urlsplit
+
+from .tables import DOSE_MODELS, FRACTION_OPTIONS, FRACTION_RANGE
+
+CACHE_SIZE = 4096
+PROBE_BYTES = 64 << 10  # larger bodies skip the on-loop cache probe
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large",
+            422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+class RequestError(ValueError):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _num(payload, name, default=None):
+    value = payload.get(name, default)
+    if value is None:
+        raise RequestError(f"missing field {name!r}")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"{name} must be a number, got {value!r}") from None
+    if not math.isfinite(number):
+        raise RequestError(f"{name} must be a finite number, got {value!r}")
+    return number
+
+
+def _positive(payload, name, default=None):
+    value = _num(payload, name, default)
+    if value <= 0:
+        raise RequestError(f"{name} must be positive, got {value}")
+    return value
+
+
+def _fraction_list(value, default):
+    if value is None:
+        return list(default)
+    try:
+        counts = [int(n) for n in value]
+    except (TypeError, ValueError):
+        raise RequestError(f"fractions must be a list of integers, got {value!r}") from None
+    if not counts or min(counts) < 1:
+        raise RequestError("fractions must be positive integers")
+    return counts
+
+
+def _model(payload):
+    model = payload.get("model", "lq")
+    if not isinstance(model, str) or model not in DOSE_MODELS:
+        raise RequestError(f"model must be one of {', '.join(DOSE_MODELS)}, got {model!r}")
+    return model
+
+
+def _transition_dose(payload, organ):
+    from .reirradiation import transition_dose
+
+    if payload.get("d_t") is None:
+        return transition_dose(organ)
+    return _positive(payload, "d_t")
+
+
+def _courses(value):
+    from .batch import parse_courses
+
+    try:
+        courses = parse_courses(value)
+    except (ValueError, KeyError, TypeError) as exc:
+        raise RequestError(str(exc)) from None
+    if any(c[2] != c[2] for c in courses):  # NaN: recovery from interval
+        from .recovery import recovery_fraction
+        return courses, recovery_fraction
+    return courses, None
+
+
+# ——— endpoint handlers (pure functions of the decoded request) ———
+def remaining_room(payload):
+    from .reirradiation import permissible_regimens, reirradiation_report
+
+    courses, curve = _courses(payload.get("courses", []))
+    organ = payload.get("oar", "default")
+    course_dicts = [
+        {"dose": d, "fractions": n,
+         "recovery": r if curve is None or r == r else curve(m)}
+        for d, n, r, m in courses
+    ]
+    ab = _positive(payload, "ab")
+    model = _model(payload)
+    d_t = None if model == "lq" else _transition_dose(payload, organ)
+    report = reirradiation_report(course_dicts, ab, _num(payload, "limit"), model, d_t)
+    fractions = _fraction_list(payload.get("fractions"), FRACTION_OPTIONS)
+    report["regimens"] = [
+        {"fractions": n, "d_per_fx": d, "total": total}
+        for n, d, total in permissible_regimens(report["left"], ab, fractions, model, d_t)
+    ]
+    return report
+
+
+def regimen(payload):
+    from .regimen import fraction_counts, solve_regimens
+
+    oars = payload.get("oars")
+    if not oars:
+        raise RequestError("oars must be a non-empty list")
+    fractions = payload.get("fractions")
+    if fractions is None or isinstance(fractions, dict):
+        span = fractions or {}
+        lo = int(_positive(span, "lo", FRACTION_RANGE[0]))
+        hi = int(_positive(span, "hi", FRACTION_RANGE[1]))
+        if lo > hi:
+            raise RequestError(f"fractions range is empty (lo {lo} > hi {hi})")
+        fractions = fraction_counts(lo, hi)
+    else:
+        fractions = _fraction_list(fractions, ())
+    model = _model(payload)
+    d_t = None if model == "lq" else [_transition_dose(o, o.get("name")) for o in oars]
+    res = solve_regimens(
+        [_num(o, "left") for o in oars], [_positive(o, "ab") for o in oars],
+        names=[o.get("name", i) for i, o in enumerate(oars)], fractions=fractions,
+        model=model, d_t=d_t,
+    )
+    return {
+        "fractions": res["fractions"].tolist(),
+        "d_per_fx": res["d_per_fx"].tolist(),
+        "total": res["total"].tolist(),
+        "binding": res["binding"],
+    }
+
+
+def iso_effective(payload):
+    from .radiobiology import bed_time, iso_effective_dose
+
+    ab, alpha, Td = (_positive(payload, k) for k in ("ab", "alpha", "Td"))
+    Tk = _num(payload, "Tk", 0)
+    if payload.get("BED") is not None:
+        goal = _num(payload, "BED")
+    else:
+        goal = bed_time(_positive(payload, "n1"), _positive(payload, "d1"), ab, alpha,
+                        _num(payload, "T1"), Td, Tk)
+    n2, T2 = _positive(payload, "n2"), _num(payload, "T2")
+    d2, total, R2 = iso_effective_dose(n2, T2, ab, alpha, Td, goal, Tk)
+    return {"BED_goal": goal, "d_per_fx": d2, "total": total, "R": R2}
+
+
+def batch_remaining_room(payload):
+    from .batch import output_fields, process_chunk
+
+    rows = payload.get("rows")
+    if not isinstance(rows, list):
+        raise RequestError("rows must be a list")
+    fractions = _fraction_list(payload.get("fractions"), FRACTION_OPTIONS)
+    fields = output_fields(fractions)
+    model = _model(payload)
+    return {"rows": [dict(zip(fields, r)) for r in process_chunk(rows, fractions, model)]}
+
+
+def plan_check(payload):
+    from .protocols import load_protocols, summarize
+
+    plan = payload.get("plan")
+    if not isinstance(plan, dict) or not all(isinstance(v, dict) for v in plan.values()):
+        raise RequestError("plan must map structure names to {metric: value} objects")
+    fractions = payload.get("fractions")
+    if fractions is not None:
+        fractions = int(_positive(payload, "fractions"))
+    results = load_protocols().check(plan, payload.get("site"), fractions)
+    return {
+        "checks": [
+            {"site": r.record.setting, "protocol": r.record.scheme, "organ": r.record.organ,
+             "structure": r.structure, "text": r.record.text, "value": r.value,
+             "passed": r.passed}
+            for r in results
+        ],
+        "protocols": [{"site": site, "protocol": name, **counts}
+                      for (site, name), counts in summarize(results).items()],
+    }
+
+
+def constraints(query):
+    from .catalog import constraint_index
+
+    organ = query.get("organ")
+    if not organ:
+        raise RequestError("query parameter 'organ' is required")
+    records = constraint_index().query(organ, query.get("scheme") or None,
+                                       query.get("metric") or None)
+    return {"organ": organ, "records": [asdict(r) for r in records]}
+
+
+def organs(query):
+    from .search import organ_search
+
+    q = query.get("q", "").strip()
+    if not q:
+        raise RequestError("query parameter 'q' is required")
+    try:
+        limit = int(query.get("limit", 10))
+    except ValueError:
+        raise RequestError(f"limit must be an integer, got {query['limit']!r}") from None
+    finder = organ_search()
+    matches = finder.search(q, limit)
+    return {
+        "query": q,
+        "matches": [asdict(m) for m in matches],
+        "records": [asdict(r) for r in finder.constraints(matches[0].name)] if matches else [],
+    }
+
+
+def sbrt_eqd2(query):
+    from .catalog import load_catalog
+
+    ab = _positive(query, "ab")
+    organ = query.get("organ") or None
+    table = load_catalog()["sbrt_eqd2"]
+    return {"ab": ab, "fractions": list(table.fractions),
+            "limits": table.table(ab, organ)}
+
+
+_POST = {
+    "/v1/remaining-room": remaining_room,
+    "/v1/regimen": regimen,
+    "/v1/iso-effective": iso_effective,
+    "/v1/batch/remaining-room": batch_remaining_room,
+    "/v1/plan-check": plan_check,
+}
+_GET = {"/v1/constraints": constraints, "/v1/organs": organs, "/v1/sbrt-eqd2": sbrt_eqd2}
+
+
+def _encode(result):
+    """Strict JSON bytes of a handler result; a NaN or infinity in it is a 422."""
+    try:
+        return json.dumps(result, ensure_ascii=False, allow_nan=False).encode()
+    except ValueError:
+        raise RequestError("no finite result for these inputs", 422) from None
+
+
+def _normalize(value):
+    """Canonical form of a request: sorted keys, numbers as floats."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _normalize(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    return str(value)
+
+
+class Service:
+    """Routes requests to the handlers, with an LRU cache of encoded replies."""
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        # requests are handled on executor threads; the LRU is shared
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _cached(self, key, compute):
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+        body = _encode(compute())
+        with self._lock:
+            self._cache[key] = body
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return body
+
+    def route(self, method, target, body=b""):
+        """Return ``(handler, args, cache key)`` or raise :class:`RequestError`."""
+        parts = urlsplit(target)
+        path = parts.path.rstrip("/") or "/"
+        if path == "/v1/health":
+            return (lambda: {"status": "ok", "cache": {
+                "size": len(self._cache), "hits": self.hits, "misses": self.misses}}), (), None
+        if method == "GET" and path in _GET:
+            query = dict(parse_qsl(parts.query))
+            return _GET[path], (query,), (path, _normalize(query))
+        if method == "POST" and path in _POST:
+            try:
+                payload = json.loads(body or b"{}")
+            except (ValueError, UnicodeDecodeError) as exc:
+                raise RequestError(f"invalid JSON: {exc}") from None
+            if not isinstance(payload, dict):
+                raise RequestError("request body must be a JSON object")
+            key = None if path.startswith("/v1/batch/") else (path, _normalize(payload))
+            return _POST[path], (payload,), key
+        if path in _GET or path in _POST:
+            raise RequestError(f"{method} not allowed on {path}", 405)
+        raise RequestError(f"no such endpoint: {path}", 404)
+
+    def cached(self, method, target, body=b""):
+        """``(200, JSON bytes)`` if the reply is in the cache, else None.
+
+        Never computes anything, so it is safe to call on the event loop.
+        """
+        try:
+            _, _, key = self.route(method, target, body)
+        except RequestError:
+            return None
+        if key is None:
+            return None
+        with self._lock:
+            body = self._cache.get(key)
+            if body is None:
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+        return 200, body
+
+    def handle(self, method, target, body=b""):
+        """Process one request; return ``(status, JSON bytes)``."""
+        try:
+            fn, args, key = self.route(method, target, body)
+            if key is None:
+                return 200, _encode(fn(*args))
+            return 200, self._cached(key, lambda: fn(*args))
+        except RequestError as exc:
+            return exc.status, json.dumps({"error": str(exc)}).encode()
+        except Exception as exc:  # keep the server up; report the failure
+            return 500, json.dumps({"error": f"{type(exc).__name__}: {exc}"}).encode()
+
+
+class LocalClient:
+    """In-process client: the same requests, no sockets."""
+
+    def __init__(self, service=None):
+        self.service = service or Service()
+
+    def get(self, target):
+        status, body = self.service.handle("GET", target)
+        return status, json.loads(body)
+
+    def post(self, target, payload):
+        status, body = self.service.handle("POST", target, json.dumps(payload).encode())
+        return status, json.loads(body)
+
+
+# ——— asyncio HTTP/1.1 transport ———
+MAX_BODY = 64 << 20
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, version = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+    headers = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = h.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0) or 0)
+    if length > MAX_BODY:
+        raise RequestError("request body too large", 413)
+    body = await reader.readexactly(length) if length else b""
+    keep_alive = (headers.get("connection", "").lower() != "close"
+                  and version.upper() != "HTTP/1.0")
+    return method.upper(), target, body, keep_alive
+
+
+def _response(status, body, keep_alive):
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+def make_handler(service):
+    async def respond(method, target, body):
+        reply = service.cached(method, target, body) if len(body) <= PROBE_BYTES else None
+        if reply is None:
+            reply = await asyncio.get_running_loop().run_in_executor(
+                None, service.handle, method, target, body)
+        return reply
+
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except RequestError as exc:
+                    writer.write(_response(exc.status, json.dumps({"error": str(exc)}).encode(),
+                                           False))
+                    break
+                except (ValueError, asyncio.IncompleteReadError):
+                    writer.write(_response(400, b'{"error": "malformed request"}', False))
+                    break
+                if request is None:
+                    break
+                method, target, body, keep_alive = request
+                status, out = await respond(method, target, body)
+                writer.write(_response(status, out, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle_connection
+
+
+async def serve(host="127.0.0.1", port=8765, service=None):
+    """Run the HTTP server until cancelled."""
+    server = await asyncio.start_server(make_handler(service or Service()), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the re-irradiation calculations over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    args = parser.parse_args(argv)
+    print(f"serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(args.host, args.port, Service(args.cache_size)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
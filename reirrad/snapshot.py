@@ -0,0 +1,114 @@
+"""Binary snapshots of compiled data, invalidated by source-file hashes.
+
+A snapshot is a pickle holding a payload plus a record of every source file it
+was compiled from (mtime, size and SHA-256).  Loading checks the cheap
+``os.stat`` fields first and only hashes a file whose stat changed, so an
+unchanged tree never re-reads the sources.  The payload is rebuilt only when a
+source's content hash actually differs.
+"""
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+FORMAT_VERSION = 1
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def source_stats(sources):
+    """Return {path: (mtime_ns, size)} for the given source files."""
+    out = {}
+    for path in sources:
+        st = os.stat(path)
+        out[str(path)] = (st.st_mtime_ns, st.st_size)
+    return out
+
+
+def _describe(sources):
+    stats = source_stats(sources)
+    return {
+        path: {"mtime_ns": mtime, "size": size, "sha256": file_sha256(path)}
+        for path, (mtime, size) in stats.items()
+    }
+
+
+def _check(recorded, sources):
+    """Return "fresh", "touched" (stat changed, content identical) or "stale"."""
+    if set(recorded) != {str(p) for p in sources}:
+        return "stale"
+    state = "fresh"
+    for path, (mtime, size) in source_stats(sources).items():
+        rec = recorded[path]
+        if (rec["mtime_ns"], rec["size"]) == (mtime, size):
+            continue
+        if rec["size"] != size or rec["sha256"] != file_sha256(path):
+            return "stale"
+        state = "touched"
+    return state
+
+
+def _read(path, sources, version):
+    try:
+        with open(path, "rb") as f:
+            snap = pickle.load(f)
+    # a payload class that was renamed or moved away (ImportError,
+    # AttributeError) just means the snapshot predates the code
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None, "stale"
+    if snap.get("format") != FORMAT_VERSION or snap.get("version") != version:
+        return None, "stale"
+    state = _check(snap["sources"], sources)
+    return (snap["payload"] if state != "stale" else None), state
+
+
+def read_snapshot(path, sources, version):
+    """Return the payload stored at ``path``, or None if missing or stale."""
+    return _read(path, sources, version)[0]
+
+
+def write_snapshot(path, sources, version, payload):
+    """Atomically write ``payload`` with the current source descriptions."""
+    import tempfile
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    snap = {
+        "format": FORMAT_VERSION,
+        "version": version,
+        "sources": _describe(sources),
+        "payload": payload,
+    }
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(snap, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_or_build(path, sources, version, build):
+    """Return the snapshot payload, recompiling with ``build()`` when stale.
+
+    A snapshot that cannot be written (e.g. read-only data directory) is not
+    an error: the freshly built payload is returned all the same.
+    """
+    payload, state = _read(path, sources, version)
+    if state == "fresh":
+        return payload
+    if payload is None:
+        payload = build()
+    try:
+        # also refreshes the recorded stats of touched-but-identical sources
+        write_snapshot(path, sources, version, payload)
+    except OSError:
+        pass
+    return payload
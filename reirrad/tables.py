@@ -0,0 +1,490 @@
+"""Static data tables for the radiotherapy planning tools.
+
+Everything here is a plain Python literal, so importing this module is cheap.
+The YAML-backed constraint catalogs live in :mod:`reirrad.catalog`.
+"""
+
+# ——— Common Data Definitions ———
+OARS = [
+    "Brain Stem", "Optic Nerve", "Optic Chiasm", "Cochlea",
+    "Small Bowel", "Spinal Cord", "Cauda Equina", "Sacral Plexus"
+]
+
+OAR_CONSTRAINTS = {
+    o: [{"type": "max", "value": v}]
+    for o, v in {
+        "Brain Stem": 54, "Optic Nerve": 54, "Optic Chiasm": 54,
+        "Cochlea": 45, "Small Bowel": 52, "Spinal Cord": 45,
+        "Cauda Equina": 45, "Sacral Plexus": 45
+    }.items()
+}
+
+OAR_ALPHA_BETA = {
+    o: (2 if o in [
+        "Spinal Cord", "Optic Chiasm", "Brain Stem",
+        "Optic Nerve", "Sacral Plexus", "Cauda Equina"
+    ] else 3)
+    for o in OARS
+}
+
+# Dose-response models of reirrad.radiobiology, and the transition dose per
+# fraction (Gy) above which LQ-L turns linear.  "default" covers organs
+# without their own value.  These are placeholders, not values from a
+# published normal-tissue fit; the app says so and lets users override them.
+DOSE_MODELS = {"lq": "LQ", "lql": "LQ-L"}
+OAR_TRANSITION_DOSE = {
+    "default":       6.0,
+    "Brain Stem":    6.0,
+    "Optic Nerve":   6.0,
+    "Optic Chiasm":  6.0,
+    "Cochlea":       6.0,
+    "Small Bowel":   8.0,
+    "Spinal Cord":   6.0,
+    "Cauda Equina":  6.0,
+    "Sacral Plexus": 6.0,
+}
+
+# Lyman–Kutcher–Burman NTCP parameters (reirrad.ntcp): volume effect n, slope
+# m and TD50 (Gy, EQD₂), from Burman et al. 1991's fits to the Emami 1991
+# tolerance data.  The Sacral Plexus borrows the brachial plexus fit; organs
+# missing here (Cochlea) need parameters passed explicitly.
+NTCP_PARAMETERS = {
+    "Brain Stem":    {"n": 0.16, "m": 0.14,  "td50": 65.0, "endpoint": "necrosis / infarction"},
+    "Optic Nerve":   {"n": 0.25, "m": 0.14,  "td50": 65.0, "endpoint": "blindness"},
+    "Optic Chiasm":  {"n": 0.25, "m": 0.14,  "td50": 65.0, "endpoint": "blindness"},
+    "Small Bowel":   {"n": 0.15, "m": 0.16,  "td50": 55.0, "endpoint": "obstruction / perforation"},
+    "Spinal Cord":   {"n": 0.05, "m": 0.175, "td50": 66.5, "endpoint": "myelitis / necrosis"},
+    "Cauda Equina":  {"n": 0.03, "m": 0.12,  "td50": 75.0, "endpoint": "nerve damage"},
+    "Sacral Plexus": {"n": 0.03, "m": 0.12,  "td50": 75.0, "endpoint": "plexopathy"},
+}
+
+# Organ-name synonyms for the cross-catalog search (reirrad.search).  Keys and
+# values are normalized names: lower case, singular, laterality and
+# "gland"/"muscle" dropped.
+ORGAN_ALIASES = {
+    "brain stem": "brainstem",
+    "bs": "brainstem",
+    "cord": "spinal cord",
+    "bowel small": "small bowel",
+    "bowel large": "large bowel",
+    "lumbo sacral plexus": "lumbosacral plexus",
+    "sacral plexus": "lumbosacral plexus",
+    "bone mandible": "mandible",
+    "chestwall": "chest wall",
+    "optic": "optic pathway",
+    "optic apparatus": "optic pathway",
+    "lad": "anterior descending artery",
+    "femoral head neck": "femoral head",
+    "constrictor": "pharyngeal constrictor",
+}
+# Structures whose side is part of the name (heart chambers), not the
+# laterality of a paired organ: the search keeps "left"/"right" on these.
+SIDED_STRUCTURES = frozenset({"ventricle", "atrium"})
+
+RECOVERY_FACTORS = {"<6 months": 0.00, "6–12 months": 0.25, "12+ months": 0.50}
+
+# Continuous recovery of a prior course's EQD₂ with the interval (months)
+# since it was given:  r(t) = r_max · (1 − exp(−(t − lag) / tau)) for t > lag.
+# A least-squares fit to the RECOVERY_FACTORS steps over 0–36 months with
+# r_max fixed at their 50 % plateau: 0 % up to 5 months, ~10 % at 6, ~30 %
+# at 9, ~40 % at 12 and ~48 % at 18.  It applies to every organ.
+RECOVERY_CURVE = {"r_max": 0.50, "lag": 5.0, "tau": 4.3}
+RECOVERY_TABLE_MONTHS = (0.0, 240.0, 0.1)  # start, stop, step of the tabulated curves
+FRACTION_OPTIONS = [1, 3, 5, 10]
+FRACTION_RANGE = (1, 40)  # default span of the multi-OAR regimen chart
+# Grid of the SBRT limit conversion tables (reirrad.conversion).
+SBRT_CONVERSION_FRACTIONS = tuple(range(1, 11))
+SBRT_CONVERSION_ALPHA_BETA = (1.0, 2.0, 3.0, 5.0, 10.0)
+EXCLUDE_3FX = {"Skin", "Cortical Bone", "Articular Cartilage"}
+
+# ——— 3D‑CRT Palliative Constraints ———
+# Raw text as transcribed; reirrad.catalog builds the normalized copy.
+THREED_CONSTRAINTS = {
+    "Head and Neck": [
+        {"OAR": "Brainstem",      "Preferred": "Max < 55 Gy",
+                                  "Acceptable": "Max 0.03 cc 60 Gy"},
+        {"OAR": "Optic Chiasm",   "Preferred": "Max < 54 Gy",
+                                  "Acceptable": "Max 0.03 cc 56 Gy"},
+        {"OAR": "Optic Nerve",    "Preferred": "Max < 50 Gy",
+                                  "Acceptable": "Max 0.03 cc 55 Gy"},
+        {"OAR": "Cochlea",        "Preferred": "V55 Gy < 5 %",
+                                  "Acceptable": "Mean < 45 Gy"},
+        {"OAR": "Retina",         "Preferred": "Max < 45 Gy",
+                                  "Acceptable": "Max < 50 Gy"},
+        {"OAR": "Lacrimal Gland", "Preferred": None,
+                                  "Acceptable": "Mean < 26 Gy"},
+        {"OAR": "Whole Brain",    "Preferred": None,
+                                  "Acceptable": "Minimize volume ≥ 30 Gy"},
+        {"OAR": "Esophagus",      "Preferred": None,
+                                  "Acceptable": "Mean < 30 Gy; no hot spots"},
+        {"OAR": "Parotid Glands", "Preferred": None,
+                                  "Acceptable": "Mean < 26 Gy; no hot spots"},
+        {"OAR": "Thyroid Gland",  "Preferred": None,
+                                  "Acceptable": "Mean < 37 Gy; no hot spots"},
+        {"OAR": "Oral Cavity",    "Preferred": None,
+                                  "Acceptable": "Minimize volume ≥ 30 Gy"},
+        {"OAR": "Spinal Cord",    "Preferred": None,
+                                  "Acceptable": "As low as possible; ≤ 105 % Rx"},
+        {"OAR": "Skin",           "Preferred": None,
+                                  "Acceptable": "Hot‑spot < 107 %"},
+        {"OAR": "Max Point Dose", "Preferred": "< 105 %",
+                                  "Acceptable": "< 108 %"},
+    ],
+
+    "Thorax": [
+        {"OAR": "Lungs",          "Preferred": "V5 Gy < 42 %",
+                                  "Acceptable": "V20 Gy < 37 %; Mean < 20 Gy"},
+        {"OAR": "Esophagus",      "Preferred": None,
+                                  "Acceptable": "Mean < 30 Gy; no hot spots"},
+        {"OAR": "Brachial Plexus","Preferred": None,
+                                  "Acceptable": "No hot spots"},
+        {"OAR": "Heart",          "Preferred": None,
+                                  "Acceptable": "V60 Gy < 33 %"},
+        {"OAR": "Great Vessels",  "Preferred": None,
+                                  "Acceptable": "No hot spots"},
+        {"OAR": "Trachea",        "Preferred": None,
+                                  "Acceptable": "Mean < 30 Gy"},
+        {"OAR": "Chest Wall",     "Preferred": None,
+                                  "Acceptable": "No hot spots"},
+        {"OAR": "Spinal Cord",    "Preferred": None,
+                                  "Acceptable": "As low as possible; ≤ 45 Gy"},
+        {"OAR": "Skin",           "Preferred": None,
+                                  "Acceptable": "Hot‑spot < 107 %"},
+        {"OAR": "Max Point Dose", "Preferred": "< 105 %",
+                                  "Acceptable": "< 108 %"},
+    ],
+
+    "Abdomen": [
+        {"OAR": "Small Bowel",   "Preferred": None,
+                                 "Acceptable": "As low as possible; Max 45 Gy or 105 % Rx"},
+        {"OAR": "Kidneys",       "Preferred": None,
+                                 "Acceptable": "Mean < 15 Gy (or < 9 Gy if solitary)"},
+        {"OAR": "Liver",         "Preferred": None,
+                                 "Acceptable": "As low as possible; 50 % < 30 Gy"},
+        {"OAR": "Stomach",       "Preferred": None,
+                                 "Acceptable": "As low as possible; 25 % < 45 Gy or 105 % Rx"},
+        {"OAR": "Esophagus",     "Preferred": None,
+                                 "Acceptable": "Mean < 34 Gy; V60 Gy < 10 cc"},
+        {"OAR": "Lungs",         "Preferred": None,
+                                 "Acceptable": "V5 Gy < 42 %; V20 Gy < 37 %; Mean < 20 Gy"},
+        {"OAR": "Spinal Cord",   "Preferred": None,
+                                 "Acceptable": "As low as possible; ≤ 45 Gy"},
+        {"OAR": "Skin",          "Preferred": None,
+                                 "Acceptable": "Hot‑spot < 107 %"},
+        {"OAR": "Max Point Dose","Preferred": "< 105 %",
+                                 "Acceptable": "< 108 %"},
+    ],
+
+    "Female Pelvis": [
+        {"OAR": "Reproductive Organs", "Preferred": None,
+                                       "Acceptable": "V20 Gy < 50 %"},
+        {"OAR": "Bladder",             "Preferred": None,
+                                       "Acceptable": "V50 Gy < 35 %; V45 Gy < 35 %"},
+        {"OAR": "Small Bowel",         "Preferred": None,
+                                       "Acceptable": "As low as possible"},
+        {"OAR": "Large Bowel",         "Preferred": None,
+                                       "Acceptable": "As low as possible"},
+        {"OAR": "Kidneys",             "Preferred": None,
+                                       "Acceptable": "Mean < 15 Gy (or < 9 Gy if solitary)"},
+        {"OAR": "Ureter",              "Preferred": None,
+                                       "Acceptable": "Dmax < 45 Gy (Stricture)"},
+        {"OAR": "Skin",                "Preferred": None,
+                                       "Acceptable": "Hot‑spot < 107 %"},
+        {"OAR": "Max Point Dose",      "Preferred": "< 105 %",
+                                       "Acceptable": "< 108 %"},
+    ],
+
+    "Male Pelvis": [
+        {"OAR": "Reproductive Organs", "Preferred": None,
+                                       "Acceptable": "D0.5 cc < 42 Gy"},
+        {"OAR": "Bladder",             "Preferred": None,
+                                       "Acceptable": "D0.5 cc < 28.2 Gy"},
+        {"OAR": "Small Bowel",         "Preferred": None,
+                                       "Acceptable": "As low as possible"},
+        {"OAR": "Large Bowel",         "Preferred": None,
+                                       "Acceptable": "As low as possible"},
+        {"OAR": "Kidneys",             "Preferred": None,
+                                       "Acceptable": "Mean < 15 Gy (or < 9 Gy if solitary)"},
+        {"OAR": "Ureter",              "Preferred": None,
+                                       "Acceptable": "Dmax < 45 Gy (Stricture)"},
+        {"OAR": "Skin",                "Preferred": None,
+                                       "Acceptable": "Hot‑spot < 107 %"},
+        {"OAR": "Max Point Dose",      "Preferred": "< 105 %",
+                                       "Acceptable": "< 108 %"},
+    ],
+
+    "Proximal Upper Extremity": [
+        {"OAR": "Brachial Plexus", "Preferred": None,
+                                   "Acceptable": "No hot spots"},
+        {"OAR": "Skin",            "Preferred": None,
+                                   "Acceptable": "No slices 100 % circumf.; Hot‑spot < 107 %"},
+        {"OAR": "Max Point Dose",  "Preferred": "< 105 %",
+                                   "Acceptable": "< 108 %"},
+    ],
+
+    "Distal Upper Extremity": [
+        {"OAR": "Skin",           "Preferred": None,
+                                  "Acceptable": "No slices 100 % circumf.; Hot‑spot < 107 %"},
+        {"OAR": "Max Point Dose", "Preferred": "< 105 %",
+                                  "Acceptable": "< 108 %"},
+    ],
+
+    "Proximal Lower Extremity": [
+        {"OAR": "Skin",           "Preferred": None,
+                                  "Acceptable": "No slices 100 % circumf.; Hot‑spot < 107 %"},
+        {"OAR": "Max Point Dose", "Preferred": "< 105 %",
+                                  "Acceptable": "< 108 %"},
+    ],
+
+    "Distal Lower Extremity": [
+        {"OAR": "Skin",           "Preferred": None,
+                                  "Acceptable": "No slices 100 % circumf.; Hot‑spot < 107 %"},
+        {"OAR": "Max Point Dose", "Preferred": "< 105 %",
+                                  "Acceptable": "< 108 %"},
+    ]
+}
+
+# ——— SBRT Constraints (intracranial + body) ———
+SBRT_INTRACRANIAL = [
+    {"OAR": "Optic Pathway", "Metric": "D0.1cc",
+     "3fx_opt": None, "3fx_man": 15, "5fx_opt": None, "5fx_man": 22.5,
+     "Endpoint": "Optic Neuritis"},
+    {"OAR": "Cochlea", "Metric": "Dmean",
+     "3fx_opt": None, "3fx_man": 17.1, "5fx_opt": None, "5fx_man": 25,
+     "Endpoint": "Hearing Loss"},
+    {"OAR": "Brainstem", "Metric": "D0.1cc",
+     "3fx_opt": 18, "3fx_man": 23.1, "5fx_opt": 23, "5fx_man": 31,
+     "Endpoint": "Cranial Neuropathy"},
+    {"OAR": "Spinal Canal", "Metric": "D0.1cc",
+     "3fx_opt": 18, "3fx_man": 21.9, "5fx_opt": 23, "5fx_man": 30,
+     "Endpoint": "Myelitis"},
+]
+skin_entry = {
+    "OAR": "Skin",
+    "Metric": "D0.03 cc / V20 Gy",
+    "3fx_opt": None, "3fx_man": None,
+    "5fx_opt": None, "5fx_man": "Dmax ≤ 35 Gy; V20 Gy < 10 cc",
+    "Endpoint": "Ulceration"
+}
+SBRT_INTRACRANIAL.append(skin_entry)
+
+SBRT_BODY = [
+    {"OAR": "Brachial Plexus", "Metric": "D0.5cc",
+     "3fx_opt": 24, "3fx_man": 26, "5fx_opt": 27, "5fx_man": 29,
+     "Endpoint": "Neuropathy"},
+    {"OAR": "Heart", "Metric": "D0.5cc",
+     "3fx_opt": 24, "3fx_man": 26, "5fx_opt": 27, "5fx_man": 29,
+     "Endpoint": "Pericarditis"},
+    {"OAR": "Great Vessels", "Metric": "D0.5cc",
+     "3fx_opt": None, "3fx_man": 45, "5fx_opt": None, "5fx_man": 53,
+     "Endpoint": "Aneurysm"},
+    {"OAR": "Trachea", "Metric": "D0.5cc",
+     "3fx_opt": 30, "3fx_man": 32, "5fx_opt": 32, "5fx_man": 35,
+     "Endpoint": "Stenosis / Fistula"},
+    {"OAR": "Chest Wall", "Metric": "D0.5cc",
+     "3fx_opt": 37, "3fx_man": 30, "5fx_opt": 39, "5fx_man": 32,
+     "Endpoint": "Pain / Fracture"},
+    {"OAR": "Lungs", "Metric": "V20 Gy",
+     "3fx_opt": None, "3fx_man": "10%", "5fx_opt": None, "5fx_man": "10%",
+     "Endpoint": "Pneumonitis"},
+    {"OAR": "Esophagus", "Metric": "D0.5cc",
+     "3fx_opt": None, "3fx_man": 25.2, "5fx_opt": 32, "5fx_man": 34,
+     "Endpoint": "Stenosis / Fistula"},
+    {"OAR": "Stomach", "Metric": "D5cc",
+     "3fx_opt": None, "3fx_man": 16.5, "5fx_opt": 25, "5fx_man": 12,
+     "Endpoint": "Ulceration / Fistula"},
+    {"OAR": "Duodenum", "Metric": "D5cc",
+     "3fx_opt": None, "3fx_man": 16.5, "5fx_opt": 25, "5fx_man": None,
+     "Endpoint": "Ulceration"},
+    {"OAR": "Small Bowel", "Metric": "D0.5cc",
+     "3fx_opt": None, "3fx_man": 25.2, "5fx_opt": 30, "5fx_man": 35,
+     "Endpoint": "Enteritis / Obstruction"},
+    {"OAR": "Large Bowel", "Metric": "D0.5cc",
+     "3fx_opt": None, "3fx_man": 28.2, "5fx_opt": None, "5fx_man": 32,
+     "Endpoint": "Colitis / Fistula"},
+    {"OAR": "Rectum", "Metric": "D0.5cc",
+     "3fx_opt": None, "3fx_man": 28.2, "5fx_opt": None, "5fx_man": 32,
+     "Endpoint": "Proctitis / Fistula"},
+    {"OAR": "Cauda Equina", "Metric": "D0.1cc",
+     "3fx_opt": 16, "3fx_man": 14, "5fx_opt": 32, "5fx_man": 30,
+     "Endpoint": "Neuritis"},
+    {"OAR": "Lumbosacral Plexus", "Metric": "D0.03 cc",
+     "3fx_opt": None, "3fx_man": None, "5fx_opt": None,
+     "5fx_man": "Dmax ≤ 30 Gy", "Endpoint": "Plexopathy"},
+    {"OAR": "Cortical Bone", "Metric": "V25 Gy/V30 Gy",
+     "3fx_opt": None, "3fx_man": None, "5fx_opt": None,
+     "5fx_man": "V25 < 50 %; V30 < 35 %", "Endpoint": "Fracture"},
+    {"OAR": "Articular Cartilage", "Metric": "Dmax",
+     "3fx_opt": None, "3fx_man": None, "5fx_opt": None,
+     "5fx_man": "Dmax ≤ 35 Gy", "Endpoint": "Joint Integrity"},
+    {"OAR": "Ureter", "Metric": "Dmax",
+     "3fx_opt": None, "3fx_man": 40, "5fx_opt": None, "5fx_man": 45,
+     "Endpoint": "Stricture"},
+]
+SBRT_BODY.append(skin_entry)
+
+SBRT_CONSTRAINTS = {
+    "Head and Neck": (
+        SBRT_INTRACRANIAL +
+        [r for r in SBRT_BODY if r["OAR"] in ("Esophagus", "Brachial Plexus")]
+    ),
+    "Thorax": (
+        [r for r in SBRT_INTRACRANIAL if r["OAR"] == "Spinal Canal"] +
+        [r for r in SBRT_BODY if r["OAR"] in (
+            "Lungs", "Esophagus", "Brachial Plexus",
+            "Heart", "Great Vessels", "Trachea", "Chest Wall")]
+    ),
+    "Abdomen": (
+        [r for r in SBRT_INTRACRANIAL if r["OAR"] == "Spinal Canal"] +
+        [r for r in SBRT_BODY if r["OAR"] in (
+            "Stomach", "Duodenum", "Small Bowel", "Large Bowel",
+            "Kidneys", "Ureter", "Cauda Equina", "Lumbosacral Plexus")]
+    ),
+    "Pelvis": [
+        r for r in SBRT_BODY if r["OAR"] in (
+            "Skin",
+            "Ureter",
+            "Lumbosacral Plexus",
+            "Cauda Equina",
+            "Rectum",
+            "Large Bowel",
+            "Small Bowel"
+        )
+    ],
+
+    "Proximal Upper Extremity": (
+        [r for r in SBRT_BODY if r["OAR"] == "Brachial Plexus"] +
+        [skin_entry] +
+        [r for r in SBRT_BODY if r["OAR"] in ("Cortical Bone", "Articular Cartilage")]
+    ),
+    "Distal Upper Extremity": (
+        [skin_entry] +
+        [r for r in SBRT_BODY if r["OAR"] in ("Cortical Bone", "Articular Cartilage")]
+    ),
+    "Proximal Lower Extremity": (
+        [skin_entry] +
+        [r for r in SBRT_BODY if r["OAR"] in (
+            "Cortical Bone", "Articular Cartilage", "Lumbosacral Plexus")]
+    ),
+    "Distal Lower Extremity": (
+        [skin_entry] +
+        [r for r in SBRT_BODY if r["OAR"] in ("Cortical Bone", "Articular Cartilage")]
+    ),
+}
+
+# ——— Constraint catalog settings ———
+# UI label → (YAML file, top-level key or None for the whole document)
+SETTING_SOURCES = {
+    "General (Adult)":                      ("CORSAIR_TG101.yaml", None),
+    "Experimental CORSAIR OARs":            ("Experimental_Dose_Constraints.yaml",
+                                             "Experimental_Dose_Constraints"),
+    "Hodgkin’s Lymphoma":                   ("Experimental_Dose_Constraints.yaml",
+                                             "Hodgkin_Lymphoma_Dose_Constraints"),
+    "Hypofractionated Breast Radiotherapy": ("Experimental_Dose_Constraints.yaml",
+                                             "Hypofractionated_Breast_Constraints"),
+    "Pediatric Radiotherapy":               ("Experimental_Dose_Constraints.yaml",
+                                             "Pediatric_Dose_Constraints"),
+}
+
+# plain-text bibliography backing the reference store
+REFERENCES_SOURCE = "References.yaml"
+
+# site planning protocols checked by reirrad.protocols
+PROTOCOLS_SOURCE = "planning_protocols.yaml"
+
+SCHEME_LABELS = {
+    "conventional":               "Conventional",
+    "1_fraction":                 "1 Fraction",
+    "3_fraction":                 "3 Fractions",
+    "5_fraction":                 "5 Fractions",
+    "8_fraction":                 "8 Fractions",
+    "moderate_hypofractionation": "Moderate hypofractionation",
+    "ultra_hypofractionation":    "Ultra‑hypofractionation",
+}
+
+# ——— REFERENCES DICTIONARY ———
+# cleaned to “LastName et al.” style; fallback for IDs not in References.yaml
+REFERENCES = {
+    1:  'Rubin & Casarett. "Clinical radiation pathology as applied to curative radiotherapy." Front Radiat. Ther. Oncol. 1968, 22, 767–778.',
+    2:  'Emami et al. "Tolerance of Normal Tissue to Therapeutic Irradiation." Int. J. Radiat. Oncol. Biol. Phys. 1991, 21, 109–122.',
+    3:  'Marks et al. "Guest Editor’s Introduction to QUANTEC: A Users Guide." Int. J. Radiat. Oncol. Biol. Phys. 2010, 76, S1–S2.',
+    4:  'Bentzen et al. "Quantitative Analyses of Normal Tissue Effects in the Clinic (QUANTEC): An Introduction to the Scientific Issues." Int. J. Radiat. Oncol. Biol. Phys. 2010, 76, S3–S9.',
+    5:  'Marks et al. "Use of Normal Tissue Complication Probability Models in the Clinic." Int. J. Radiat. Oncol. Biol. Phys. 2010, 76, S10–S19.',
+    6:  'Diez et al. "UK 2022 Consensus on Normal Tissue Dose–Volume Constraints for Oligometastatic, Primary Lung and Hepatocellular Carcinoma SABR." Clin. Oncol. 2022, 34, 288–300.',
+    7:  'Hanna et al. "UK Consensus on Normal Tissue Dose Constraints for Stereotactic Radiotherapy." Clin. Oncol. 2018, 30, 5–14.',
+    8:  'Benedict et al. "Stereotactic Body Radiation Therapy: The Report of AAPM Task Group 101." Med. Phys. 2010, 37, 4078–4101.',
+    9:  'Milano et al. "Single‑ and Multifraction Stereotactic Radiosurgery Dose/Volume Tolerances of the Brain." Int. J. Radiat. Oncol. Biol. Phys. 2021, 110, 68–86.',
+    10: 'Grimm et al. "Dose Tolerance Limits and Dose–Volume Histogram Evaluation for Stereotactic Body Radiotherapy." J. Appl. Clin. Med. Phys. 2011, 12, 267–292.',
+    11: 'NCCN Guidelines et al. "NCCN Clinical Practice Guidelines in Oncology—Hodgkin Lymphoma. Version 1.2023."',
+    13: 'Coles et al. "Partial‑Breast Radiotherapy after Breast Conservation Surgery (UK IMPORT LOW): 5‑Year Results." Lancet 2017, 390, 1048–1060.',
+    14: 'Meattini et al. "APBI‑IMRT‑Florence Trial: Accelerated Partial‑Breast vs Whole‑Breast Irradiation: Long‑Term Results." J. Clin. Oncol. 2020, 38, 4175–4183.',
+    15: 'Murray Brunt et al. "FAST‑Forward Trial: 1 Week vs 3 Weeks Hypofractionation." Lancet 2020, 395, 1613–1626.',
+    16: 'Palmer et al. "Late Effects of Radiation Therapy in Pediatric Patients and Survivorship." Pediatr. Blood Cancer 2021, 68, e28349.',
+    17: 'Milano et al. "Primary Hypothyroidism in Childhood Cancer Survivors Treated With Radiation Therapy: A PENTEC Review." Int. J. Radiat. Oncol. Biol. Phys. 2021.',
+    18: 'Mahajan et al. "Neurocognitive Effects and Necrosis in Childhood Cancer Survivors: A PENTEC Review." Int. J. Radiat. Oncol. Biol. Phys. 2021.',
+    20: 'Milgrom et al. "Salivary and Dental Complications in Childhood Cancer Survivors: A PENTEC Review." Int. J. Radiat. Oncol. Biol. Phys. 2021.',
+    21: 'Hodgson et al. "ILROG Guidelines for Pediatric Hodgkin Lymphoma RT Planning." Pract. Radiat. Oncol. 2015, 5, 85–92.',
+    22: 'Reis et al. "SBRT of Ventricular Tachycardia Using 4π Optimized Trajectories." J. Appl. Clin. Med. Phys. 2021, 22, 72–86.',
+    23: 'Blanck et al. "RAVENTA Trial: Feasibility of Radiosurgery for Ventricular Tachycardia." Clin. Res. Cardiol. 2020, 109, 1319–1332.',
+    24: 'Chiu et al. "Review of Stereotactic Arrhythmia Radioablation Therapy for Cardiac Tachydysrhythmias." CJC Open 2021, 3, 236–247.',
+    25: 'NCCN Guidelines et al. "Non‑Small Cell Lung Cancer v5.2022."',
+    26: 'NCCN Guidelines et al. "Esophageal and Esophagogastric Junction Cancers v4.2022."',
+    28: 'NCCN Guidelines et al. "Anal Cancer v2.2022."',
+    30: 'Dapper et al. "Impact of VMAT‑IMRT vs 3D‑CRT on Anal Sphincter Dose in Rectal Cancer." Radiat. Oncol. 2018, 13, 237.',
+    31: 'Jadon et al. "Systematic Review of Dose–Volume Predictors for Late Bowel Toxicity." Radiat. Oncol. 2019, 14, 1–14.',
+    32: 'Peng et al. "Dose–Volume Analysis of Predictors for Acute Anal Toxicity in Prostate Cancer." Radiat. Oncol. 2019, 14, 1–9.',
+    33: 'Atkins et al. "Association of LAD Coronary Dose with Cardiac Events in NSCLC." JAMA Oncol. 2021, 7, 206–219.',
+    34: 'Brodin & Tomé. "Revisiting Dose Constraints for Head & Neck OARs in IMRT Era." Oral Oncol. 2018, 86, 8–18.',
+    35: 'Merlotti et al. "Technical Guidelines for H&N IMRT (AIRO‑HN WG)." Radiat. Oncol. 2014, 9, 264.',
+    36: 'Brunner et al. "ESTRO ACROP Guidelines for CTV Delineation in Pancreatic Cancer." Radiother. Oncol. 2021, 154, 60–69.',
+    37: 'Eekers et al. "EPTN Consensus Atlas for CT/MR Contouring in Neuro‑Oncology." Radiother. Oncol. 2018, 128, 37–43.',
+    38: 'Inoue et al. "Three‑Fraction CyberKnife RT for Brain Mets (V14)." J. Radiat. Res. 2013, 54, 727–735.',
+    39: 'Niyazi et al. "ESTRO‑ACROP Guideline: Target Delineation of Glioblastomas." Radiother. Oncol. 2016, 118, 35–42.',
+    40: 'Scoccianti et al. "OARs in the Brain & Their Dose Constraints in Adults & Children." Radiother. Oncol. 2015, 114, 230–238.',
+    41: 'Li et al. "Dosimetric Analysis of Dysphagia & G‑Tube Dependence in H&N IMRT+Chemo." Radiat. Oncol. 2009, 4, 52.',
+    42: 'Basu & Bhaskar. "Overview of Important OARs in H&N Cancer RT." In Cancer Survivorship, IntechOpen 2019.',
+    43: 'Lambrecht et al. "Dose Constraints for OARs in Neuro‑Oncology: EPTN Consensus." Radiother. Oncol. 2018, 128, 26–36.',
+    44: 'Gondi et al. "Hippocampal Dosimetry Predicts Neurocognitive Decline after SRS." Int. J. Radiat. Oncol. Biol. Phys. 2013, 85, 348–354.',
+    45: 'Brown et al. "Hippocampal Avoidance WBRT+Memantine for Brain Mets: NRG CC001." J. Clin. Oncol. 2020, 38, 1019–1029.',
+    46: 'Pinkham et al. "Hippocampal‑Sparing RT: New Standard for Grade II/III Gliomas?" J. Clin. Neurosci. 2014, 21, 86–90.',
+    47: 'Goodman et al. "RTOG Consensus Guidelines: CTV Delineation Postop Pancreatic Head Cancer." Int. J. Radiat. Oncol. Biol. Phys. 2012, 83, 901–908.',
+    48: 'Yeoh et al. "Pudendal Nerve Injury Impairs Anorectal Function ≥2 Years Post‑3D‑CRT for Prostate Ca." Acta Oncol. 2018, 57, 456–464.',
+    49: 'Kovtun et al. "Ovary‑Sparing RT Techniques for Buttock/Thigh Sarcoma." Sarcoma 2017, 2017, 2796925.',
+    50: 'Vyfhuis et al. "Preserving Endocrine Function in Premenopausal Women Receiving Whole‑Pelvis RT." Int. J. Part. Ther. 2019, 6, 10–17.',
+    51: 'Du & Qu. "Relationship between Ovarian Function and Dose Post‑Transposition in Young Cervical Ca." Cancer Med. 2017, 6, 508–515.',
+    52: 'Polanowski et al. "Analysis of Pancreatic Dose during Gastric Ca RT." Radiother. Oncol. 2020, 151, 20–23.',
+    53: 'Gemici et al. "Volumetric Decrease of Pancreas after Abdominal Irradiation." Radiat. Oncol. 2018, 13, 238.',
+    54: 'Palmisciano et al. "SBRT in Non‑Operable Lung Ca Patients." Clin. Transl. Oncol. 2016, 18, 1158–1159.',
+    55: 'Uehara et al. "Feasibility of VMAT with Halcyon™ for Total Body Irradiation." Radiat. Oncol. 2021, 16, 236.',
+    56: 'De Felice et al. "Radiation Effects on Male Fertility." Andrology 2019, 7, 2–7.',
+    57: 'Hoskin et al. "GEC/ESTRO Recommendations on HDR Afterloading Brachytherapy for Prostate Ca: Update." Radiother. Oncol. 2013, 107, 325–332.',
+    58: 'Henry et al. "GEC‑ESTRO ACROP Prostate Brachytherapy Guidelines." Radiother. Oncol. 2022, 167, 244–251.',
+    59: 'Susan. "Anatomy: The Anatomical Basis of Clinical Practice, 2nd ed." Elsevier 2020.',
+    60: 'Feng et al. "Development and Validation of a Heart Atlas for Breast Ca RT." Int. J. Radiat. Oncol. Biol. Phys. 2011, 79, 10–18.',
+    61: 'Duane et al. "A Cardiac Contouring Atlas for Radiotherapy." Radiother. Oncol. 2017, 122, 416–422.',
+    68: 'Mell et al. "Dosimetric Predictors of Acute Hematologic Toxicity in Cervical Cancer Patients Treated with Concurrent Cisplatin and Intensity-Modulated Pelvic Radiotherapy." Int. J. Radiat. Oncol. Biol. Phys. 2006;66:1356–1365.',
+    99: 'Bisello et al. “Supplementary Table S1: Emerging OARs.” Curr. Oncol. 2022.',
+    100: 'Cacciola A et al. "IMRT Does Not Induce Volumetric Changes of the Bichat Fat Pad in NPC." Strahlenther Onkol. 2022;198:1‑6.',
+    101: 'Li N et al. "Dose‑Volume Parameters & Acute Bone‑Marrow Suppression in Rectal CRT." Oncotarget 2017;8:92904‑92913.',
+    102: 'Bazan JG et al. "NTCP Modeling of Acute Hematologic Toxicity in Anal‑Canal IMRT." Int J Radiat Oncol Biol Phys 2012;84:700‑706.',
+    103: 'Gortzak Y et al. "Fracture Risk of Femur After Combined Modality Tx of Thigh STS." Cancer 2010;116:1553‑1559.',
+    104: 'Holt GE et al. "Fractures after RT & Limb‑Salvage Surgery for LE STS: High vs Low Dose." J Bone Joint Surg 2005;87:315‑319.',
+    105: 'Pai HH et al. "Hypothalamic/Pituitary Function After High‑Dose Conformal RT to Skull Base." Int J Radiat Oncol Biol Phys 2001;49:1079‑1092.',
+    106: 'Murakami N et al. "Vaginal Tolerance of CT‑Based Image‑Guided HDR Interstitial BT." Radiat Oncol 2014;9:31.',
+    107: 'Kirchheiner K et al. "Risk of Vaginal Stenosis After IG‑BT for LACC (EMBRACE)." Radiother Oncol 2016;118:160‑166.',
+    108: 'Wirth A et al. "ISRT in Adult Lymphomas—ILROG Overview." Int J Radiat Oncol Biol Phys 2020;107:909‑933.',
+    109: 'Ferini G et al. "Predictors for DIBH 3D‑CRT Dosimetric Benefit in Left Breast Ca." Anticancer Res 2021;41:1529‑1538.',
+    110: 'Thomsen MS et al. "Dose Constraints for Whole‑Breast RT: Danish DBCG HYPO Trial." Clin Transl Radiat Oncol 2021;28:118‑123.',
+    111: 'Tolia M. "Contralateral Breast Dose in Accelerated Hypofractionated RT." World J Radiol 2011;3:233‑240.',
+    112: 'Rudra S et al. "Effect of RTOG Breast/Chest‑Wall Guidelines on DVH Parameters." J Appl Clin Med Phys 2014;15:127‑137.',
+    113: 'Noël G, Antoni D. "Organs at Risk Radiation Dose Constraints." Cancer Radiother 2022;26:59‑75.',
+    114: 'De Rose F et al. "Hypofractionated VMAT for Early Breast Ca: 2‑Year Results." Radiat Oncol 2016;11:120.',
+    115: 'Rice L et al. "DIBH Technique for Left‑Breast Ca: Impact on OARs." Breast Cancer (Targets Ther) 2017;9:437‑446.',
+    116: 'Gentile MS et al. "Brainstem Injury in Peds P‑Fossa Tumors Treated with PBT." Int J Radiat Oncol Biol Phys 2018;100:719‑729.',
+    117: 'Shrestha S et al. "Cardiac Disease Risk in Childhood Cancer Survivors: Updated Dosimetry." Radiother Oncol 2021;163:199‑208.',
+    118: 'Hol ML et al. "Early Orbital Bone Changes After RT for RMS." Pract Radiat Oncol 2020;10:53‑58.',
+    119: 'Arunagiri N et al. "Spleen as OAR in Paediatric RT: SIOP‑Europe Report." Eur J Cancer 2021;143:1‑10.',
+    120: 'Weil BR et al. "Late Infection Mortality in Asplenic Childhood Cancer Survivors." J Clin Oncol 2018;36:1571‑1578.',
+    121: 'Romano E et al. "Dose/Volume Effects for Anorectal Morbidity in Paediatric Pelvic RT." Int J Radiat Oncol Biol Phys 2021;109:231‑241.',
+    122: 'Solan AN et al. "RT for Patients with Pacemakers / ICDs." Int J Radiat Oncol Biol Phys 2004;59:897‑904.',
+}
@@ -0,0 +1,119 @@
+"""Monte Carlo uncertainty for the remaining-room and iso-effective calculations.
+
+Uncertain inputs are given as distribution specs instead of numbers:
+
+* a plain number — fixed;
+* ``("normal", mean, sd)``;
+* ``("lognormal", median, sigma)`` — ``sigma`` of the underlying normal,
+  roughly the relative SD for small values; the natural choice for α/β,
+  α and T_d, which must stay positive;
+* ``("uniform", lo, hi)``;
+* ``("triangular", lo, mode, hi)``.
+
+Samples are drawn from a seeded :func:`numpy.random.default_rng`, so the same
+seed and sample count always give the same result, and are pushed through
+the kernels in fixed-size batches to bound the temporaries at 10⁶ samples.
+"""
+import numpy as np
+
+from .radiobiology import (
+    bed_array, eqd2_array, iso_effective_dose_array, max_d_per_fraction_array,
+)
+from .tables import FRACTION_OPTIONS
+
+PERCENTILES = (5, 25, 50, 75, 95)
+BATCH = 1 << 17
+
+
+def sample(rng, spec, size):
+    """Draw ``size`` values for a distribution spec (see module docstring)."""
+    if not isinstance(spec, (tuple, list)):
+        return np.full(size, float(spec))
+    kind, *params = spec
+    if kind == "normal":
+        return rng.normal(params[0], params[1], size)
+    if kind == "lognormal":
+        return params[0] * np.exp(rng.normal(0.0, params[1], size))
+    if kind == "uniform":
+        return rng.uniform(params[0], params[1], size)
+    if kind == "triangular":
+        if params[0] == params[2]:  # NumPy rejects a zero-width triangle
+            return np.full(size, float(params[1]))
+        return rng.triangular(params[0], params[1], params[2], size)
+    raise ValueError(f"unknown distribution {kind!r}")
+
+
+def _batches(n_samples):
+    done = 0
+    while done < n_samples:
+        size = min(BATCH, n_samples - done)
+        yield size
+        done += size
+
+
+def remaining_room_mc(courses, ab, limit, n_samples=100_000, seed=0,
+                      fraction_options=FRACTION_OPTIONS, model="lq", d_t=None):
+    """Sample the Tab 1 report for one OAR.
+
+    ``courses`` are {"dose", "fractions", "recovery"} dicts as for
+    :func:`reirrad.reirradiation.reirradiation_report`; ``recovery`` and
+    ``ab`` may be distribution specs.  Recovery is clipped to 0–1 and α/β to
+    stay positive; ``model`` and ``d_t`` select the dose-response model as
+    for the report.  Returns arrays of samples: ``eff``, ``left`` and
+    ``d_per_fx`` (shape ``(n_samples, len(fraction_options))``).
+    """
+    rng = np.random.default_rng(seed)
+    options = np.asarray(fraction_options, dtype=float)
+    eff_parts, left_parts, d_parts = [], [], []
+    for size in _batches(n_samples):
+        a = np.maximum(sample(rng, ab, size), 1e-3)
+        eff = np.zeros(size)
+        for c in courses:
+            rec = np.clip(sample(rng, c["recovery"], size), 0.0, 1.0)
+            eq = eqd2_array(c["fractions"], c["dose"] / c["fractions"], a, model, d_t)
+            eff += eq * (1 - rec)
+        left = np.maximum(limit - eff, 0.0)
+        eff_parts.append(eff)
+        left_parts.append(left)
+        d_parts.append(max_d_per_fraction_array(options[None, :], left[:, None],
+                                                a[:, None], model, d_t))
+    return {
+        "eff": np.concatenate(eff_parts),
+        "left": np.concatenate(left_parts),
+        "d_per_fx": np.concatenate(d_parts),
+    }
+
+
+def iso_effective_mc(n1, d1, T1, n2, T2, ab, alpha, Td, Tk=0, n_samples=100_000, seed=0):
+    """Sample the Tab 4 iso-effective solution.
+
+    The baseline BED (``n1`` × ``d1`` Gy over ``T1`` days) is recomputed for
+    every sample, then solved for ``n2`` fractions over ``T2`` days.  ``ab``,
+    ``alpha`` and ``Td`` may be distribution specs.  Returns arrays of
+    samples: ``BED``, ``d_per_fx``, ``total`` and ``R``.
+    """
+    rng = np.random.default_rng(seed)
+    parts = {"BED": [], "d_per_fx": [], "total": [], "R": []}
+    for size in _batches(n_samples):
+        a = np.maximum(sample(rng, ab, size), 1e-3)
+        al = np.maximum(sample(rng, alpha, size), 1e-3)
+        td = np.maximum(sample(rng, Td, size), 1e-3)
+        repop = (np.log(2) / al) * max(T1 - Tk, 0) / td
+        goal = bed_array(n1, d1, a) - repop
+        d2, total, R2 = iso_effective_dose_array(n2, T2, a, al, td, goal, Tk)
+        for key, value in (("BED", goal), ("d_per_fx", d2), ("total", total), ("R", R2)):
+            parts[key].append(value)
+    return {k: np.concatenate(v) for k, v in parts.items()}
+
+
+def percentiles(samples, qs=PERCENTILES):
+    """{q: value} for each percentile ``q`` (along the first axis)."""
+    values = np.percentile(samples, qs, axis=0)
+    return dict(zip(qs, values))
+
+
+def prob_above(samples, thresholds):
+    """P(sample > x) for each threshold ``x`` (a scalar or array)."""
+    s = np.sort(np.asarray(samples).ravel())
+    x = np.asarray(thresholds, dtype=float)
+    return 1.0 - np.searchsorted(s, x, side="right") / s.size
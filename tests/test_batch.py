@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+import sys
+
+from reirrad import batch
+
+
+def _errors(text, **kwargs):
+    dst = io.StringIO()
+    batch.run(io.StringIO("patient,oar,ab,limit,courses\n" + text), dst, **kwargs)
+    return [row[-1] for row in csv.reader(io.StringIO(dst.getvalue()))][1:]
+
+
+def test_bad_doses_are_rejected_by_row():
+    errors = _errors("a,Spinal Cord,2,50,30/10/0.2\n"
+                     "b,Spinal Cord,2,50,nan/10/0.2\n"
+                     "c,Spinal Cord,2,50,-5/10/0.2\n"
+                     "d,Spinal Cord,2,-1,30/10/0.2\n")
+    assert errors[0] == ""
+    assert errors[1].startswith("row 2: dose must be a finite number")
+    assert errors[2] == "row 3: dose must be non-negative, got -5.0"
+    assert errors[3] == "row 4: limit must be non-negative, got -1.0"
+
+
+def test_row_numbers_span_chunks():
+    rows = "".join(f"p{i},Spinal Cord,2,50,30/10/x\n" for i in range(5))
+    errors = _errors(rows, chunk_size=2)
+    assert [e.split(":")[0] for e in errors] == [f"row {i}" for i in range(1, 6)]
+
+
+def test_jsonl_bad_lines_are_row_errors():
+    good = {"patient": "a", "oar": "Spinal Cord", "ab": 2, "limit": 50,
+            "courses": [{"dose": 30, "fractions": 10, "recovery": 0.2}]}
+    src = io.StringIO("\n".join([json.dumps(good), "[1, 2]", "{not json", "7",
+                                 json.dumps(good)]) + "\n")
+    dst = io.StringIO()
+    assert batch.run(src, dst, in_format="jsonl", out_format="jsonl") == (5, 3)
+    errors = [json.loads(line)["error"] for line in dst.getvalue().splitlines()]
+    assert errors[0] == errors[4] == ""
+    assert errors[1] == "row 2: expected a JSON object, got list"
+    assert errors[2].startswith("row 3: invalid JSON")
+    assert errors[3] == "row 4: expected a JSON object, got int"
+
+
+def test_stdin_is_left_open(monkeypatch, tmp_path):
+    stdin = io.TextIOWrapper(io.BytesIO(b"patient,oar,ab,limit,courses\na,Spinal Cord,2,50,30/10/0\n"))
+    monkeypatch.setattr(sys, "stdin", stdin)
+    assert batch.main(["-", "-o", str(tmp_path / "out.csv"), "--workers", "1"]) == 0
+    assert not stdin.closed and not stdin.buffer.closed
+    assert len((tmp_path / "out.csv").read_text().splitlines()) == 2
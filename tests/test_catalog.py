@@ -0,0 +1,56 @@
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from reirrad.catalog import Entry, freeze, load_catalog
+
+
+def _first(mapping):
+    return next(iter(mapping.values()))
+
+
+def test_catalog_is_shared():
+    assert load_catalog() is load_catalog()
+
+
+def test_mutating_the_catalog_raises():
+    catalog = load_catalog()
+    settings = catalog["settings"]
+    organs = _first(settings)
+    entries = _first(_first(organs))
+    with pytest.raises(TypeError):
+        catalog["settings"] = {}
+    with pytest.raises(TypeError):
+        settings["New"] = {}
+    with pytest.raises(TypeError):
+        del organs[next(iter(organs))]
+    with pytest.raises(AttributeError):
+        entries.append(Entry("Dmax < 1 Gy"))
+    with pytest.raises(AttributeError):
+        entries[0].constraint = "Dmax < 99 Gy"
+    with pytest.raises(AttributeError):
+        del entries[0].source
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        catalog["index"].records[0].limit = 99.0
+    with pytest.raises(TypeError):
+        _first(catalog["threed"])["x"] = 1
+
+
+def test_entry_reads_like_a_mapping():
+    e = Entry("Dmean < 40 Gy", "CORSAIR [30]")
+    assert e["constraint"] == "Dmean < 40 Gy" and e.get("source") == "CORSAIR [30]"
+    assert e.get("category", "none") == "none"
+    with pytest.raises(KeyError):
+        e["dose"]
+    back = pickle.loads(pickle.dumps(e))
+    assert (back.constraint, back.source, back.category) == ("Dmean < 40 Gy", "CORSAIR [30]", None)
+    assert copy.copy(e).constraint == e.constraint
+
+
+def test_freeze():
+    frozen = freeze({"a": [1, {"b": [2]}], "c": "text"})
+    assert frozen["a"] == (1, {"b": (2,)})
+    with pytest.raises(TypeError):
+        frozen["a"][1]["b"] = ()
@@ -0,0 +1,43 @@
+import pytest
+
+from reirrad.constraints import parse_constraint
+
+
+def test_bare_limit_takes_bare_metric():
+    (fields,) = parse_constraint("As low as possible; ≤ 45 Gy", bare_metric="Dmax")
+    assert (fields["metric"], fields["comparator"], fields["limit"], fields["unit"]) == \
+        ("Dmax", "≤", 45.0, "Gy")
+    assert fields["note"] == "As low as possible"
+
+
+def test_hot_spot_reads_as_dmax():
+    (fields,) = parse_constraint("Hot‑spot < 107 %", bare_metric="Dmax")
+    assert (fields["metric"], fields["limit"], fields["unit"]) == ("Dmax", 107.0, "%")
+
+
+def test_note_only_part_joins_previous_record():
+    (fields,) = parse_constraint("Mean < 30 Gy; no hot spots")
+    assert (fields["metric"], fields["limit"]) == ("Dmean", 30.0)
+    assert fields["note"] == "no hot spots"
+
+
+def test_qualitative_text_stays_one_record():
+    (fields,) = parse_constraint("No hot spots", bare_metric="Dmax")
+    assert fields["metric"] == "other" and fields["limit"] is None
+
+
+@pytest.mark.parametrize("text, metric, limit", [
+    ("Dmax < 54 Gy", "Dmax", 54.0),
+    ("V20 Gy < 30%", "Vx", 30.0),
+    ("D0.03cc ≤ 60 Gy", "Dx", 60.0),
+])
+def test_metrics(text, metric, limit):
+    (fields,) = parse_constraint(text)
+    assert (fields["metric"], fields["limit"]) == (metric, limit)
+
+
+def test_index_spinal_cord_dmax():
+    from reirrad.catalog import constraint_index
+
+    limits = {(r.setting, r.limit) for r in constraint_index().query("Spinal Cord", metric="Dmax")}
+    assert ("3D‑CRT Thorax", 45.0) in limits
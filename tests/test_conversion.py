@@ -0,0 +1,49 @@
+import pytest
+
+from reirrad.catalog import load_catalog
+from reirrad.radiobiology import eqd2, max_d_per_fraction
+from reirrad.tables import SBRT_CONVERSION_ALPHA_BETA, SBRT_CONVERSION_FRACTIONS
+
+N0 = {"3_fraction": 3, "5_fraction": 5}
+
+
+@pytest.fixture(scope="module")
+def table():
+    return load_catalog()["sbrt_eqd2"]
+
+
+def test_table_matches_eqd2_at_grid_points(table):
+    assert len(table) > 0
+    assert table.alpha_beta == SBRT_CONVERSION_ALPHA_BETA
+    assert table.fractions == SBRT_CONVERSION_FRACTIONS
+    for i, r in enumerate(table.records):
+        n0 = N0[r.scheme]
+        for j, ab in enumerate(table.alpha_beta):
+            expected = eqd2(n0, r.limit / n0, ab)
+            assert table.eqd2[i][j] == pytest.approx(expected, rel=1e-12)
+            for k, n in enumerate(table.fractions):
+                total = table.total[i][j][k]
+                assert total == pytest.approx(n * max_d_per_fraction(n, expected, ab), rel=1e-12)
+                assert eqd2(n, total / n, ab) == pytest.approx(expected, rel=1e-9)
+
+
+def test_native_fraction_count_gives_back_the_limit(table):
+    for i, r in enumerate(table.records):
+        k = table.fractions.index(N0[r.scheme])
+        for j in range(len(table.alpha_beta)):
+            assert table.total[i][j][k] == pytest.approx(r.limit, rel=1e-9)
+
+
+def test_off_grid_alpha_beta_is_converted_on_the_fly(table):
+    rows = table.rows("Heart")
+    assert rows
+    eqd2s, totals = table.convert(2.5, rows)
+    for i, e, t in zip(rows, eqd2s, totals):
+        r = table.records[i]
+        n0 = N0[r.scheme]
+        assert e == pytest.approx(eqd2(n0, r.limit / n0, 2.5), rel=1e-12)
+        assert len(t) == len(table.fractions)
+    row = table.table(3.0, "heart")[0]
+    assert row["organ"] == table.records[rows[0]].organ
+    assert row["totals"][N0[row["scheme"]]] == pytest.approx(row["limit"], rel=1e-9)
+    assert table.table(3.0, "no such organ") == []
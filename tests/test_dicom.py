@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+pydicom = pytest.importorskip("pydicom")
+
+from pydicom.dataset import Dataset, FileMetaDataset  # noqa: E402
+from pydicom.uid import ExplicitVRLittleEndian, generate_uid  # noqa: E402
+
+from reirrad import dicom  # noqa: E402
+
+RT_DOSE = "1.2.840.10008.5.1.4.1.1.481.2"
+RT_STRUCT = "1.2.840.10008.5.1.4.1.1.481.3"
+SCALING = 0.01
+Z = [0.0, 3.0, 6.0]
+
+
+def _save(ds, sop_class, path):
+    ds.SOPClassUID = sop_class
+    ds.SOPInstanceUID = generate_uid()
+    ds.file_meta = FileMetaDataset()
+    ds.file_meta.MediaStorageSOPClassUID = sop_class
+    ds.file_meta.MediaStorageSOPInstanceUID = ds.SOPInstanceUID
+    ds.file_meta.TransferSyntaxUID = ExplicitVRLittleEndian
+    ds.save_as(path, enforce_file_format=True)
+    return path
+
+
+def _dose_file(path, pixels):
+    ds = Dataset()
+    ds.Modality = "RTDOSE"
+    ds.DoseUnits = "GY"
+    ds.ImageOrientationPatient = [1, 0, 0, 0, 1, 0]
+    ds.ImagePositionPatient = [0.0, 0.0, Z[0]]
+    ds.PixelSpacing = [2.0, 2.0]
+    ds.GridFrameOffsetVector = [z - Z[0] for z in Z]
+    ds.DoseGridScaling = SCALING
+    ds.NumberOfFrames, ds.Rows, ds.Columns = pixels.shape
+    ds.SamplesPerPixel = 1
+    ds.PhotometricInterpretation = "MONOCHROME2"
+    ds.BitsAllocated = ds.BitsStored = 16
+    ds.HighBit = 15
+    ds.PixelRepresentation = 0
+    ds.PixelData = pixels.astype("<u2").tobytes()
+    return _save(ds, RT_DOSE, path)
+
+
+def _square(x0, x1, y0, y1, z):
+    return [x0, y0, z, x1, y0, z, x1, y1, z, x0, y1, z]
+
+
+def _structure_file(path, rois):
+    ds = Dataset()
+    ds.Modality = "RTSTRUCT"
+    ds.StructureSetROISequence = []
+    ds.ROIContourSequence = []
+    for number, (name, box) in enumerate(rois.items(), start=1):
+        roi = Dataset()
+        roi.ROINumber, roi.ROIName = number, name
+        ds.StructureSetROISequence.append(roi)
+        item = Dataset()
+        item.ReferencedROINumber = number
+        item.ContourSequence = []
+        for z in Z:
+            c = Dataset()
+            c.ContourGeometricType = "CLOSED_PLANAR"
+            c.NumberOfContourPoints = 4
+            c.ContourData = _square(*box, z)
+            item.ContourSequence.append(c)
+        ds.ROIContourSequence.append(item)
+    return _save(ds, RT_STRUCT, path)
+
+
+@pytest.fixture
+def course(tmp_path):
+    pixels = np.arange(3 * 8 * 10).reshape(3, 8, 10) * 10
+    # voxel centres: x = 0, 2, …, 18 and y = 0, 2, …, 14 mm
+    rois = {"Spinal Cord": (3.0, 13.0, 3.0, 9.0), "Brainstem": (-1.0, 1.0, -1.0, 1.0)}
+    dose = _dose_file(tmp_path / "RD.dcm", pixels)
+    structures = _structure_file(tmp_path / "RS.dcm", rois)
+    return dose, structures, pixels * SCALING
+
+
+def test_dose_frames_are_memmapped(course):
+    path, _, gy = course
+    dose = dicom.open_dose(path)
+    assert dose.shape == (3, 8, 10)
+    assert not dose.compressed and isinstance(dose._pixels, np.memmap)
+    assert np.allclose(dose.z, Z)
+    assert dose.voxel_cc == pytest.approx(2 * 2 * 3 / 1000)
+    for k, frame in enumerate(dose.frames()):
+        assert np.allclose(frame, gy[k])
+
+
+def test_dose_sum(course):
+    path, _, gy = course
+    total = dicom.open_dose([path, path])
+    assert np.allclose(total.frame(1), 2 * gy[1])
+
+
+def test_structure_set(course):
+    _, path, _ = course
+    structures = dicom.read_structure_set(path)
+    assert structures.names() == {1: "Spinal Cord", 2: "Brainstem"}
+    contours = structures.contours()
+    assert [z for z, _ in contours[1]] == Z
+    assert contours[1][0][1].shape == (4, 2)
+
+
+def test_masks_and_doses(course, tmp_path, monkeypatch):
+    dose_path, structure_path, gy = course
+    dose = dicom.open_dose(dose_path)
+    structures = dicom.read_structure_set(structure_path)
+    masks = dicom.structure_masks(structures, dose, tmp_path / "cache")
+    cord = np.zeros(gy.shape, dtype=bool)
+    cord[:, 2:5, 2:7] = True  # y 4–8, x 4–12
+    assert np.array_equal(masks["Spinal Cord"], np.flatnonzero(cord))
+    assert np.array_equal(masks["Brainstem"], np.arange(3) * 80)
+
+    # a second load reads the cache instead of the contours
+    monkeypatch.setattr(structures, "contours", lambda: pytest.fail("rasterized again"))
+    cached = dicom.structure_masks(structures, dose, tmp_path / "cache")
+    assert cached.keys() == masks.keys()
+    assert all(np.array_equal(cached[k], masks[k]) for k in masks)
+
+    stats = dicom.structure_doses(dose, masks)["Spinal Cord"]
+    assert stats["voxels"] == 45
+    assert stats["max"] == pytest.approx(gy[cord].max())
+    assert stats["mean"] == pytest.approx(gy[cord].mean())
+
+
+def test_prior_course_eqd2(course, tmp_path):
+    dose_path, structure_path, gy = course
+    out = dicom.prior_course(dose_path, structure_path, fractions=5, alpha_beta={"Brainstem": 2},
+                             cache_dir=tmp_path / "cache")
+    d = gy[:, 0, 0].max()
+    assert out["Brainstem"]["max"] == pytest.approx(d)
+    assert out["Brainstem"]["max_eqd2"] == pytest.approx(d * (d / 5 + 2) / (2 + 2))
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from reirrad.dosegrid import _parse_course, cumulative_eqd2, open_grid
+from reirrad.radiobiology import eqd2_array
+
+SHAPE = (7, 13, 11)
+
+
+def _expected(doses, courses, ab, limit):
+    eff = sum((1 - c["recovery"]) * eqd2_array(c["fractions"], d / c["fractions"], ab)
+              for d, c in zip(doses, courses))
+    return eff, np.maximum(limit - eff, 0.0)
+
+
+@pytest.fixture
+def course_files(tmp_path):
+    rng = np.random.default_rng(0)
+    doses = [rng.uniform(0, 60, SHAPE), rng.uniform(0, 30, SHAPE)]
+    paths = [tmp_path / "c1.npy", tmp_path / "c2.raw"]
+    np.save(paths[0], doses[0].astype(np.float32))
+    doses[1].astype(np.float64).tofile(paths[1])
+    return doses, paths
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_memmap_chunks_match_in_memory(course_files, tmp_path, workers):
+    doses, paths = course_files
+    courses = [{"dose": paths[0], "fractions": 10, "recovery": 0.25},
+               {"dose": paths[1], "fractions": 5, "recovery": 0.0}]
+    ab = np.random.default_rng(1).uniform(1, 10, SHAPE)
+    limit = 60.0
+    eff, room = cumulative_eqd2(courses, ab, limit, out=tmp_path / "eff.npy",
+                                remaining=tmp_path / "room.npy", dtype=np.float64,
+                                chunk=97, workers=workers, shape=SHAPE, raw_dtype=np.float64)
+    exp_eff, exp_room = _expected([doses[0].astype(np.float32).astype(float), doses[1]], courses, ab, limit)
+    np.testing.assert_allclose(eff, exp_eff, rtol=1e-12)
+    np.testing.assert_allclose(room, exp_room, rtol=1e-12, atol=1e-12)
+    # the outputs were written through to disk
+    np.testing.assert_array_equal(np.load(tmp_path / "eff.npy"), eff)
+    np.testing.assert_array_equal(np.load(tmp_path / "room.npy"), room)
+
+
+def test_float32_and_in_memory_grids(course_files):
+    doses, _ = course_files
+    courses = [{"dose": doses[0], "fractions": 30}, {"dose": doses[1], "fractions": 3,
+                                                     "recovery": 0.5}]
+    eff, room = cumulative_eqd2(courses, 3.0, workers=2, chunk=100)
+    assert room is None and eff.dtype == np.float32
+    exp_eff, _ = _expected(doses, [dict(c, recovery=c.get("recovery", 0.0)) for c in courses],
+                           3.0, 0.0)
+    np.testing.assert_allclose(eff, exp_eff, rtol=1e-5)
+
+
+def test_shape_errors(course_files):
+    doses, paths = course_files
+    with pytest.raises(ValueError, match="differ in shape"):
+        cumulative_eqd2([{"dose": doses[0], "fractions": 5},
+                         {"dose": doses[0][:3], "fractions": 5}], 3.0)
+    with pytest.raises(ValueError, match="ab grid"):
+        cumulative_eqd2([{"dose": doses[0], "fractions": 5}], np.ones(3))
+    with pytest.raises(ValueError, match="explicit shape"):
+        open_grid(paths[1])
+
+
+def test_parse_course():
+    assert _parse_course("c:/dose.npy:10:25%") == {"dose": "c:/dose.npy", "fractions": 10,
+                                                   "recovery": 0.25}
+    assert _parse_course("dose.npy:5") == {"dose": "dose.npy", "fractions": 5, "recovery": 0.0}
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from reirrad.dvh import DVH, dvhs_from_masks, grid_dvhs, label_map, load_dvh_file
+from reirrad.radiobiology import eqd2_array
+
+ECLIPSE = """\
+Type: Cumulative Dose Volume Histogram
+
+Structure: Brainstem
+Volume [cm³]: 25.0
+
+Dose [Gy]  Relative dose [%]  Ratio of Total Structure Volume [%]
+0          0                  100
+50         100                0
+"""
+
+
+def test_coarse_export_dmax_not_below_dx(tmp_path):
+    path = tmp_path / "dvh.txt"
+    path.write_text(ECLIPSE, encoding="utf-8")
+    dvh = load_dvh_file(path)["Brainstem"]
+    assert dvh.dmax() == pytest.approx(50.0)
+    assert dvh.dmax() >= dvh.dose_at(0.1)
+    assert dvh.dmean() == pytest.approx(25.0)
+
+
+def test_differential_dmax_closes_last_bin():
+    dvh = DVH.from_differential("cord", [0, 10, 20, 30], [1.0, 1.0, 1.0, 1.0])
+    assert dvh.dmax() == pytest.approx(40.0)
+    assert dvh.dmax() >= dvh.dose_at(0.1)
+    assert dvh.dmean() == pytest.approx(20.0)
+
+
+def test_grid_dvhs_match_voxels():
+    rng = np.random.default_rng(0)
+    dose = rng.uniform(0, 60, (6, 20, 20))
+    a = np.zeros(dose.shape, bool)
+    a[1:4, 2:12, 2:12] = True
+    b = np.zeros(dose.shape, bool)
+    b[2:6, 8:18, 8:18] = True      # overlaps a
+    dvhs = dvhs_from_masks(dose, {"a": a, "b": b}, bin_width=0.5, voxel_cc=0.01)
+    for name, mask in (("a", a), ("b", b)):
+        values = dose[mask]
+        dvh = dvhs[name]
+        assert dvh.total_volume == pytest.approx(mask.sum() * 0.01)
+        assert values.max() <= dvh.dmax() < values.max() + 0.5
+        assert dvh.dmax() >= dvh.dose_at(0.1)
+        assert dvh.dmean() == pytest.approx(values.mean(), abs=0.25)
+        assert dvh.volume_at(30.0) == pytest.approx((values >= 30.0).sum() * 0.01)
+
+
+def test_grid_dvhs_equal_per_structure_histograms():
+    rng = np.random.default_rng(1)
+    dose = rng.uniform(0, 40, (5, 12, 16))
+    a = np.zeros(dose.shape, bool)
+    a[:3, 2:9, 3:12] = True
+    b = np.zeros(dose.shape, bool)
+    b[1:, 5:12, 6:16] = True       # overlaps a
+    c = np.flatnonzero(rng.random(dose.size) < 0.3)   # flat indices, overlaps both
+    masks = {"a": a, "b": b, "c": c}
+    labels, members = label_map(masks, dose.shape)
+    grid = SimpleNamespace(shape=dose.shape, voxel_cc=0.02, frame=lambda k: dose[k])
+    runs = [grid_dvhs(dose, labels, members, list(masks), bin_width=0.25, voxel_cc=0.02),
+            grid_dvhs(dose, labels, members, list(masks), bin_width=0.25, voxel_cc=0.02,
+                      chunk=97),
+            grid_dvhs(grid, labels, members, list(masks), bin_width=0.25)]
+    eqd2 = grid_dvhs(grid, labels, members, list(masks), bin_width=0.25, fractions=5,
+                     alpha_beta={"a": 2.0})
+    for name, mask in masks.items():
+        values = dose.reshape(-1)[np.asarray(mask).reshape(-1)]
+        for dvhs in runs:
+            diff = dvhs[name].differential()
+            expected = np.bincount((values / 0.25).astype(int), minlength=diff.size) * 0.02
+            np.testing.assert_allclose(diff, expected, atol=1e-12)
+        ab = 2.0 if name == "a" else 3.0
+        np.testing.assert_allclose(eqd2[name].dose,
+                                   eqd2_array(5, runs[0][name].dose / 5, ab))
+        np.testing.assert_array_equal(eqd2[name].volume, runs[2][name].volume)
+
+
+def test_label_map_rejects_ambiguous_masks():
+    shape = (2, 3, 4)
+    as_int = np.zeros(shape, dtype=np.int8)
+    as_int[0, 1, 1:3] = 1
+    with pytest.raises(ValueError, match="boolean"):
+        label_map({"a": as_int}, shape)
+    with pytest.raises(ValueError, match="boolean"):
+        label_map({"a": as_int.reshape(-1)}, shape)  # 0/1 flat mask: repeated indices
+    with pytest.raises(ValueError, match="shape"):
+        label_map({"a": np.ones((3, 3), bool)}, shape)
+    with pytest.raises(ValueError, match="within the grid"):
+        label_map({"a": np.array([3, 24])}, shape)
+    labels, members = label_map({"a": as_int.astype(bool), "b": np.array([6, 20]),
+                                 "c": []}, shape)
+    assert set(np.flatnonzero(labels.reshape(-1))) == {5, 6, 20}
+    assert members.shape[1] == 3 and not members[:, 2].any()
+
+
+def test_non_finite_doses():
+    dose = np.full((4, 5), 10.0)
+    a = np.zeros(dose.shape, bool)
+    a[1:3, 1:4] = True
+    dose[0, 0] = np.nan          # outside every structure: ignored
+    dose[3, 4] = np.inf
+    dvh = dvhs_from_masks(dose, {"a": a}, voxel_cc=1.0)["a"]
+    assert dvh.total_volume == 6.0 and dvh.dmax() == pytest.approx(10.1)
+    dose[2, 2] = np.nan
+    with pytest.raises(ValueError, match="not finite at 1 structure voxel"):
+        dvhs_from_masks(dose, {"a": a}, voxel_cc=1.0)
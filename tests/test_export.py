@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+import re
+import zlib
+
+import pytest
+
+from reirrad.export import (
+    REPORT_COLUMNS, PdfWriter, format_for, open_writer, report_rows, to_bytes,
+)
+from reirrad.reirradiation import reirradiation_report
+
+COLUMNS = ("patient", "oar", "dose", "note")
+ROWS = [["P1", "Spinal Cord", 45.5, "≤ 50 Gy, α/β 2"], ["P2", "Brainstem", 0.0, ""],
+        ["P3", 'Chiasm "optic"', float("nan"), None]]
+
+
+def test_csv_round_trip():
+    text = to_bytes(ROWS, COLUMNS, "csv").decode("utf-8")
+    back = list(csv.reader(io.StringIO(text)))
+    assert back[0] == list(COLUMNS)
+    assert back[1:] == [["" if v is None else str(v) for v in row] for row in ROWS]
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl"])
+def test_json_round_trip(fmt):
+    text = to_bytes(ROWS, COLUMNS, fmt).decode("utf-8")
+    objects = (json.loads(text) if fmt == "json"
+               else [json.loads(line) for line in text.splitlines()])
+    assert objects[:2] == [dict(zip(COLUMNS, row)) for row in ROWS[:2]]
+    assert objects[2]["dose"] is None  # NaN has no JSON spelling
+    assert json.loads(to_bytes([], COLUMNS, "json")) == []
+
+
+def _pdf_objects(data):
+    """Check the xref table against the file; return {number: object bytes}."""
+    assert data.startswith(b"%PDF-1.4\n") and data.rstrip().endswith(b"%%EOF")
+    xref = int(re.search(rb"startxref\n(\d+)\n%%EOF", data).group(1))
+    assert data[xref:].startswith(b"xref\n0 ")
+    lines = data[xref:].split(b"\n")
+    count = int(lines[1].split()[1])
+    assert lines[2] == b"0000000000 65535 f "
+    objects = {}
+    for number, entry in enumerate(lines[3:3 + count - 1], start=1):
+        offset = int(entry.split()[0])
+        assert data[offset:].startswith(b"%d 0 obj\n" % number)
+        objects[number] = data[offset:data.index(b"endobj", offset)]
+    assert b"/Size %d" % count in data[xref:]
+    return objects
+
+
+def _page_text(objects):
+    text = b""
+    for body in objects.values():
+        if b"/FlateDecode" in body:
+            stream = body[body.index(b"stream\n") + 7:body.rindex(b"\nendstream")]
+            text += zlib.decompress(stream)
+    return text
+
+
+def test_pdf_is_well_formed():
+    data = to_bytes(ROWS, COLUMNS, "pdf", title="Report", widths=[8, 16, 8, 24])
+    objects = _pdf_objects(data)
+    assert b"/Count 1" in objects[2]
+    text = _page_text(objects)
+    assert b"(Report) Tj" in text and b"Spinal Cord" in text
+    assert b"<= 50 Gy, alpha/beta 2" in text and b"Chiasm \"optic\"" in text
+    # too-long cells are cut; parentheses are escaped
+    short = _page_text(_pdf_objects(to_bytes([["(P1)", "Spinal Cord"]], ("id", "oar"), "pdf",
+                                             widths=[6, 6])))
+    assert b"\\(P1\\)" in short and b"Spina~" in short
+
+
+def test_pdf_paginates():
+    buf = io.BytesIO()
+    w = PdfWriter(buf, COLUMNS)
+    per_page = w._rows_per_page
+    w.writerows([[f"P{i}", "Cord", float(i), ""] for i in range(2 * per_page + 1)])
+    w.close()
+    objects = _pdf_objects(buf.getvalue())
+    assert b"/Count 3" in objects[2]
+    assert _page_text(objects).count(b"(patient") == 3  # header on every page
+
+
+def test_open_writer_and_report_rows(tmp_path):
+    report = {"Spinal Cord": reirradiation_report(
+        [{"dose": 30.0, "fractions": 10, "recovery": 0.25}], 2.0, 50.0)}
+    rows = list(report_rows(report, patient="P1"))
+    assert len(rows[0]) == len(REPORT_COLUMNS)
+    path = tmp_path / "report.json"
+    with open_writer(path, REPORT_COLUMNS) as w:
+        w.writerows(rows)
+    (obj,) = json.loads(path.read_text(encoding="utf-8"))
+    assert obj["oar"] == "Spinal Cord" and obj["left"] == pytest.approx(report["Spinal Cord"]["left"])
+    assert format_for("x.PDF") == "pdf" and format_for("x.ndjson") == "jsonl"
+    assert format_for("x.txt") == "csv"
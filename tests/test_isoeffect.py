@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+import pytest
+
+from reirrad.isoeffect import IsoSurface
+from reirrad.radiobiology import bed_time, iso_effective_dose
+
+BASELINE = dict(BED_goal=bed_time(35, 2.0, 10.0, 0.3, 47, 3.0, 21), ab=10.0, alpha=0.3,
+                Td=3.0, Tk=21)
+
+
+def _scalar(n2, T2, BED_goal, ab, alpha, Td, Tk):
+    # the Tab 4 formula app.py solved one regimen at a time
+    R2 = (math.log(2) / alpha) * max(T2 - Tk, 0) / Td
+    C = (BED_goal + R2) / n2
+    d2 = (-ab + math.sqrt(ab**2 + 4 * ab * C)) / 2
+    return d2, d2 * n2, R2
+
+
+def test_sweep_matches_scalar_solve():
+    out = IsoSurface(**BASELINE).sweep((5, 35), (10, 60))
+    assert out["d_per_fx"].shape == (31, 51)
+    for i, n in enumerate(out["n"]):
+        for j, T in enumerate(out["T"]):
+            d2, total, R2 = _scalar(int(n), int(T), **BASELINE)
+            assert out["d_per_fx"][i, j] == pytest.approx(d2, rel=1e-12)
+            assert out["total"][i, j] == pytest.approx(total, rel=1e-12)
+            assert out["R"][j] == pytest.approx(R2, rel=1e-12, abs=1e-12)
+            assert iso_effective_dose(int(n), int(T), 10.0, 0.3, 3.0, BASELINE["BED_goal"],
+                                      21)[0] == pytest.approx(d2, rel=1e-12)
+
+
+def test_growing_and_shrinking_bounds_reuse_solutions():
+    surface = IsoSurface(**BASELINE)
+    small = surface.sweep((1, 10), (1, 20))
+    wide = surface.sweep((1, 30), (1, 50))
+    solved = surface.solved
+    assert solved == 30 * 50
+    again = surface.sweep((3, 8), (5, 15))
+    assert surface.solved == solved  # nothing new to solve
+    np.testing.assert_array_equal(wide["d_per_fx"][:10, :20], small["d_per_fx"])
+    np.testing.assert_array_equal(again["d_per_fx"], wide["d_per_fx"][2:8, 4:15])
+    # a fresh surface solved straight to the wide bounds gives the same grid
+    np.testing.assert_array_equal(IsoSurface(**BASELINE).sweep((1, 30), (1, 50))["d_per_fx"],
+                                  wide["d_per_fx"])
+
+
+def test_matches_and_bad_ranges():
+    surface = IsoSurface(**BASELINE)
+    assert surface.matches(**BASELINE)
+    assert not surface.matches(**dict(BASELINE, ab=3.0))
+    with pytest.raises(ValueError):
+        surface.sweep((0, 10), (1, 10))
+    with pytest.raises(ValueError):
+        surface.sweep((5, 1), (1, 10))
@@ -0,0 +1,64 @@
+import math
+
+import numpy as np
+import pytest
+
+from reirrad.dvh import DVH
+from reirrad.ntcp import (
+    dvh_arrays, dvh_ntcp, geud, lkb_ntcp, normal_cdf, ntcp_parameters, rank_regimens, regimen_ntcp,
+)
+from reirrad.radiobiology import eqd2
+
+
+def test_normal_cdf():
+    x = np.linspace(-6, 6, 241)
+    exact = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+    np.testing.assert_allclose(normal_cdf(x), exact, rtol=2e-7, atol=1e-9)
+
+
+def test_geud_limits():
+    dose, volume = [10.0, 20.0, 30.0], [1.0, 2.0, 1.0]
+    assert geud(dose, volume, 1.0) == pytest.approx(20.0)            # n = 1: mean dose
+    assert geud(dose, volume, 0.001) == pytest.approx(30.0, rel=2e-3)  # small n: max dose
+    assert geud([25.0, 25.0], [3.0, 1.0], 0.3) == pytest.approx(25.0)
+    assert geud([0.0, 0.0], [1.0, 1.0], 0.2) == 0.0
+
+
+def test_lkb_at_td50_is_half():
+    assert lkb_ntcp(65.0, 0.14, 65.0) == pytest.approx(0.5, abs=1e-7)
+
+
+def test_dvh_ntcp_uniform_dose():
+    n, m, td50 = ntcp_parameters("Spinal Cord")
+    dvh = DVH.from_differential("Spinal Cord", [50.0], [2.0])
+    assert dvh_ntcp(dvh) == pytest.approx(float(normal_cdf((50.0 - td50) / (m * td50))))
+
+
+def test_dvh_arrays_pad_short_dvhs():
+    short = DVH.from_differential("Cord", [10.0, 20.0], [1.0, 1.0])
+    long = DVH.from_differential("Cord", [10.0, 20.0, 30.0, 40.0], [1.0, 1.0, 1.0, 1.0])
+    dose, volume = dvh_arrays([short, long])
+    assert dose.shape == volume.shape == (2, long.dose.size)
+    assert volume[0].sum() == pytest.approx(short.differential().sum())
+    assert geud(dose, volume, 1.0)[0] == pytest.approx(geud(short.dose, short.differential(), 1.0))
+
+
+def test_regimen_ntcp_matches_loop():
+    rng = np.random.default_rng(0)
+    relative = np.tile(np.linspace(0.0, 1.1, 40), (3, 1))
+    volume = rng.random(relative.shape)
+    d, fractions = np.array([8.0, 6.0, 4.0]), np.array([1, 3, 5])
+    result = regimen_ntcp(relative, volume, d, fractions, organ="Brain Stem")
+    n_vol, m, td50 = ntcp_parameters("Brain Stem")
+    for p in range(3):
+        for r in range(3):
+            bins = [eqd2(fractions[r], x * d[r], 2.0) for x in relative[p]]
+            g = geud(bins, volume[p], n_vol)
+            assert result[p, r] == pytest.approx(float(lkb_ntcp(g, m, td50)), rel=1e-9)
+    order, mean = rank_regimens(result)
+    assert list(mean[order]) == sorted(mean)
+
+
+def test_missing_parameters():
+    with pytest.raises(ValueError):
+        ntcp_parameters("Cochlea")
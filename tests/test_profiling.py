@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from reirrad import profiling
+
+
+@pytest.fixture
+def enabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "ENABLED", True)
+    monkeypatch.setattr(profiling, "MODE", "cprofile")
+    monkeypatch.setattr(profiling, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "LOG_PATH", str(tmp_path / "timings.jsonl"))
+    yield tmp_path
+    profiling._local.run = None
+
+
+def _log(path):
+    return [json.loads(line) for line in (path / "timings.jsonl").read_text().splitlines()]
+
+
+def test_stale_run_is_closed_by_the_next(enabled):
+    profiling.begin_run("app")
+    with profiling.stage("tab1"):
+        pass
+    profiling.begin_run("app")  # the previous run ended in st.rerun()
+    record = profiling.end_run()
+    stale, last = _log(enabled)
+    assert stale["interrupted"] and "tab1" in stale["stages"]
+    assert "interrupted" not in last and last == record
+    assert profiling.end_run() is None
+
+
+def test_profiles_do_not_overwrite_each_other(enabled):
+    paths = []
+    for _ in range(3):
+        profiling.begin_run("app")
+        paths.append(profiling.end_run()["profile"])
+    assert len(set(paths)) == 3
+    assert len(list((enabled / "profiles").iterdir())) == 3
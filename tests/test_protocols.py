@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from reirrad.dvh import DVH
+from reirrad.protocols import build_protocols, label_key, load_protocols, summarize
+
+YAML = """\
+Lung:
+  sbrt_5fx:
+    description: "Peripheral lung SBRT"
+    oar_constraints:
+      - OAR: "Spinal Cord"
+        metric: "Dmax"
+        limit: "≤30 Gy"
+      - OAR: "Esophagus"
+        metric: "D5cc"
+        limit: "<27.5 Gy"
+      - OAR: "Lungs"
+        metric: "V20"
+        limit: "≤10%"
+      - OAR: "Heart"
+        metric: "Dmax"
+        limit: "<38 Gy (<15 cc)"
+      - OAR: "Chest Wall"
+        metric: "Dmax"
+        limit: "As low as possible"
+  conventional_30fx:
+    fractions: 30
+    oar_constraints:
+      - OAR: "Spinal Cord"
+        metric: "Max"
+        limit: "<50 Gy"
+      - OAR: "Heart"
+        metric: "Mean"
+        limit: "<20 Gy"
+"""
+
+
+@pytest.fixture
+def book(tmp_path):
+    (tmp_path / "planning_protocols.yaml").write_text(YAML, encoding="utf-8")
+    return build_protocols(tmp_path)
+
+
+def _verdicts(results):
+    return {(r.record.scheme, r.record.organ, r.record.metric): r.passed for r in results}
+
+
+def test_pass_and_fail_from_metric_values(book):
+    plan = {"Spinal Cord": {"Dmax": 29.0}, "Esophagus": {"D5cc": 28.0},
+            "Lungs": {"V20Gy%": 9.5}, "Heart": {"D15cc": 37.0, "Mean": 21.0},
+            "Chest Wall": {"Dmax": 40.0}}
+    results = book.check(plan, site="lung")
+    assert _verdicts(results) == {
+        ("sbrt_5fx", "Spinal Cord", "Dmax"): True,
+        ("sbrt_5fx", "Esophagus", "Dx"): False,
+        ("sbrt_5fx", "Lungs", "Vx"): True,
+        ("sbrt_5fx", "Heart", "Dx"): True,       # "<38 Gy (<15 cc)" is D15cc < 38 Gy
+        ("sbrt_5fx", "Chest Wall", "Dmax"): None,  # no numeric limit: review
+        ("conventional_30fx", "Spinal Cord", "Dmax"): True,
+        ("conventional_30fx", "Heart", "Dmean"): False,
+    }
+    assert summarize(results)[("Lung", "sbrt_5fx")] == {"passed": 3, "failed": 1, "review": 1}
+
+
+def test_limit_is_strict_or_inclusive(book):
+    at_limit = {"Spinal Cord": {"Dmax": 30.0}, "Esophagus": {"D5cc": 27.5}}
+    verdicts = _verdicts(book.check(at_limit, fractions=5))
+    assert verdicts[("sbrt_5fx", "Spinal Cord", "Dmax")] is True    # ≤
+    assert verdicts[("sbrt_5fx", "Esophagus", "Dx")] is False       # <
+
+
+def test_fraction_and_site_filters(book):
+    assert [p.name for p in book.matching(fractions=5)] == ["sbrt_5fx"]
+    assert [p.name for p in book.matching(site="LUNG", fractions=30)] == ["conventional_30fx"]
+    assert book.matching(site="prostate") == []
+    results = book.check({"Spinal Cord": {"Dmax": 45.0}}, fractions=30)
+    assert [(r.record.scheme, r.passed) for r in results] == [("conventional_30fx", True)]
+
+
+def test_missing_structures_and_metrics(book):
+    results = book.check({"Spinal cord": {"D2cc": 10.0}, "Liver": {"Dmax": 1.0}})
+    # matched by normalized name; a metric the plan lacks cannot be judged
+    assert {r.structure for r in results} == {"Spinal cord"}
+    assert all(r.passed is None and r.value is None for r in results)
+
+
+def test_dvh_plan(book):
+    dose = np.linspace(0.0, 40.0, 401)
+    cord = DVH.from_cumulative("Spinal Cord", dose, np.clip(10 * (1 - dose / 32), 0, 10))
+    lungs = DVH.from_cumulative("Lungs", dose, np.clip(100 * (1 - dose / 15), 0, 100),
+                                volume_unit="%")
+    verdicts = _verdicts(book.check({"Spinal Cord": cord, "Lungs": lungs}, fractions=5))
+    assert verdicts == {("sbrt_5fx", "Spinal Cord", "Dmax"): False,
+                        ("sbrt_5fx", "Lungs", "Vx"): True}
+
+
+def test_label_key():
+    assert label_key("Max") == label_key("Dmax") == ("Dmax", None, None, None, "Gy")
+    assert label_key("D0.03cc") == ("Dx", None, 0.03, "cc", "Gy")
+    assert label_key("V62Gy cc") == ("Vx", 62.0, None, None, "cc")
+    assert label_key("V20") == ("Vx", 20.0, None, None, "%")
+    assert label_key("conformity index") is None
+
+
+def test_shipped_protocols():
+    book = load_protocols()
+    results = book.check({"Spinal Cord": {"Dmax": 44.0}}, site="HeadAndNeck", fractions=35)
+    assert results and all(r.passed for r in results)
+    results = book.check({"Spinal Cord": {"Dmax": 52.0}}, site="HeadAndNeck", fractions=35)
+    assert results and not any(r.passed for r in results)
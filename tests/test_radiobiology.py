@@ -0,0 +1,103 @@
+import math
+
+import numpy as np
+import pytest
+
+from reirrad.radiobiology import (
+    bed, bed_array, eqd2, eqd2_array, max_d_per_fraction, max_d_per_fraction_array,
+    usc_parameters,
+)
+
+
+# the scalar formulas app.py used before the array kernels
+def _bed(n, d, ab):
+    return n * d * (1 + d / ab)
+
+
+def _eqd2(n, d, ab):
+    return _bed(n, d, ab) / (1 + 2 / ab)
+
+
+def _max_d(n, target, ab):
+    tb = target * (1 + 2 / ab)
+    a, b, c = n / ab, n, -tb
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return 0.0
+    return max((-b + math.sqrt(disc)) / (2 * a), (-b - math.sqrt(disc)) / (2 * a))
+
+
+N = np.array([1, 2, 3, 5, 10, 15, 30, 40])[:, None, None]
+AB = np.array([0.5, 1.0, 2.0, 3.0, 4.5, 10.0, 20.0])[None, None, :]
+
+
+def _grid(fn, n, x, ab):
+    return np.array([[[fn(int(a), float(b), float(c)) for c in ab.ravel()] for b in x.ravel()]
+                     for a in n.ravel()])
+
+
+def test_bed_and_eqd2_kernels_match_scalars():
+    d = np.linspace(0.0, 25.0, 51)[None, :, None]
+    np.testing.assert_allclose(bed_array(N, d, AB), _grid(_bed, N, d, AB), rtol=1e-14)
+    np.testing.assert_allclose(eqd2_array(N, d, AB), _grid(_eqd2, N, d, AB), rtol=1e-14)
+    np.testing.assert_allclose(eqd2_array(N, d, AB), _grid(eqd2, N, d, AB), rtol=0)
+
+
+def test_max_d_kernel_matches_scalar():
+    # negative targets cover both no-room branches: a real negative root, and
+    # a negative discriminant (answered with 0)
+    target = np.linspace(-40.0, 120.0, 161)[None, :, None]
+    expected = _grid(_max_d, N, target, AB)
+    out = max_d_per_fraction_array(N, target, AB)
+    assert out.shape == expected.shape
+    np.testing.assert_allclose(out, expected, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(out, _grid(max_d_per_fraction, N, target, AB), rtol=0)
+
+
+def test_max_d_without_room():
+    n, ab = 5, 2.0
+    tb_min = -n * ab / 4  # discriminant is zero here
+    assert max_d_per_fraction(n, 0.0, ab) == 0.0
+    # a small deficit has a real (negative) root, as the scalar formula gave
+    deficit = 0.5 * tb_min / (1 + 2 / ab)
+    d = max_d_per_fraction(n, deficit, ab)
+    assert d < 0 and eqd2(n, d, ab) == pytest.approx(deficit)
+    # past the vertex there is no real root: 0 Gy per fraction
+    assert max_d_per_fraction(n, 2 * tb_min / (1 + 2 / ab), ab) == 0.0
+    out = max_d_per_fraction_array([n, n], [-100.0, 30.0], ab)
+    assert out[0] == 0.0 and out[1] == pytest.approx(_max_d(n, 30.0, ab))
+
+
+@pytest.mark.parametrize("n, target, ab", [(1, 20.0, 2.0), (5, 30.0, 3.0), (30, 60.0, 10.0)])
+def test_lq_inverse_round_trips(n, target, ab):
+    d = max_d_per_fraction(n, target, ab)
+    assert eqd2(n, d, ab) == pytest.approx(target, rel=1e-12)
+
+
+def test_lql_inverse_round_trips():
+    rng = np.random.default_rng(0)
+    n = rng.integers(1, 40, 10_000)
+    target = rng.uniform(0.1, 120, n.size)
+    ab = rng.uniform(1, 10, n.size)
+    d_t = rng.uniform(3, 10, n.size)
+    d = max_d_per_fraction_array(n, target, ab, "lql", d_t)
+    np.testing.assert_allclose(eqd2_array(n, d, ab, "lql", d_t), target, rtol=1e-10)
+
+
+def test_lql_is_lq_below_transition():
+    assert bed(5, 4.0, 3.0, "lql", 6.0) == pytest.approx(bed(5, 4.0, 3.0))
+    assert bed(1, 20.0, 3.0, "lql", 6.0) < bed(1, 20.0, 3.0)
+
+
+@pytest.mark.parametrize("target", [-5.0, -0.5, 0.0])
+def test_models_agree_without_room(target):
+    assert max_d_per_fraction(5, target, 2.0, "lql", 6.0) == \
+        pytest.approx(max_d_per_fraction(5, target, 2.0))
+
+
+def test_usc_parameters_make_lql_tangent():
+    alpha, d0, dq = 0.33, 1.25, 1.8
+    ab, d_t = usc_parameters(alpha, d0, dq)
+    # above D_T, BED per fraction follows the USC final slope: (d/D0 − Dq/D0) / α
+    d = 12.0
+    assert bed(1, d, ab, "lql", d_t) == pytest.approx((d / d0 - dq / d0) / alpha)
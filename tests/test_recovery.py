@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from reirrad.recovery import recovery_fraction
+from reirrad.tables import RECOVERY_FACTORS
+
+
+def test_curve_tracks_step_table():
+    months = np.arange(0.0, 36.0, 0.5)
+    steps = np.select([months < 6, months < 12], [RECOVERY_FACTORS["<6 months"],
+                                                  RECOVERY_FACTORS["6–12 months"]],
+                      RECOVERY_FACTORS["12+ months"])
+    curve = recovery_fraction(months)
+    assert np.all(np.diff(curve) >= 0)
+    assert np.sqrt(np.mean((curve - steps) ** 2)) < 0.1
+    assert recovery_fraction(4.0) == 0.0
+    assert recovery_fraction(240.0) == pytest.approx(0.5)
+
+
+def test_array_lookup_matches_scalar():
+    months = np.array([[0.0, 5.05, 7.33], [12.0, 100.0, 300.0]])
+    expected = [[recovery_fraction(m) for m in row] for row in months]
+    np.testing.assert_allclose(recovery_fraction(months), expected)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from reirrad.radiobiology import eqd2, max_d_per_fraction
+from reirrad.regimen import fraction_counts, solve_regimens
+
+LEFT, AB, NAMES = [20.0, 35.0, 8.0], [2.0, 10.0, 3.0], ["Cord", "Mucosa", "Plexus"]
+
+
+def test_joint_solve_matches_per_oar_solves():
+    res = solve_regimens(LEFT, AB, NAMES)
+    assert list(res["fractions"]) == list(fraction_counts())
+    for k, n in enumerate(res["fractions"]):
+        per = [max_d_per_fraction(int(n), left, ab) for left, ab in zip(LEFT, AB)]
+        assert res["per_oar"][:, k] == pytest.approx(per, rel=1e-12)
+        assert res["d_per_fx"][k] == pytest.approx(min(per), rel=1e-12)
+        assert res["total"][k] == pytest.approx(n * min(per), rel=1e-12)
+        assert res["binding"][k] == NAMES[int(np.argmin(per))]
+        # the joint regimen stays within every OAR's room
+        for left, ab in zip(LEFT, AB):
+            assert eqd2(int(n), res["d_per_fx"][k], ab) <= left * (1 + 1e-9)
+
+
+def test_binding_oar_changes_with_fraction_count():
+    # low α/β binds at few fractions, high α/β at many
+    res = solve_regimens([30.0, 24.0], [2.0, 10.0], ["late", "early"], fractions=[1, 40])
+    assert res["binding"] == ["late", "early"]
+
+
+def test_lql_matches_per_oar_solves():
+    d_t = [6.0, 8.0, 5.0]
+    res = solve_regimens(LEFT, AB, NAMES, fractions=[1, 3, 5], model="lql", d_t=d_t)
+    for k, n in enumerate([1, 3, 5]):
+        per = [max_d_per_fraction(n, left, ab, "lql", t) for left, ab, t in zip(LEFT, AB, d_t)]
+        assert res["d_per_fx"][k] == pytest.approx(min(per), rel=1e-10)
+
+
+def test_mismatched_inputs():
+    with pytest.raises(ValueError):
+        solve_regimens([20.0, 30.0], [2.0])
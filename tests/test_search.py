@@ -0,0 +1,22 @@
+from reirrad.search import canonical_organ, organ_search
+
+
+def test_aliases_and_spellings_meet():
+    assert canonical_organ("Brain Stem") == canonical_organ("Brainstem") == "brainstem"
+    assert canonical_organ("Left Parotid Gland") == canonical_organ("Parotid") == "parotid"
+    assert canonical_organ("Cochleae (bilateral)") == canonical_organ("Cochlea Rt")
+
+
+def test_heart_chambers_keep_their_side():
+    assert canonical_organ("Left Ventricle") == "left ventricle"
+    assert canonical_organ("Right Ventricle") == "right ventricle"
+    finder = organ_search()
+    assert [m.name for m in finder.search("left ventricle")] == ["Left Ventricle"]
+    assert [m.name for m in finder.search("right ventricle")] == []
+    assert finder.constraints("Right Ventricle") == ()
+
+
+def test_side_of_a_paired_organ_is_not_a_filter():
+    finder = organ_search()
+    assert finder.search("right parotid")[0].key == "parotid"
+    assert finder.search("cochlea lt")[0].key == "cochlea"
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from reirrad.service import LocalClient, Service, make_handler
+
+
+def _room(svc, i):
+    body = json.dumps({"courses": [{"dose": 30 + i % 20, "fractions": 10, "recovery": 0.2}],
+                       "ab": 2, "limit": 50}).encode()
+    return svc.handle("POST", "/v1/remaining-room", body)
+
+
+def test_remaining_room():
+    status, out = _room(Service(), 0)
+    assert status == 200
+    assert json.loads(out)["left"] > 0
+
+
+def test_cache_is_thread_safe():
+    svc = Service(cache_size=8)
+    with ThreadPoolExecutor(16) as pool:
+        statuses = {status for status, _ in pool.map(lambda i: _room(svc, i), range(2000))}
+    assert statuses == {200}
+    assert len(svc._cache) == 8
+    assert svc.hits + svc.misses == 2000
+
+
+def test_non_finite_inputs_are_rejected():
+    client = LocalClient()
+    status, out = client.post("/v1/remaining-room", {"courses": [], "ab": "nan", "limit": 50})
+    assert status == 400 and "finite" in out["error"]
+    status, out = client.get("/v1/sbrt-eqd2?ab=inf")
+    assert status == 400
+
+
+def test_non_finite_result_is_422():
+    status, body = Service().handle("POST", "/v1/iso-effective", json.dumps(
+        {"BED": -100, "n2": 1, "T2": 0, "ab": 10, "alpha": 0.3, "Td": 3}).encode())
+    assert status == 422
+    assert b"NaN" not in body and json.loads(body)["error"]
+
+
+def test_regimen_fractions_list_and_range():
+    client = LocalClient()
+    oars = [{"name": "Cord", "left": 20, "ab": 2}, {"name": "Brainstem", "left": 30, "ab": 2}]
+    status, out = client.post("/v1/regimen", {"oars": oars, "fractions": [3, 5]})
+    assert status == 200 and out["fractions"] == [3, 5]
+    status, out = client.post("/v1/regimen", {"oars": oars, "fractions": {"lo": 3, "hi": 5}})
+    assert status == 200 and out["fractions"] == [3, 4, 5]
+    assert out["binding"] == ["Cord"] * 3
+    status, out = client.post("/v1/regimen", {"oars": oars})
+    assert out["fractions"] == list(range(1, 41))
+    status, out = client.post("/v1/regimen", {"oars": oars, "fractions": {"lo": 5, "hi": 1}})
+    assert status == 400 and "empty" in out["error"]
+
+
+def test_status_codes():
+    client = LocalClient()
+    assert client.get("/v1/health")[0] == 200
+    assert client.get("/v1/nope")[0] == 404
+    assert client.get("/v1/regimen")[0] == 405
+    assert client.get("/v1/constraints")[0] == 400
+    status, out = client.post("/v1/remaining-room", {"courses": [], "limit": 50})
+    assert status == 400 and out["error"] == "missing field 'ab'"
+    status, out = client.post("/v1/remaining-room",
+                              {"courses": [{"dose": 30, "fractions": 0}], "ab": 2, "limit": 50})
+    assert status == 400 and "fractions" in out["error"]
+    status, out = client.post("/v1/remaining-room", {"ab": 2, "limit": 50, "model": "usc"})
+    assert status == 400 and "model" in out["error"]
+    status, body = client.service.handle("POST", "/v1/regimen", b"{not json")
+    assert status == 400 and b"invalid JSON" in body
+    status, body = client.service.handle("POST", "/v1/regimen", b"[1]")
+    assert status == 400 and b"JSON object" in body
+
+
+def test_cache_hits_on_normalized_requests():
+    svc = Service()
+    body = {"courses": [{"dose": 30, "fractions": 10, "recovery": 0.2}], "ab": 2, "limit": 50}
+    first = svc.handle("POST", "/v1/remaining-room", json.dumps(body).encode())
+    assert svc.cached("POST", "/v1/remaining-room", json.dumps(body).encode()) == first
+    # key order and int/float spelling do not matter
+    same = json.dumps({"limit": 50.0, "ab": 2.0, "courses": body["courses"]}).encode()
+    assert svc.handle("POST", "/v1/remaining-room", same) == first
+    assert (svc.hits, svc.misses) == (2, 1)
+    # batch requests are never cached
+    batch = json.dumps({"rows": [dict(body, oar="Spinal Cord")]}).encode()
+    assert svc.cached("POST", "/v1/batch/remaining-room", batch) is None
+    assert svc.handle("POST", "/v1/batch/remaining-room", batch)[0] == 200
+
+
+async def _http(port, requests):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    replies = []
+    for method, target, body in requests:
+        writer.write(f"{method} {target} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n"
+                     .encode() + body)
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        replies.append((status, json.loads(await reader.readexactly(
+            int(headers["content-length"])))))
+    writer.close()
+    return replies
+
+
+class _Recording(Service):
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def handle(self, method, target, body=b""):
+        self.threads.append(threading.get_ident())
+        if target == "/v1/slow":
+            time.sleep(0.5)
+        return super().handle(method, target, body)
+
+
+def test_server_computes_off_the_event_loop():
+    svc = _Recording()
+    body = json.dumps({"courses": [], "ab": 2, "limit": 50}).encode()
+
+    async def main():
+        server = await asyncio.start_server(make_handler(svc), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            slow = asyncio.create_task(_http(port, [("GET", "/v1/slow", b"")]))
+            await asyncio.sleep(0.05)
+            t0 = time.perf_counter()
+            replies = await _http(port, [("POST", "/v1/remaining-room", body)] * 2
+                                  + [("GET", "/v1/nope", b"")])
+            elapsed = time.perf_counter() - t0
+            assert (await slow)[0][0] == 404
+        return replies, elapsed
+
+    replies, elapsed = asyncio.run(main())
+    assert [status for status, _ in replies] == [200, 200, 404]
+    assert replies[0] == replies[1]
+    assert elapsed < 0.4  # not queued behind the slow request
+    # slow, the miss and the 404 ran on worker threads; the hit never reached handle
+    assert len(svc.threads) == 3 and threading.get_ident() not in svc.threads
+    assert (svc.hits, svc.misses) == (1, 1)
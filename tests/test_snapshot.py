@@ -0,0 +1,19 @@
+import sys
+import types
+
+from reirrad import snapshot
+
+
+def test_snapshot_of_missing_module_is_rebuilt(tmp_path, monkeypatch):
+    source = tmp_path / "source.yaml"
+    source.write_text("a: 1\n")
+    path = tmp_path / "snap.pickle"
+    gone = types.ModuleType("reirrad_gone")
+    gone.Payload = type("Payload", (), {"__module__": "reirrad_gone"})
+    monkeypatch.setitem(sys.modules, "reirrad_gone", gone)
+    snapshot.write_snapshot(path, [source], 1, gone.Payload())
+    monkeypatch.delitem(sys.modules, "reirrad_gone")
+
+    assert snapshot.read_snapshot(path, [source], 1) is None
+    assert snapshot.load_or_build(path, [source], 1, lambda: {"a": 1}) == {"a": 1}
+    assert snapshot.read_snapshot(path, [source], 1) == {"a": 1}
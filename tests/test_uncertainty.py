@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from reirrad import uncertainty
+from reirrad.radiobiology import bed_time, iso_effective_dose
+from reirrad.reirradiation import permissible_regimens, reirradiation_report
+from reirrad.tables import FRACTION_OPTIONS
+from reirrad.uncertainty import (
+    iso_effective_mc, percentiles, prob_above, remaining_room_mc, sample,
+)
+
+COURSES = [{"dose": 30.0, "fractions": 10, "recovery": 0.25},
+           {"dose": 20.0, "fractions": 5, "recovery": 0.0}]
+
+
+@pytest.mark.parametrize("model, d_t", [("lq", None), ("lql", 4.0)])
+def test_zero_spread_reproduces_the_report(model, d_t):
+    courses = [dict(COURSES[0], recovery=("normal", 0.25, 0.0)),
+               dict(COURSES[1], recovery=("uniform", 0.0, 0.0))]
+    out = remaining_room_mc(courses, ("lognormal", 2.0, 0.0), 50.0, n_samples=1000,
+                            model=model, d_t=d_t)
+    report = reirradiation_report(COURSES, 2.0, 50.0, model, d_t)
+    np.testing.assert_allclose(out["eff"], report["eff"], rtol=1e-12)
+    np.testing.assert_allclose(out["left"], report["left"], rtol=1e-12)
+    regimens = [d for _, d, _ in permissible_regimens(report["left"], 2.0, FRACTION_OPTIONS,
+                                                      model, d_t)]
+    np.testing.assert_allclose(out["d_per_fx"], np.tile(regimens, (1000, 1)), rtol=1e-10)
+
+
+def test_zero_spread_reproduces_iso_effective_dose():
+    out = iso_effective_mc(35, 2.0, 47, 15, 21, ("normal", 10.0, 0.0), 0.3,
+                           ("triangular", 3.0, 3.0, 3.0), Tk=21, n_samples=500)
+    goal = bed_time(35, 2.0, 10.0, 0.3, 47, 3.0, 21)
+    d2, total, R2 = iso_effective_dose(15, 21, 10.0, 0.3, 3.0, goal, 21)
+    np.testing.assert_allclose(out["BED"], goal, rtol=1e-12)
+    np.testing.assert_allclose(out["d_per_fx"], d2, rtol=1e-12)
+    np.testing.assert_allclose(out["total"], total, rtol=1e-12)
+    np.testing.assert_allclose(out["R"], R2, rtol=1e-12, atol=1e-12)
+
+
+def test_seeded_and_batched(monkeypatch):
+    kwargs = dict(courses=[dict(COURSES[0], recovery=("uniform", 0.1, 0.4))],
+                  ab=("lognormal", 2.0, 0.3), limit=50.0, n_samples=5000, seed=7)
+    first = remaining_room_mc(**kwargs)
+    again = remaining_room_mc(**kwargs)
+    np.testing.assert_array_equal(first["eff"], again["eff"])
+    assert remaining_room_mc(**dict(kwargs, seed=8))["eff"][0] != first["eff"][0]
+    monkeypatch.setattr(uncertainty, "BATCH", 1024)
+    small = remaining_room_mc(**kwargs)
+    assert small["eff"].shape == (5000,) and small["d_per_fx"].shape == (5000, 4)
+    assert small["eff"].mean() == pytest.approx(first["eff"].mean(), rel=0.02)
+
+
+def test_summaries():
+    s = np.arange(1, 101, dtype=float)
+    assert percentiles(s, (50,))[50] == pytest.approx(50.5)
+    assert prob_above(s, 90.0) == pytest.approx(0.10)
+    np.testing.assert_allclose(prob_above(s, [0.0, 100.0]), [1.0, 0.0])
+    with pytest.raises(ValueError):
+        sample(np.random.default_rng(), ("cauchy", 0, 1), 3)